@@ -1,7 +1,7 @@
 # bento_mdf
 
 from . import diff, validator
-from .mdf import MDF, MDFReader, MDFWriter, MDFDataValidator
+from .mdf import MDF, MDFReader, MDFWriter, MDFDataValidator, MDFDatasetValidator
 from .validator import MDFValidator
 from . import bin
 
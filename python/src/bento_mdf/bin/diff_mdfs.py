@@ -3,13 +3,21 @@
 
 from __future__ import annotations
 
+import json
 import logging
 import os
 from pathlib import Path
 
 import click
-from bento_mdf.diff import diff_models
+from bento_mdf.diff import DIFF_ENT_TYPES, diff_models, iter_diff
+from bento_mdf.diff_writer import DIFF_WRITERS, write_diff
 from bento_mdf.mdf.reader import MDFReader
+from bento_mdf.patch import make_patch
+from bento_mdf.structural_diff import (
+    diff_mdf_dicts,
+    iter_structural_diff,
+    load_mdf_dict,
+)
 
 logger = logging.getLogger("__name__")
 
@@ -84,6 +92,34 @@ logger = logging.getLogger("__name__")
     default=False,
     help="Only include the diff summary in the result",
 )
+@click.option(
+    "--output_format",
+    required=False,
+    type=click.Choice(["py", *DIFF_WRITERS, "patch"]),
+    default="py",
+    help=(
+        "Output format. 'py' writes the diff dict as a Python file; 'json', "
+        "'jsonl' and 'yaml' stream one record per change and omit the summary; "
+        "'patch' writes a JSON patch that patch_mdfs can apply"
+    ),
+)
+@click.option(
+    "--entity_type",
+    required=False,
+    type=click.Choice(DIFF_ENT_TYPES),
+    multiple=True,
+    help="Only include changes to this entity type (may be repeated)",
+)
+@click.option(
+    "--structural",
+    required=False,
+    is_flag=True,
+    default=False,
+    help=(
+        "Diff the MDF files structurally, without building models or "
+        "resolving enum references (fast; no summary)"
+    ),
+)
 def main(  # noqa: PLR0913
     model_handle: str,
     old_mdfs: str | Path | list[str | Path],
@@ -95,8 +131,26 @@ def main(  # noqa: PLR0913
     objects_as_dicts: bool = True,
     output_path: Path | str | None,
     summary_only: bool = False,
+    output_format: str = "py",
+    entity_type: tuple[str, ...] = (),
+    structural: bool = False,
 ) -> None:
     """Diff two versions of MDF files for a model."""
+    if structural and output_format == "patch":
+        msg = "--output_format patch requires models; omit --structural"
+        raise click.UsageError(msg)
+    if structural:
+        structural_diff(
+            model_handle,
+            old_mdfs,
+            new_mdfs,
+            old_version,
+            new_version,
+            output_path=output_path,
+            output_format=output_format,
+            entity_type=entity_type,
+        )
+        return
     old_mdf = MDFReader(*old_mdfs, handle=model_handle)
     new_mdf = MDFReader(*new_mdfs, handle=model_handle)
 
@@ -105,26 +159,50 @@ def main(  # noqa: PLR0913
     if new_version:
         new_mdf.model.version = new_version
 
-    summary = include_summary or summary_only
-
-    diff = diff_models(
-        mdl_a=old_mdf.model,
-        mdl_b=new_mdf.model,
-        objects_as_dicts=objects_as_dicts,
-        include_summary=summary,
-    )
-
-    result = diff.get("summary") if summary_only else diff
-    output_file_extension = "txt" if summary_only else "py"
+    stream = output_format in DIFF_WRITERS and not summary_only
+    output_file_extension = "txt" if summary_only else output_format
+    if output_format == "patch" and not summary_only:
+        output_file_extension = "json"
 
     if output_path is None:
         output_path = (
             Path.cwd() / f"{model_handle}_diff_"
             f"{old_mdf.model.version}_{new_mdf.model.version}.{output_file_extension}"
         )
-    dict_as_str = repr(result)
-    with Path(output_path).open("w+", encoding="utf-8") as f:
-        f.write(f"diff = {dict_as_str}")
+
+    if output_format == "patch" and not summary_only:
+        patch = make_patch(
+            old_mdf.model,
+            new_mdf.model,
+            ent_types=entity_type or None,
+        )
+        with Path(output_path).open("w+", encoding="utf-8") as f:
+            json.dump(patch, f, indent=2)
+    elif stream:
+        records = iter_diff(
+            old_mdf.model,
+            new_mdf.model,
+            ent_types=entity_type or None,
+            objects_as_dicts=True,
+        )
+        with Path(output_path).open("w+", encoding="utf-8") as f:
+            write_diff(records, f, output_format)
+    else:
+        summary = include_summary or summary_only
+
+        diff = diff_models(
+            mdl_a=old_mdf.model,
+            mdl_b=new_mdf.model,
+            objects_as_dicts=objects_as_dicts,
+            include_summary=summary,
+        )
+        if entity_type:
+            diff = {k: v for k, v in diff.items() if k in entity_type or k == "summary"}
+
+        result = diff.get("summary") if summary_only else diff
+        dict_as_str = repr(result)
+        with Path(output_path).open("w+", encoding="utf-8") as f:
+            f.write(f"diff = {dict_as_str}")
     try:
         os.startfile(output_path)  # noqa: S606
     except OSError as e:
@@ -132,5 +210,45 @@ def main(  # noqa: PLR0913
         logger.exception(msg)
 
 
+def structural_diff(  # noqa: PLR0913
+    model_handle: str,
+    old_mdfs: str | Path | list[str | Path],
+    new_mdfs: str | Path | list[str | Path],
+    old_version: str | None = None,
+    new_version: str | None = None,
+    *,
+    output_path: Path | str | None,
+    output_format: str = "py",
+    entity_type: tuple[str, ...] = (),
+) -> None:
+    """Write the structural diff of two versions of MDF files for a model."""
+    old_mdf = load_mdf_dict(*old_mdfs)
+    new_mdf = load_mdf_dict(*new_mdfs)
+    old_version = old_version or old_mdf.get("Version")
+    new_version = new_version or new_mdf.get("Version")
+    if output_path is None:
+        output_path = (
+            Path.cwd() / f"{model_handle}_diff_"
+            f"{old_version}_{new_version}.{output_format}"
+        )
+    with Path(output_path).open("w+", encoding="utf-8") as f:
+        if output_format == "py":
+            diff = diff_mdf_dicts(
+                old_mdf,
+                new_mdf,
+                ent_types=entity_type or None,
+                handle=model_handle,
+            )
+            f.write(f"diff = {diff!r}")
+        else:
+            records = iter_structural_diff(
+                old_mdf,
+                new_mdf,
+                ent_types=entity_type or None,
+                handle=model_handle,
+            )
+            write_diff(records, f, output_format)
+
+
 if __name__ == "__main__":
     main()
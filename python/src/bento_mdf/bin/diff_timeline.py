@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+"""Show how a model changed across a series of versions."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import click
+from bento_mdf.diff import DIFF_ENT_TYPES
+from bento_mdf.diff_timeline import diff_timeline, format_timeline, load_model_versions
+from bento_mdf.diff_writer import diff_record_to_json
+
+
+@click.command()
+@click.option(
+    "--model_handle",
+    required=True,
+    type=str,
+    prompt=True,
+    help="CRDC Model Handle (e.g. 'GDC')",
+)
+@click.option(
+    "--mdfs",
+    required=True,
+    type=str,
+    multiple=True,
+    help=(
+        "MDF file of one version, oldest first; repeat for each version. "
+        "If a version is split into multiple files, give them comma-separated."
+    ),
+)
+@click.option(
+    "--versions",
+    required=False,
+    type=str,
+    multiple=True,
+    help="Version label for each --mdfs (default: version given in each MDF)",
+)
+@click.option(
+    "--entity_type",
+    required=False,
+    type=click.Choice(DIFF_ENT_TYPES),
+    multiple=True,
+    help="Only include changes to this entity type (may be repeated)",
+)
+@click.option(
+    "--output_format",
+    required=False,
+    type=click.Choice(["text", "json"]),
+    default="text",
+    help="Output format",
+)
+@click.option(
+    "--output_path",
+    required=False,
+    type=str,
+    help="File path for the timeline. If not provided, print to stdout.",
+)
+@click.option(
+    "--max_workers",
+    required=False,
+    type=int,
+    default=1,
+    help="Number of versions to load concurrently",
+)
+def main(  # noqa: PLR0913
+    model_handle: str,
+    mdfs: tuple[str, ...],
+    versions: tuple[str, ...] = (),
+    entity_type: tuple[str, ...] = (),
+    output_format: str = "text",
+    output_path: str | None = None,
+    max_workers: int = 1,
+) -> None:
+    """Generate a change timeline across versions of MDF files for a model."""
+    models = load_model_versions(
+        [src.split(",") for src in mdfs],
+        handle=model_handle,
+        max_workers=max_workers,
+    )
+    timeline = diff_timeline(
+        models,
+        labels=list(versions) or None,
+        ent_types=entity_type or None,
+    )
+    if output_format == "json":
+        records = [
+            {"entity_type": ent_type, "key": entk, "events": events}
+            for ent_type, ent_events in timeline.items()
+            for entk, events in sorted(ent_events.items(), key=repr)
+        ]
+        output = json.dumps(diff_record_to_json(records), indent=2)
+    else:
+        output = format_timeline(timeline)
+    if output_path is None:
+        click.echo(output)
+        return
+    with Path(output_path).open("w", encoding="utf-8") as f:
+        f.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
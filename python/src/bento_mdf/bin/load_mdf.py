@@ -6,8 +6,16 @@ import sys
 sys.path.insert(0, "..")
 import argparse
 import getpass
+import json
 from sys import stderr
 
+from bento_mdf.bulk_load import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_TXN_BATCHES,
+    bulk_load_model,
+    bulk_load_statements,
+)
+from bento_mdf.import_csv import ImportCSVWriter
 from bento_mdf.mdf import MDF
 from bento_meta.mdb import (
     WriteableMDB,
@@ -46,6 +54,33 @@ def main() -> None:
         action="store_true",
         help="Add new nanoids to graph nodes",
     )
+    parser.add_argument(
+        "--bulk",
+        action="store_true",
+        help="Load with UNWIND-batched statements in a few transactions",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help="rows per statement in bulk mode (default %(default)s)",
+    )
+    parser.add_argument(
+        "--txn-batches",
+        type=int,
+        default=DEFAULT_TXN_BATCHES,
+        help="statements per transaction in bulk mode (default %(default)s)",
+    )
+    parser.add_argument(
+        "--csv",
+        metavar="DIR",
+        help="Write neo4j-admin import CSV files to DIR instead of loading",
+    )
+    parser.add_argument(
+        "--csv-append",
+        action="store_true",
+        help="Add the model to the CSV files already in DIR (e.g. another version)",
+    )
     # example:
     # args = parser.parse_args([
     #     "https://raw.githubusercontent.com/CBIIT/icdc-model-tool/master/model-desc/icdc-model.yml",
@@ -79,7 +114,40 @@ def main() -> None:
     mdf = MDF(*args.files, handle=args.handle, _commit=args.commit, raise_error=True)
     model = mdf.model
 
-    if args.put:
+    if args.csv:
+        print(f"Write import CSV files to {args.csv}", file=stderr)
+        with ImportCSVWriter(args.csv, append=args.csv_append) as wr:
+            counts = wr.add_model(model, args.commit)
+        print(
+            "Wrote {nodes} graph nodes and {relationships} relationships".format(
+                **counts,
+            ),
+            file=stderr,
+        )
+        print(" ".join(["neo4j-admin database import full", *wr.import_args()]))
+    elif args.put and args.bulk:
+        print("Bulk load model to DB", file=stderr)
+        mdb = WriteableMDB(uri=args.bolt, user=args.user, password=args.passw)
+        stats = bulk_load_model(
+            model,
+            mdb,
+            args.commit,
+            batch_size=args.batch_size,
+            txn_batches=args.txn_batches,
+            make_nanoids=args.make_nanoids,
+        )
+        secs = max(stats["seconds"], 1e-9)
+        print(
+            "Loaded {nodes} graph nodes and {relationships} relationships with "
+            "{statements} statements in {transactions} transactions".format(**stats),
+            file=stderr,
+        )
+        print(
+            f"{secs:.1f} s; "
+            f"{(stats['nodes'] + stats['relationships']) / secs:.0f} items/s",
+            file=stderr,
+        )
+    elif args.put:
         print("Put model to DB", file=stderr)
         mdb = WriteableMDB(uri=args.bolt, user=args.user, password=args.passw)
         model.mdb = mdb
@@ -98,6 +166,15 @@ def main() -> None:
                         "with n limit 1 set n.nanoid=$nanoid return n",
                         {"commit": args.commit, "nanoid": make_nanoid()},
                     )
+    elif args.bulk:
+        for query, params in bulk_load_statements(
+            model,
+            args.commit,
+            batch_size=args.batch_size,
+            make_nanoids=args.make_nanoids,
+        ):
+            print(query)
+            print(json.dumps(params))
     else:
         for s in load_model_statements(model, args.commit):
             print(s)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+"""Three-way merge of MDF files for a model."""
+
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+import click
+from bento_mdf.diff_writer import diff_record_to_json
+from bento_mdf.mdf.reader import MDFReader
+from bento_mdf.merge import ModelMerge
+
+
+@click.command()
+@click.option(
+    "--model_handle",
+    required=True,
+    type=str,
+    prompt=True,
+    help="CRDC Model Handle (e.g. 'GDC')",
+)
+@click.option(
+    "--base_mdfs",
+    required=True,
+    type=str,
+    multiple=True,
+    help="MDF file(s) of the common base version",
+)
+@click.option(
+    "--ours_mdfs",
+    required=True,
+    type=str,
+    multiple=True,
+    help="MDF file(s) of the first derived version",
+)
+@click.option(
+    "--theirs_mdfs",
+    required=True,
+    type=str,
+    multiple=True,
+    help="MDF file(s) of the second derived version",
+)
+@click.option(
+    "--output_path",
+    required=True,
+    type=str,
+    help="File path for the merged MDF",
+)
+@click.option(
+    "--prefer",
+    required=False,
+    type=click.Choice(["ours", "theirs"]),
+    default="ours",
+    help="Side whose change is kept when the two sides conflict",
+)
+@click.option(
+    "--conflicts_path",
+    required=False,
+    type=str,
+    help="File path for a JSON report of conflicts (default: print to stderr)",
+)
+def main(  # noqa: PLR0913
+    model_handle: str,
+    base_mdfs: tuple[str, ...],
+    ours_mdfs: tuple[str, ...],
+    theirs_mdfs: tuple[str, ...],
+    output_path: str,
+    prefer: str = "ours",
+    conflicts_path: str | None = None,
+) -> None:
+    """Merge two derived versions of MDF files; exit 1 if there were conflicts."""
+    merge = ModelMerge(
+        MDFReader(*base_mdfs, handle=model_handle).model,
+        MDFReader(*ours_mdfs, handle=model_handle).model,
+        MDFReader(*theirs_mdfs, handle=model_handle).model,
+        prefer=prefer,
+    )
+    merge.merge()
+    merge.write_mdf(output_path)
+    if conflicts_path:
+        with Path(conflicts_path).open("w", encoding="utf-8") as f:
+            json.dump(diff_record_to_json(merge.conflicts), f, indent=2)
+    else:
+        for c in merge.conflicts:
+            att = f" attribute '{c['attribute']}'" if c["attribute"] else ""
+            click.echo(
+                f"{c['kind']} conflict: {c['entity_type'][:-1]} {c['key']!r}{att}; "
+                f"kept {c['resolution']}",
+                err=True,
+            )
+    if merge.conflicts:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
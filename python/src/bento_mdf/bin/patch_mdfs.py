@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+"""Apply patches (see diff_mdfs --output_format patch) to MDF files."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import click
+import yaml
+from bento_mdf.patch import apply_patch
+from bento_mdf.structural_diff import load_mdf_dict
+
+
+@click.command()
+@click.option(
+    "--mdfs",
+    required=True,
+    type=str,
+    multiple=True,
+    help=(
+        "MDF file(s) to patch. "
+        "If MDF split into multiple files, provide url or path to each file."
+    ),
+)
+@click.option(
+    "--patch",
+    "patches",
+    required=True,
+    type=str,
+    multiple=True,
+    help="Patch file (JSON or YAML); repeat to apply several patches in order",
+)
+@click.option(
+    "--output_path",
+    required=True,
+    type=str,
+    help="File path for the patched MDF",
+)
+@click.option(
+    "--check_version",
+    required=False,
+    type=bool,
+    default=True,
+    help="Refuse a patch whose from_version is not the version of the MDF",
+)
+def main(
+    mdfs: tuple[str, ...],
+    patches: tuple[str, ...],
+    output_path: str,
+    *,
+    check_version: bool = True,
+) -> None:
+    """Apply one or more patches to MDF files and write the merged result."""
+    mdf = load_mdf_dict(*mdfs).as_dict()
+    for patch_file in patches:
+        with Path(patch_file).open(encoding="utf-8") as f:
+            # JSON is YAML
+            apply_patch(mdf, yaml.safe_load(f), check_version=check_version)
+    with Path(output_path).open("w", encoding="utf-8") as f:
+        yaml.safe_dump(mdf, f, sort_keys=False)
+
+
+if __name__ == "__main__":
+    main()
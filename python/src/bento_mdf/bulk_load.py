@@ -0,0 +1,379 @@
+"""
+bento_mdf.bulk_load
+===================
+
+Batched loading of a Model into an MDB.
+
+:func:`bento_meta.mdb.load_model` runs one transaction per Cypher statement,
+and a model of any size produces tens of thousands of them. Here the graph
+that :func:`bento_meta.mdb.load_model_statements` describes is planned
+client-side instead (:class:`ModelGraph`): each graph node gets a temporary
+key, nanoids are generated locally, and nodes and relationships are written
+with ``UNWIND``-batched statements grouped by label, a few batches per
+transaction. The temporary keys are indexed for the duration of the load,
+so relationship endpoints are found by index lookup, not label scans.
+
+Graph nodes that the per-statement loader MERGEs (model nodes, properties,
+value sets, terms) are MERGEd here too, on the same property maps, so a bulk
+load links to entities already in the database in the same way. Relationship
+nodes are CREATEd; tags and concepts are created once per owner.
+
+Typical usage example:
+    stats = bulk_load_model(model, WriteableMDB(uri=..., user=..., password=...))
+"""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Iterator
+
+from bento_mdf.mdf.reader import make_nano
+
+if TYPE_CHECKING:
+    from bento_meta.entity import Entity
+    from bento_meta.mdb import WriteableMDB
+    from bento_meta.model import Model
+
+# temporary property holding a graph node's load key
+KEY_PROP = "__u"
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_TXN_BATCHES = 50
+
+_LABELS = {"edge": "relationship", "valueset": "value_set"}
+
+
+def graph_props(
+    ent: Entity,
+    model: Model | None,
+    _commit: str | None = None,
+) -> tuple[str, dict]:
+    """
+    Return the label and property map of an entity's MDB graph node, as
+    bento_meta.mdb.loaders writes it (null values omitted).
+    """
+    label = type(ent).__name__.lower()
+    label = _LABELS.get(label, label)
+    if label == "term":
+        props = {"value": ent.value}
+        for att, key in (
+            ("origin_name", "origin_name"),
+            ("origin_id", "origin_id"),
+            ("origin_version", "origin_version"),
+            # sic; the MDB property name
+            ("origin_definition", "origin_defintion"),
+            ("handle", "handle"),
+        ):
+            val = getattr(ent, att)
+            if val:
+                props[key] = val
+    elif label == "value_set":
+        props = {"handle": ent.handle}
+        if ent.url:
+            props["url"] = ent.url
+    elif label == "concept":
+        props = {}
+    elif label == "tag":
+        props = {"key": ent.key, "value": ent.value}
+    else:
+        props = {"handle": ent.handle, "model": model.handle if model else None}
+    if _commit or ent._commit:
+        props["_commit"] = _commit or ent._commit
+    if ent.nanoid:
+        props["nanoid"] = ent.nanoid
+    if ent.desc:
+        props["desc"] = ent.desc
+    return label, {k: v for k, v in props.items() if v is not None}
+
+
+class ModelGraph:
+    """
+    The MDB graph nodes and relationships that represent a Model.
+
+    nodes: load key -> (label, property map, create); create is True for
+      graph nodes that are CREATEd rather than MERGEd.
+    links: (type, source key, target key) tuples, in load order.
+    """
+
+    # labels of graph nodes that are created rather than merged
+    CREATED_LABELS = ("relationship", "tag", "concept")
+
+    def __init__(
+        self,
+        model: Model,
+        _commit: str | None = None,
+        *,
+        make_nanoids: bool = False,
+    ) -> None:
+        """
+        Plan the graph of a model.
+
+        _commit: 'commit string' for marking graph nodes; overrides _commit
+          attributes of the model's entities.
+        make_nanoids: give each graph node without a nanoid a new one (kept
+          by MERGEd nodes that already have one).
+        """
+        self.model = model
+        self._commit = _commit
+        self.make_nanoids = make_nanoids
+        self.token = make_nano()
+        self.nodes = {}
+        self.nanoids = {}
+        self._links = {}
+        # (label, frozen props[, owner key]) -> key
+        self._merged = {}
+        # id(property entity) -> key
+        self._prop_keys = {}
+        self._plan()
+
+    @property
+    def links(self) -> list[tuple[str, str, str]]:
+        """Relationships between graph nodes, in load order."""
+        return list(self._links)
+
+    def _add(
+        self,
+        label: str,
+        props: dict,
+        *,
+        owner: str | None = None,
+        create: bool = False,
+    ) -> str:
+        # relationship nodes are always new; tags and concepts are new once
+        # per owner
+        ident = None
+        if owner is not None or not create:
+            ident = (label, frozenset(props.items()), owner)
+        key = self._merged.get(ident) if ident else None
+        if key is None:
+            key = f"{self.token}:{len(self.nodes)}"
+            self.nodes[key] = (label, props, create)
+            if self.make_nanoids and "nanoid" not in props:
+                self.nanoids[key] = make_nano()
+            if ident:
+                self._merged[ident] = key
+        return key
+
+    def _entity(self, ent: Entity, *, extra: dict | None = None) -> str:
+        label, props = graph_props(ent, self.model, self._commit)
+        if extra:
+            props.update((k, v) for k, v in extra.items() if v is not None)
+        return self._add(label, props)
+
+    def _link(self, typ: str, src: str, dst: str) -> None:
+        self._links[(typ, src, dst)] = None
+
+    def _plan(self) -> None:
+        model = self.model
+        node_keys = {}
+        for node in model.nodes.values():
+            key = node_keys[node.handle] = self._entity(node)
+            self._tags(node, key)
+            self._props(node, key)
+            self._annotate(node, key)
+        for edge in model.edges.values():
+            label, props = graph_props(edge, model, self._commit)
+            if edge.multiplicity:
+                props["multiplicity"] = edge.multiplicity
+            if edge.is_required:
+                props["is_required"] = edge.is_required
+            key = self._add(label, props, create=True)
+            for typ, end in (("has_src", edge.src), ("has_dst", edge.dst)):
+                end_key = node_keys.get(end.handle) or self._entity(end)
+                self._link(typ, key, end_key)
+            self._tags(edge, key)
+            self._props(edge, key)
+            self._annotate(edge, key)
+        for prop in model.props.values():
+            if prop.value_domain != "value_set":
+                continue
+            prop_key = self._prop_keys.get(id(prop))
+            if prop_key is None:
+                # not a prop of any node or edge; the per-statement loader
+                # would only MATCH it
+                continue
+            vs_key = self._entity(prop.value_set)
+            self._link("has_value_set", prop_key, vs_key)
+            self._annotate(prop, prop_key)
+            for term in prop.terms.values():
+                self._link("has_term", vs_key, self._entity(term))
+
+    def _props(self, ent: Entity, key: str) -> None:
+        for prop in ent.props.values():
+            prop_key = self._entity(prop, extra={"value_domain": prop.value_domain})
+            self._prop_keys[id(prop)] = prop_key
+            self._link("has_property", key, prop_key)
+            self._tags(prop, prop_key)
+
+    def _tags(self, ent: Entity, key: str) -> None:
+        for tag in ent.tags.values():
+            label, props = graph_props(tag, None, self._commit)
+            self._link("has_tag", key, self._add(label, props, owner=key, create=True))
+
+    def _annotate(self, ent: Entity, key: str) -> None:
+        concept = ent.concept
+        if not concept or not concept.terms:
+            return
+        label, props = graph_props(concept, None, self._commit)
+        c_key = self._add(label, props, owner=key, create=True)
+        self._link("has_concept", key, c_key)
+        for term in concept.terms.values():
+            self._link("represents", self._entity(term), c_key)
+
+    def statements(
+        self,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> list[tuple[str, dict]]:
+        """
+        Return (Cypher, parameters) pairs that load the graph: creation of
+        temporary key indexes, graph nodes, relationships, removal of the
+        temporary keys, then dropping of the indexes. Each data statement
+        UNWINDs at most batch_size rows of $rows; index statements (see
+        is_schema_statement) have no parameters.
+        """
+        if batch_size < 1:
+            msg = "batch_size must be positive"
+            raise ValueError(msg)
+        node_groups = {}
+        for key, (label, props, create) in self.nodes.items():
+            nanoid = self.nanoids.get(key)
+            group = (label, create, tuple(props), nanoid is not None)
+            row = {**props, KEY_PROP: key}
+            if nanoid is not None:
+                row["__nanoid"] = nanoid
+            node_groups.setdefault(group, []).append(row)
+        link_groups = {}
+        for typ, src, dst in self._links:
+            group = (typ, self.nodes[src][0], self.nodes[dst][0])
+            link_groups.setdefault(group, []).append({"src": src, "dst": dst})
+        key_groups = {}
+        for key, (label, _, _) in self.nodes.items():
+            key_groups.setdefault(label, []).append(key)
+
+        indexes = {label: self.index_name(label) for label in key_groups}
+        stmts = [
+            (
+                f"CREATE INDEX {name} IF NOT EXISTS "
+                f"FOR (n:{label}) ON (n.{KEY_PROP})",
+                {},
+            )
+            for label, name in indexes.items()
+        ]
+        if indexes:
+            stmts.append(("CALL db.awaitIndexes()", {}))
+        for (label, create, keys, nanoids), rows in node_groups.items():
+            props = ", ".join(f"{k}: row.{k}" for k in keys)
+            lines = [
+                "UNWIND $rows AS row",
+                f"{'CREATE' if create else 'MERGE'} (n:{label} {{{props}}})",
+                f"SET n.{KEY_PROP} = row.{KEY_PROP}",
+            ]
+            if nanoids:
+                lines.append("SET n.nanoid = coalesce(n.nanoid, row.__nanoid)")
+            stmts.extend(_batches("\n".join(lines), rows, batch_size))
+        for (typ, src_label, dst_label), rows in link_groups.items():
+            query = "\n".join(
+                [
+                    "UNWIND $rows AS row",
+                    f"MATCH (a:{src_label} {{{KEY_PROP}: row.src}})",
+                    f"MATCH (b:{dst_label} {{{KEY_PROP}: row.dst}})",
+                    f"MERGE (a)-[:{typ}]->(b)",
+                ],
+            )
+            stmts.extend(_batches(query, rows, batch_size))
+        for label, keys in key_groups.items():
+            query = "\n".join(
+                [
+                    "UNWIND $rows AS key",
+                    f"MATCH (n:{label} {{{KEY_PROP}: key}})",
+                    f"REMOVE n.{KEY_PROP}",
+                ],
+            )
+            stmts.extend(_batches(query, keys, batch_size))
+        stmts.extend((f"DROP INDEX {name} IF EXISTS", {}) for name in indexes.values())
+        return stmts
+
+    def index_name(self, label: str) -> str:
+        """Return the name of this load's temporary key index for a label."""
+        return f"`bulk_load_{label}_{self.token}`"
+
+
+def is_schema_statement(query: str) -> bool:
+    """
+    Return True for the index statements of a bulk load, which Neo4j runs
+    apart from data writes, each in its own transaction.
+    """
+    return query.startswith(("CREATE INDEX", "DROP INDEX", "CALL db.awaitIndexes"))
+
+
+def _batches(query: str, rows: list, batch_size: int) -> Iterator[tuple[str, dict]]:
+    for i in range(0, len(rows), batch_size):
+        yield query, {"rows": rows[i : i + batch_size]}
+
+
+def _run_statements(tx, stmts: list[tuple[str, dict]]) -> None:  # noqa: ANN001
+    for query, params in stmts:
+        tx.run(query, params).consume()
+
+
+def bulk_load_statements(
+    model: Model,
+    _commit: str | None = None,
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    make_nanoids: bool = False,
+) -> list[tuple[str, dict]]:
+    """
+    Return batched (Cypher, parameters) pairs that load a model into an MDB.
+
+    :param :class:`bento_meta.model.Model` model: Model to load
+    :param str _commit: 'Commit string' for marking graph nodes
+    :param int batch_size: maximum rows per statement
+    :param bool make_nanoids: give graph nodes without nanoids new ones
+    """
+    graph = ModelGraph(model, _commit, make_nanoids=make_nanoids)
+    return graph.statements(batch_size)
+
+
+def bulk_load_model(
+    model: Model,
+    mdb: WriteableMDB,
+    _commit: str | None = None,
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    txn_batches: int = DEFAULT_TXN_BATCHES,
+    make_nanoids: bool = False,
+) -> dict:
+    """
+    Load a model into an MDB with batched statements, txn_batches statements
+    per write transaction (index statements run in transactions of their
+    own).
+
+    Returns counts of graph nodes, relationships, statements and
+    transactions, and the elapsed seconds.
+    """
+    if txn_batches < 1:
+        msg = "txn_batches must be positive"
+        raise ValueError(msg)
+    graph = ModelGraph(model, _commit, make_nanoids=make_nanoids)
+    stmts = graph.statements(batch_size)
+    start = time.perf_counter()
+    txns = []
+    for stmt in stmts:
+        if is_schema_statement(stmt[0]):
+            txns.append([stmt])
+            txns.append([])
+        elif not txns or len(txns[-1]) == txn_batches:
+            txns.append([stmt])
+        else:
+            txns[-1].append(stmt)
+    txns = [txn for txn in txns if txn]
+    with mdb.driver.session() as session:
+        for txn in txns:
+            session.execute_write(_run_statements, txn)
+    return {
+        "nodes": len(graph.nodes),
+        "relationships": len(graph.links),
+        "statements": len(stmts),
+        "transactions": len(txns),
+        "seconds": time.perf_counter() - start,
+    }
@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import hashlib
 import logging
-from typing import TYPE_CHECKING
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Iterator
 
 from bento_meta.entity import CollValue, Entity
 from bento_meta.objects import Concept, Edge, Node, Property, Tag, Term, ValueSet
@@ -14,6 +16,72 @@ if TYPE_CHECKING:
     from bento_meta.model import Model
 
 
+class TermSetCache:
+    """
+    Memoized term key sets of value sets and concepts, and their comparisons.
+
+    Large enums are often shared: by props made from one PropDefinition
+    (which share a ValueSet), or by PropDefinitions with the same Enum list
+    (whose ValueSets hold the same term keys). Each container's key set is
+    built once and interned, so equal key sets are the same frozenset; digest
+    parts and comparisons are then memoized per distinct key set (or pair of
+    key sets) rather than recomputed for every prop.
+
+    Containers are assumed not to change while the cache is in use, as
+    during a single diff of two models.
+    """
+
+    _EMPTY = frozenset()
+
+    def __init__(self) -> None:
+        """Initialize the cache."""
+        # id(container) -> (container, interned key set); the container is
+        # kept so its id can't be reused
+        self._by_container = {}
+        self._interned = {}
+        self._digest_parts = {}
+        self._comparisons = {}
+
+    def keys(self, container: ValueSet | Concept | None) -> frozenset:
+        """Return the (interned) set of term keys of a value set or concept."""
+        if container is None or not container.terms:
+            return self._EMPTY
+        entry = self._by_container.get(id(container))
+        if entry is None:
+            keys = frozenset(container.terms)
+            keys = self._interned.setdefault(keys, keys)
+            entry = self._by_container[id(container)] = (container, keys)
+        return entry[1]
+
+    def digest_part(self, container: ValueSet | Concept) -> tuple:
+        """Return _object_digest_part(container), computed once per key set."""
+        keys = self.keys(container)
+        cache_key = (type(container).__name__, id(keys))
+        part = self._digest_parts.get(cache_key)
+        if part is None:
+            part = self._digest_parts[cache_key] = (
+                type(container).__name__,
+                sorted(repr(x) for x in keys),
+            )
+        return part
+
+    def compare(
+        self,
+        container_a: ValueSet | Concept | None,
+        container_b: ValueSet | Concept | None,
+    ) -> tuple[frozenset, frozenset]:
+        """Return the (removed, added) term keys between two containers."""
+        keys_a = self.keys(container_a)
+        keys_b = self.keys(container_b)
+        if keys_a is keys_b:
+            return self._EMPTY, self._EMPTY
+        cache_key = (id(keys_a), id(keys_b))
+        result = self._comparisons.get(cache_key)
+        if result is None:
+            result = self._comparisons[cache_key] = (keys_a - keys_b, keys_b - keys_a)
+        return result
+
+
 class Diff:
     """Class for manipulating the final result data structure when diff models."""
 
@@ -23,6 +91,57 @@ class Diff:
         self.clss = {"nodes": Node, "edges": Edge, "props": Property, "terms": Term}
         self.result = {}  # This will eventually hold the diff results
         self.annotations = {"nodes": {}, "edges": {}, "props": {}, "terms": {}}
+        self.term_sets = TermSetCache()
+
+    @property
+    def annotations(self) -> dict:
+        """Concept term changes, as {ent_type: {entk: {"removed": ..., "added": ...}}}."""
+        return self._annotations
+
+    @annotations.setter
+    def annotations(self, value: dict) -> None:
+        self._annotations = value
+        # reverse index {action: {term key: (ent_type, entk)}}; built on demand
+        self._annotated_by = None
+
+    def update_annotations(
+        self,
+        ent_type: str,
+        entk: str | tuple[str, str] | tuple[str, str, str],
+        removed: dict | None,
+        added: dict | None,
+    ) -> None:
+        """Record the concept terms removed from/added to an entity."""
+        self._annotations[ent_type][entk] = {"removed": removed, "added": added}
+        if self._annotated_by is not None:
+            self._index_annotation(ent_type, entk, self._annotations[ent_type][entk])
+
+    def _index_annotation(
+        self,
+        ent_type: str,
+        entk: str | tuple[str, str] | tuple[str, str, str],
+        anno_change: dict,
+    ) -> None:
+        for action, index in self._annotated_by.items():
+            for termk in anno_change.get(action) or {}:
+                # first annotated entity recorded wins
+                index.setdefault(termk, (ent_type, entk))
+
+    def annotated_entity(
+        self,
+        action: str,
+        termk: tuple,
+    ) -> tuple[str, str | tuple[str, str] | tuple[str, str, str]] | None:
+        """
+        Return (ent_type, entk) of the entity whose concept had term 'termk'
+        removed or added (per 'action'), or None.
+        """
+        if self._annotated_by is None:
+            self._annotated_by = {"removed": {}, "added": {}}
+            for ent_type, anno_changes in self._annotations.items():
+                for entk, anno_change in anno_changes.items():
+                    self._index_annotation(ent_type, entk, anno_change)
+        return self._annotated_by.get(action, {}).get(termk)
 
     def update_result(
         self,
@@ -187,10 +306,12 @@ def diff_object_atts(
             continue
         # handle 'term container' objects
         if att == "concept":
-            diff.annotations[ent_type][entk] = {
-                "removed": getattr(a_att, "terms", None),
-                "added": getattr(b_att, "terms", None),
-            }
+            diff.update_annotations(
+                ent_type,
+                entk,
+                getattr(a_att, "terms", None),
+                getattr(b_att, "terms", None),
+            )
         if not a_att and isinstance(b_att, (ValueSet, Concept)):
             a_att = Concept() if att == "concept" else ValueSet()
             diff_collection_atts(a_att, b_att, ["terms"], ent_type, entk, diff)
@@ -198,7 +319,8 @@ def diff_object_atts(
             b_att = Concept() if att == "concept" else ValueSet()
             diff_collection_atts(a_att, b_att, ["terms"], ent_type, entk, diff)
         if type(a_att) is type(b_att) and isinstance(a_att, (ValueSet, Concept)):
-            if not diff.valuesets_are_different(a_att, b_att):
+            # interned key sets are identical iff the terms are the same
+            if diff.term_sets.keys(a_att) is diff.term_sets.keys(b_att):
                 continue
             diff_collection_atts(a_att, b_att, ["terms"], ent_type, entk, diff)
         elif getattr(a_att, "handle", None):
@@ -224,6 +346,19 @@ def diff_collection_atts(
     for att in coll_atts:
         a_coll = getattr(a_ent, att)
         b_coll = getattr(b_ent, att)
+        if att == "terms":
+            # value set or concept terms; compared once per pair of key sets
+            removed, added = diff.term_sets.compare(a_ent, b_ent)
+            if not removed and not added:
+                continue
+            diff.update_result(
+                ent_type,
+                entk,
+                "value_set" if isinstance(a_ent, ValueSet) else "concept",
+                {x: a_coll[x] for x in removed},
+                {x: b_coll[x] for x in added},
+            )
+            continue
         if set(a_coll) == set(b_coll):
             # compare simple atts for coll atts that don't already (e.g. tags)
             if att == "tags":
@@ -231,11 +366,12 @@ def diff_collection_atts(
             continue
         removed_coll = {x: a_coll[x] for x in list(set(a_coll) - set(b_coll))}
         added_coll = {x: b_coll[x] for x in list(set(b_coll) - set(a_coll))}
-        if att == "terms":
-            if isinstance(a_ent, ValueSet):
-                att = "value_set"
-            elif isinstance(a_ent, Concept):
-                att = "concept"
+        if att == "tags":
+            # include common tags whose values differ
+            for tagk in set(a_coll) & set(b_coll):
+                if a_coll[tagk].value != b_coll[tagk].value:
+                    removed_coll[tagk] = a_coll[tagk]
+                    added_coll[tagk] = b_coll[tagk]
         diff.update_result(ent_type, entk, att, removed_coll, added_coll)
 
 
@@ -247,11 +383,16 @@ def diff_tag_values(
     diff: Diff,
 ) -> None:
     """Diff values for tags w/ same key."""
+    removed = {}
+    added = {}
     for tagk, a_tag in a_tags.items():
         b_tag = b_tags[tagk]
         if a_tag.value == b_tag.value:
             continue
-        diff.update_result(ent_type, entk, "tags", {tagk: a_tag}, {tagk: b_tag})
+        removed[tagk] = a_tag
+        added[tagk] = b_tag
+    if removed:
+        diff.update_result(ent_type, entk, "tags", removed, added)
 
 
 def get_ent_atts(ent_type: str, diff: Diff) -> dict:
@@ -282,27 +423,330 @@ def get_collection_atts(ent_atts: dict) -> list[str]:
     return [x for x, y in ent_atts.items() if y == "collection"]
 
 
-def diff_attributes(diff: Diff) -> None:
-    """Populate diff.sets with added/removed/changed attributes for common entities."""
+def _object_digest_part(
+    obj: Entity | None,
+    term_sets: TermSetCache | None = None,
+) -> tuple | None:
+    """Digest component for an "object" attribute, as diff_object_atts compares it."""
+    if obj is None:
+        return None
+    if isinstance(obj, (ValueSet, Concept)):
+        if term_sets is not None:
+            return term_sets.digest_part(obj)
+        return (type(obj).__name__, sorted(repr(x) for x in obj.terms))
+    if getattr(obj, "handle", None):
+        return ("handle", obj.handle)
+    # not comparable by content; never treat as unchanged
+    return ("id", id(obj))
+
+
+def entity_snapshot(
+    ent: Entity,
+    ent_atts: dict,
+    term_sets: TermSetCache | None = None,
+) -> tuple:
+    """
+    Return a snapshot of what diff_attributes compares in an entity.
+
+    The snapshot holds one part per attribute in ent_atts, in order: simple
+    attribute values, handles of object attributes, terms of value sets and
+    concepts, keys of collection attributes and tag values. An attribute
+    whose parts are equal in two entities has no differences. Parts for value
+    sets and concepts are memoized in term_sets, if given.
+    """
+    parts = []
+    for att, kind in ent_atts.items():
+        if kind == "simple":
+            parts.append(getattr(ent, att))
+        elif kind == "object":
+            parts.append(_object_digest_part(getattr(ent, att), term_sets))
+        elif kind == "collection":
+            val = getattr(ent, att) or {}
+            if att == "tags":
+                parts.append(sorted((repr(k), repr(t.value)) for k, t in val.items()))
+            else:
+                parts.append(sorted(map(repr, val)))
+    return tuple(parts)
+
+
+def entity_digest(
+    ent: Entity,
+    ent_atts: dict,
+    term_sets: TermSetCache | None = None,
+) -> str:
+    """
+    Return a structural digest of an entity (a hash of its entity_snapshot).
+
+    Two entities with equal digests have no attribute differences.
+    """
+    snapshot = entity_snapshot(ent, ent_atts, term_sets)
+    return hashlib.blake2b(repr(snapshot).encode(), digest_size=16).hexdigest()
+
+
+def model_digests(mdl: Model) -> dict[str, dict]:
+    """
+    Return entity digests for a model, as {ent_type: {entk: digest}}.
+
+    Digests can be computed once per model and passed to diff_models to
+    diff the same model against several others.
+    """
+    diff = Diff()
+    digests = {}
+    for ent_type in diff.sets:
+        ent_atts = get_ent_atts(ent_type, diff)
+        digests[ent_type] = {
+            entk: entity_digest(ent, ent_atts, diff.term_sets)
+            for entk, ent in getattr(mdl, ent_type).items()
+        }
+    return digests
+
+
+def record_concept_annotations(  # noqa: PLR0913
+    diff: Diff,
+    ent_type: str,
+    entk: str | tuple[str, str] | tuple[str, str, str],
+    a_ent: Entity,
+    b_ent: Entity,
+    ent_atts: dict,
+) -> None:
+    """
+    Record concept terms of an entity whose concept is otherwise unchanged.
+
+    diff_object_atts records them for every pair of distinct concept objects,
+    for annotation lookups in the summary; paths that skip diff_object_atts
+    for unchanged concepts call this to do the same.
+    """
+    if "concept" in ent_atts and a_ent.concept != b_ent.concept:
+        diff.update_annotations(
+            ent_type,
+            entk,
+            getattr(a_ent.concept, "terms", None),
+            getattr(b_ent.concept, "terms", None),
+        )
+
+
+def diff_common_entity(  # noqa: PLR0913
+    diff: Diff,
+    ent_type: str,
+    entk: str | tuple[str, str] | tuple[str, str, str],
+    a_ent: Entity,
+    b_ent: Entity,
+    ent_atts: dict,
+    *,
+    use_digests: bool = True,
+    a_dig: str | None = None,
+    b_dig: str | None = None,
+) -> None:
+    """
+    Record the attribute differences between two versions of an entity in diff.
+
+    If use_digests is True, the entities are skipped without comparing their
+    attributes when their structural digests (a_dig/b_dig, computed here if
+    not given) are equal.
+    """
+    if use_digests:
+        a_dig = a_dig or entity_digest(a_ent, ent_atts, diff.term_sets)
+        b_dig = b_dig or entity_digest(b_ent, ent_atts, diff.term_sets)
+        if a_dig == b_dig:
+            record_concept_annotations(diff, ent_type, entk, a_ent, b_ent, ent_atts)
+            return
+
+    diff_simple_atts(a_ent, b_ent, get_simple_atts(ent_atts), ent_type, entk, diff)
+
+    diff_object_atts(a_ent, b_ent, get_object_atts(ent_atts), ent_type, entk, diff)
+
+    diff_collection_atts(
+        a_ent,
+        b_ent,
+        get_collection_atts(ent_atts),
+        ent_type,
+        entk,
+        diff,
+    )
+
+
+def diff_attributes(
+    diff: Diff,
+    *,
+    use_digests: bool = True,
+    digests_a: dict[str, dict] | None = None,
+    digests_b: dict[str, dict] | None = None,
+) -> None:
+    """
+    Populate diff.sets with added/removed/changed attributes for common entities.
+
+    If use_digests is True, common entities whose structural digests are equal
+    are skipped without comparing their attributes. Digests are taken from
+    digests_a/digests_b (see model_digests) when given, or computed here.
+    """
     sets = diff.sets
 
     for ent_type, ent_handles in sets.items():
         logging.info("now doing ..%s", ent_type)
         ent_atts = get_ent_atts(ent_type, diff)
-        simple_atts = get_simple_atts(ent_atts)
-        obj_atts = get_object_atts(ent_atts)
-        coll_atts = get_collection_atts(ent_atts)
+        dig_a = (digests_a or {}).get(ent_type, {})
+        dig_b = (digests_b or {}).get(ent_type, {})
 
         for entk, ab_ent_dict in ent_handles["common"].items():
             logging.info("...common entk is %s", entk)
-            a_ent = ab_ent_dict["a"]
-            b_ent = ab_ent_dict["b"]
+            diff_common_entity(
+                diff,
+                ent_type,
+                entk,
+                ab_ent_dict["a"],
+                ab_ent_dict["b"],
+                ent_atts,
+                use_digests=use_digests,
+                a_dig=dig_a.get(entk),
+                b_dig=dig_b.get(entk),
+            )
 
-            diff_simple_atts(a_ent, b_ent, simple_atts, ent_type, entk, diff)
 
-            diff_object_atts(a_ent, b_ent, obj_atts, ent_type, entk, diff)
+# the models diffed by a diff_attributes_parallel worker process
+_worker_models = None
+
+
+def _init_diff_worker(mdl_a: Model, mdl_b: Model) -> None:
+    global _worker_models  # noqa: PLW0603
+    _worker_models = (mdl_a, mdl_b)
+
+
+def _change_part(val: object) -> tuple:
+    """
+    Return a picklable stand-in for one side of an attribute change.
+
+    Entities are replaced by a reference to the attribute that holds them,
+    and dicts of entities (tags, props, terms) by their keys.
+    """
+    if isinstance(val, Entity):
+        return ("object",)
+    if isinstance(val, dict):
+        return ("keys", list(val))
+    return ("value", val)
+
+
+def _resolve_change_part(
+    ent: Entity,
+    att: str,
+    part: tuple,
+) -> str | int | Entity | dict | None:
+    """Return the value a _change_part stands for, taken from ent."""
+    if part[0] == "value":
+        return part[1]
+    obj = getattr(ent, att)
+    if part[0] == "object":
+        return obj
+    if isinstance(obj, (ValueSet, Concept)):
+        obj = obj.terms
+    return {x: obj[x] for x in part[1]}
+
+
+def diff_entity_type(
+    ent_type: str,
+    *,
+    use_digests: bool = True,
+    digests_a: dict | None = None,
+    digests_b: dict | None = None,
+) -> dict:
+    """
+    Diff the common entities of one type of the worker's models.
+
+    Runs in a diff_attributes_parallel worker process. Snapshots (digests)
+    of the entities are built and compared, and entities that differ are
+    diffed in detail, as in diff_attributes. Returns the changes as plain
+    data, {"changed": {entk: [(att, removed, added), ...]}, "annotated":
+    [entk, ...]}, with entities given by _change_part.
+    digests_a, digests_b: precomputed digests of this entity type.
+    """
+    mdl_a, mdl_b = _worker_models
+    diff = Diff()
+    a_ents = getattr(mdl_a, ent_type)
+    b_ents = getattr(mdl_b, ent_type)
+    ent_atts = get_ent_atts(ent_type, diff)
+    dig_a = digests_a or {}
+    dig_b = digests_b or {}
+    for entk in a_ents.keys() & b_ents.keys():
+        diff_common_entity(
+            diff,
+            ent_type,
+            entk,
+            a_ents[entk],
+            b_ents[entk],
+            ent_atts,
+            use_digests=use_digests,
+            a_dig=dig_a.get(entk),
+            b_dig=dig_b.get(entk),
+        )
+    changed = diff.result.get(ent_type, {}).get("changed", {})
+    return {
+        "changed": {
+            entk: [
+                (att, _change_part(c["removed"]), _change_part(c["added"]))
+                for att, c in atts.items()
+            ]
+            for entk, atts in changed.items()
+        },
+        "annotated": list(diff.annotations[ent_type]),
+    }
+
+
+def diff_attributes_parallel(  # noqa: PLR0913
+    diff: Diff,
+    mdl_a: Model,
+    mdl_b: Model,
+    *,
+    max_workers: int | None = None,
+    use_digests: bool = True,
+    digests_a: dict[str, dict] | None = None,
+    digests_b: dict[str, dict] | None = None,
+) -> None:
+    """
+    Populate diff like diff_attributes, diffing entity types concurrently.
 
-            diff_collection_atts(a_ent, b_ent, coll_atts, ent_type, entk, diff)
+    Each entity type is diffed by diff_entity_type in a pool of max_workers
+    processes (default: one per entity type), which receive a copy of the
+    models when they start. The changes they return are merged into diff in
+    the order diff_attributes records them, so diff.result and
+    diff.annotations are the same as from diff_attributes.
+    """
+    with ProcessPoolExecutor(
+        max_workers=max_workers or len(diff.sets),
+        initializer=_init_diff_worker,
+        initargs=(mdl_a, mdl_b),
+    ) as pool:
+        tasks = {
+            ent_type: pool.submit(
+                diff_entity_type,
+                ent_type,
+                use_digests=use_digests,
+                digests_a=(digests_a or {}).get(ent_type),
+                digests_b=(digests_b or {}).get(ent_type),
+            )
+            for ent_type in diff.sets
+        }
+        for ent_type, ent_handles in diff.sets.items():
+            logging.info("now doing ..%s", ent_type)
+            result = tasks[ent_type].result()
+            changed = result["changed"]
+            annotated = set(result["annotated"])
+            for entk, ab_ent_dict in ent_handles["common"].items():
+                a_ent = ab_ent_dict["a"]
+                b_ent = ab_ent_dict["b"]
+                if entk in annotated:
+                    diff.update_annotations(
+                        ent_type,
+                        entk,
+                        getattr(a_ent.concept, "terms", None),
+                        getattr(b_ent.concept, "terms", None),
+                    )
+                for att, removed, added in changed.get(entk, ()):
+                    diff.update_result(
+                        ent_type,
+                        entk,
+                        att,
+                        _resolve_change_part(a_ent, att, removed),
+                        _resolve_change_part(b_ent, att, added),
+                    )
 
 
 def diff_objects_to_attr_dict(
@@ -335,6 +779,11 @@ def diff_models(
     *,
     objects_as_dicts: bool = False,
     include_summary: bool = False,
+    use_digests: bool = True,
+    digests_a: dict[str, dict] | None = None,
+    digests_b: dict[str, dict] | None = None,
+    parallel: bool = False,
+    max_workers: int | None = None,
 ) -> dict:
     """
     Find the diff between two models.
@@ -343,6 +792,11 @@ def diff_models(
 
     objects_as_dicts: return attr dicts instead of bento_meta objects.
     include_summary: include a summary of the diff in the result.
+    use_digests: skip detailed comparison of common entities with equal
+      structural digests (see entity_digest).
+    digests_a, digests_b: precomputed model_digests() of mdl_a and mdl_b.
+    parallel: diff the entity types concurrently in a pool of max_workers
+      processes (see diff_attributes_parallel).
     """
     diff_ = Diff()
 
@@ -350,7 +804,23 @@ def diff_models(
     diff_entities(mdl_a, mdl_b, diff_)
 
     logging.info("point B")
-    diff_attributes(diff_)
+    if parallel:
+        diff_attributes_parallel(
+            diff_,
+            mdl_a,
+            mdl_b,
+            max_workers=max_workers,
+            use_digests=use_digests,
+            digests_a=digests_a,
+            digests_b=digests_b,
+        )
+    else:
+        diff_attributes(
+            diff_,
+            use_digests=use_digests,
+            digests_a=digests_a,
+            digests_b=digests_b,
+        )
 
     logging.info("done")
     diff_.finalize_result(include_summary=include_summary)
@@ -363,3 +833,113 @@ def diff_models(
             raise ValueError(msg)
 
     return result
+
+
+DIFF_ENT_TYPES = ("nodes", "edges", "props", "terms")
+
+
+def diff_record(  # noqa: PLR0913
+    ent_type: str,
+    action: str,
+    entk: str | tuple[str, str] | tuple[str, str, str],
+    att: str | None,
+    removed: object,
+    added: object,
+    *,
+    objects_as_dicts: bool = False,
+) -> dict:
+    """
+    Return a single change record, as yielded by iter_diff.
+
+    action is "removed" or "added" for a whole entity (att is None), or
+    "changed" for one attribute of a common entity.
+    """
+    if objects_as_dicts:
+        removed = diff_objects_to_attr_dict(removed)
+        added = diff_objects_to_attr_dict(added)
+    return {
+        "entity_type": ent_type,
+        "action": action,
+        "key": entk,
+        "attribute": att,
+        "removed": removed,
+        "added": added,
+    }
+
+
+def iter_diff(  # noqa: PLR0913
+    mdl_a: Model,
+    mdl_b: Model,
+    *,
+    ent_types: list[str] | tuple[str, ...] | None = None,
+    objects_as_dicts: bool = False,
+    use_digests: bool = True,
+    digests_a: dict[str, dict] | None = None,
+    digests_b: dict[str, dict] | None = None,
+) -> Iterator[dict]:
+    """
+    Generate the diff between two models one change record at a time.
+
+    Yields the same changes diff_models returns (see diff_record for the
+    record layout), ordered by entity type and entity key, without building
+    the whole result. Only the changes to one common entity are held in
+    memory at a time. No summary is produced.
+
+    ent_types: only diff these entity types (default: all of DIFF_ENT_TYPES).
+    Other arguments are as for diff_models.
+    """
+    ent_types = ent_types or DIFF_ENT_TYPES
+    unknown = [t for t in ent_types if t not in DIFF_ENT_TYPES]
+    if unknown:
+        msg = f"Unknown entity type(s) {unknown}; expected one of {DIFF_ENT_TYPES}"
+        raise ValueError(msg)
+    diff_ = Diff()
+    for ent_type in ent_types:
+        a_ents = getattr(mdl_a, ent_type)
+        b_ents = getattr(mdl_b, ent_type)
+        for entk in sorted(a_ents.keys() - b_ents.keys(), key=repr):
+            yield diff_record(
+                ent_type,
+                "removed",
+                entk,
+                None,
+                a_ents[entk],
+                None,
+                objects_as_dicts=objects_as_dicts,
+            )
+        for entk in sorted(b_ents.keys() - a_ents.keys(), key=repr):
+            yield diff_record(
+                ent_type,
+                "added",
+                entk,
+                None,
+                None,
+                b_ents[entk],
+                objects_as_dicts=objects_as_dicts,
+            )
+        ent_atts = get_ent_atts(ent_type, diff_)
+        dig_a = (digests_a or {}).get(ent_type, {})
+        dig_b = (digests_b or {}).get(ent_type, {})
+        for entk in sorted(a_ents.keys() & b_ents.keys(), key=repr):
+            diff_common_entity(
+                diff_,
+                ent_type,
+                entk,
+                a_ents[entk],
+                b_ents[entk],
+                ent_atts,
+                use_digests=use_digests,
+                a_dig=dig_a.get(entk),
+                b_dig=dig_b.get(entk),
+            )
+            changed = diff_.result.get(ent_type, {}).get("changed", {}).pop(entk, {})
+            for att, change in changed.items():
+                yield diff_record(
+                    ent_type,
+                    "changed",
+                    entk,
+                    att,
+                    change["removed"],
+                    change["added"],
+                    objects_as_dicts=objects_as_dicts,
+                )
@@ -0,0 +1,197 @@
+"""
+Memory-lean change records for model diffs.
+
+A :class:`DiffRecord` holds one change as plain keys and scalars: the
+entity key, the changed attribute, and the old and new values, where
+entity values are reduced to their handles and collections to tuples of
+their item keys. Records keep only weak references to the entities they
+describe, so a list of records does not keep the diffed models alive;
+full attribute dicts are built on request with
+:meth:`DiffRecord.materialize`, as long as the models still exist.
+
+Typical usage example:
+    records = compact_diff(mdl_a, mdl_b)
+    for rec in records:
+        print(rec.entity_type, rec.key, rec.attribute, rec.old, rec.new)
+"""
+
+from __future__ import annotations
+
+import weakref
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Iterator
+
+from bento_meta.entity import Entity
+from bento_meta.objects import Concept, Tag, ValueSet
+
+from bento_mdf.diff import diff_objects_to_attr_dict, iter_diff
+
+if TYPE_CHECKING:
+    from bento_meta.model import Model
+
+
+def _compact(att: str | None, val: object) -> object:
+    """Reduce a diff value to scalars and keys."""
+    if val is None or isinstance(val, (str, int, float, bool)):
+        return val
+    if isinstance(val, Mapping):
+        if att == "tags":
+            return tuple(
+                sorted(
+                    ((k, t.value if isinstance(t, Tag) else t) for k, t in val.items()),
+                    key=repr,
+                ),
+            )
+        return tuple(sorted(val, key=repr))
+    if isinstance(val, Entity):
+        return getattr(val, "handle", None)
+    return val
+
+
+class DiffRecord:
+    """One change between two models, as keys and scalars."""
+
+    __slots__ = ("_refs", "action", "attribute", "entity_type", "key", "new", "old")
+
+    def __init__(  # noqa: PLR0913
+        self,
+        entity_type: str,
+        action: str,
+        key: str | tuple,
+        attribute: str | None = None,
+        old: object = None,
+        new: object = None,
+        ents: tuple[Entity | None, Entity | None] = (None, None),
+    ) -> None:
+        """
+        Initialize the record.
+
+        old, new: compact old and new values of a changed attribute
+          (scalars, handles, or tuples of collection item keys).
+        ents: the entity in the first and second model (either may be None);
+          only weak references are kept.
+        """
+        self.entity_type = entity_type
+        self.action = action
+        self.key = key
+        self.attribute = attribute
+        self.old = old
+        self.new = new
+        self._refs = tuple(weakref.ref(e) if e is not None else None for e in ents)
+
+    def __repr__(self) -> str:
+        """Return repr of the record."""
+        return f"DiffRecord{self.as_tuple()!r}"
+
+    def __eq__(self, other: object) -> bool:
+        """Records are equal if their tuple forms are."""
+        if not isinstance(other, DiffRecord):
+            return NotImplemented
+        return self.as_tuple() == other.as_tuple()
+
+    __hash__ = None
+
+    def as_tuple(self) -> tuple:
+        """Return (entity_type, action, key, attribute, old, new)."""
+        return (
+            self.entity_type,
+            self.action,
+            self.key,
+            self.attribute,
+            self.old,
+            self.new,
+        )
+
+    def _entity(self, i: int) -> Entity | None:
+        ref = self._refs[i]
+        if ref is None:
+            return None
+        ent = ref()
+        if ent is None:
+            msg = (
+                f"{self.entity_type[:-1]} {self.key!r} is no longer available; "
+                "materialize() requires the diffed models to be alive"
+            )
+            raise LookupError(msg)
+        return ent
+
+    def _items(self, ent: Entity, keys: tuple) -> dict:
+        coll = getattr(ent, self.attribute)
+        if isinstance(coll, (ValueSet, Concept)):
+            coll = coll.terms
+        if self.attribute == "tags":
+            keys = tuple(k for k, _ in keys)
+        return {k: diff_objects_to_attr_dict(coll[k]) for k in keys if k in coll}
+
+    def materialize(self) -> dict:
+        """
+        Return the record with full entity attribute dicts.
+
+        The layout is that of bento_mdf.diff.diff_record with
+        objects_as_dicts=True. Raises LookupError if the diffed models
+        have been garbage collected.
+        """
+        a_ent = self._entity(0)
+        b_ent = self._entity(1)
+        if self.action == "changed":
+            removed, added = self.old, self.new
+            if isinstance(removed, tuple):
+                removed = self._items(a_ent, removed)
+            if isinstance(added, tuple):
+                added = self._items(b_ent, added)
+        else:
+            removed = diff_objects_to_attr_dict(a_ent) if a_ent is not None else None
+            added = diff_objects_to_attr_dict(b_ent) if b_ent is not None else None
+        return {
+            "entity_type": self.entity_type,
+            "action": self.action,
+            "key": self.key,
+            "attribute": self.attribute,
+            "removed": removed,
+            "added": added,
+        }
+
+
+def iter_compact_diff(
+    mdl_a: Model,
+    mdl_b: Model,
+    *,
+    ent_types: list[str] | tuple[str, ...] | None = None,
+    use_digests: bool = True,
+    digests_a: dict[str, dict] | None = None,
+    digests_b: dict[str, dict] | None = None,
+) -> Iterator[DiffRecord]:
+    """Generate DiffRecords between two models; arguments are as for iter_diff."""
+    records = iter_diff(
+        mdl_a,
+        mdl_b,
+        ent_types=ent_types,
+        use_digests=use_digests,
+        digests_a=digests_a,
+        digests_b=digests_b,
+    )
+    for rec in records:
+        ent_type = rec["entity_type"]
+        entk = rec["key"]
+        att = rec["attribute"]
+        yield DiffRecord(
+            ent_type,
+            rec["action"],
+            entk,
+            att,
+            _compact(att, rec["removed"]) if att else None,
+            _compact(att, rec["added"]) if att else None,
+            (
+                getattr(mdl_a, ent_type).get(entk),
+                getattr(mdl_b, ent_type).get(entk),
+            ),
+        )
+
+
+def compact_diff(
+    mdl_a: Model,
+    mdl_b: Model,
+    **kwargs: object,
+) -> list[DiffRecord]:
+    """Return the list of DiffRecords between two models (see iter_compact_diff)."""
+    return list(iter_compact_diff(mdl_a, mdl_b, **kwargs))
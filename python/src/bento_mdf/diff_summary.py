@@ -126,20 +126,15 @@ class DiffSummary:
                     f". Attribute: '{attr}' updated from "
                     f"'{changes['removed']}' to '{changes['added']}'"
                 )
-        for anno_ent_type, anno_changes in self.diff.annotations.items():
-            for entk, anno_change in anno_changes.items():
-                anno_item = anno_change.get(action, {})
-                if not anno_item:
-                    continue
-                for termk in anno_item:
-                    if termk != item[0]:
-                        continue
-                    return (
-                        f" which annotates {anno_ent_type[:-1]}: "
-                        f"{self.get_detail_by_ent_type(anno_ent_type, entk)}"
-                        f"{change_detail}"
-                    )
-        return ""
+        annotated = self.diff.annotated_entity(action, item[0])
+        if not annotated:
+            return ""
+        anno_ent_type, entk = annotated
+        return (
+            f" which annotates {anno_ent_type[:-1]}: "
+            f"{self.get_detail_by_ent_type(anno_ent_type, entk)}"
+            f"{change_detail}"
+        )
 
     def format_add_rem_detail(
         self,
@@ -0,0 +1,128 @@
+"""
+Change timelines across a series of model versions.
+
+Each version is loaded once, its entity digests are computed once, and
+consecutive versions are diffed with :func:`bento_mdf.diff.iter_diff`. The
+changes are collected per entity into a compact timeline.
+
+Typical usage example:
+    models = load_model_versions(["v1.yml", "v2.yml", "v3.yml"], handle="CDS")
+    print(format_timeline(diff_timeline(models)))
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+from bento_mdf.diff import DIFF_ENT_TYPES, Diff, iter_diff, model_digests
+from bento_mdf.diff_summary import DiffSummary
+from bento_mdf.mdf.reader import MDFReader
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from bento_meta.model import Model
+
+
+def load_model_versions(
+    sources: list[str | Path | list[str | Path]],
+    handle: str | None = None,
+    *,
+    max_workers: int | None = 1,
+) -> list[Model]:
+    """
+    Load each version of a model once, in the order given.
+
+    sources: one MDF path/url per version, or a list of them for versions
+      split into multiple files.
+    max_workers: number of versions loaded concurrently (threads); None
+      lets the executor choose.
+    """
+
+    def load(src: str | Path | list[str | Path]) -> Model:
+        files = src if isinstance(src, (list, tuple)) else [src]
+        return MDFReader(*files, handle=handle).model
+
+    if max_workers == 1:
+        return [load(src) for src in sources]
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(load, sources))
+
+
+def diff_timeline(
+    models: list[Model],
+    *,
+    labels: list[str] | None = None,
+    ent_types: list[str] | tuple[str, ...] | None = None,
+) -> dict[str, dict]:
+    """
+    Collect the changes between consecutive model versions per entity.
+
+    labels: version labels, one per model (default: each model's version,
+      or its position in the list if it has none).
+    ent_types: only track these entity types (default: all).
+
+    Returns {ent_type: {entk: [event, ...]}}, with events in version order.
+    Each event is a dict with "version" (the label of the version in which
+    the change appears), "action" ("added", "removed" or "changed") and
+    "attributes" (sorted names of the changed attributes; empty unless
+    "changed"). Entities that never change are omitted.
+    """
+    if labels is None:
+        labels = [mdl.version or str(i) for i, mdl in enumerate(models)]
+    if len(labels) != len(models):
+        msg = f"Got {len(labels)} labels for {len(models)} models"
+        raise ValueError(msg)
+    ent_types = ent_types or DIFF_ENT_TYPES
+    timeline = {ent_type: {} for ent_type in ent_types}
+    digests = [model_digests(mdl) for mdl in models]
+    for i in range(1, len(models)):
+        last = None
+        for rec in iter_diff(
+            models[i - 1],
+            models[i],
+            ent_types=ent_types,
+            digests_a=digests[i - 1],
+            digests_b=digests[i],
+        ):
+            ent_key = (rec["entity_type"], rec["key"])
+            if rec["action"] == "changed" and last is not None and last[0] == ent_key:
+                # further attribute of the entity changed in the same version
+                last[1]["attributes"].append(rec["attribute"])
+                continue
+            event = {
+                "version": labels[i],
+                "action": rec["action"],
+                "attributes": [rec["attribute"]] if rec["attribute"] else [],
+            }
+            timeline[rec["entity_type"]].setdefault(rec["key"], []).append(event)
+            last = (ent_key, event)
+    for events in timeline.values():
+        for entk_events in events.values():
+            for event in entk_events:
+                event["attributes"].sort()
+    return timeline
+
+
+def format_timeline(timeline: dict[str, dict]) -> str:
+    """
+    Format a timeline as text, one line per entity, e.g.
+
+    - prop: 'sample_type' with parent: 'sample': added in 1.1; value_set
+      changed in 1.3; removed in 2.0
+    """
+    summary = DiffSummary(Diff())
+    lines = []
+    for ent_type, events in timeline.items():
+        for entk in sorted(events, key=repr):
+            changes = []
+            for event in events[entk]:
+                atts = ", ".join(event["attributes"])
+                what = f"{atts} {event['action']}" if atts else event["action"]
+                changes.append(f"{what} in {event['version']}")
+            lines.append(
+                f"- {ent_type[:-1]}: {summary.get_detail_by_ent_type(ent_type, entk)}: "
+                + "; ".join(changes),
+            )
+    return "\n".join(lines)
@@ -0,0 +1,147 @@
+"""
+Streaming writers for model diffs in JSON, JSON Lines and YAML.
+
+The writers consume the change records generated by
+:func:`bento_mdf.diff.iter_diff` and write each one as it arrives, so a
+diff never has to be held in memory as a whole.
+
+Typical usage example:
+    with Path("diff.jsonl").open("w") as f:
+        write_diff(iter_diff(mdl_a, mdl_b), f, "jsonl")
+
+Records are converted to plain JSON data: bento_meta entities become
+attribute dicts, tuple keys become lists, and dicts with non-string keys
+(e.g. terms keyed by (value, origin, id, version)) become lists of
+{"key": ..., "value": ...} items.
+"""
+
+from __future__ import annotations
+
+import json
+from abc import ABC, abstractmethod
+from collections.abc import Mapping
+from typing import IO, TYPE_CHECKING, Iterable
+
+import yaml
+from bento_meta.entity import Entity
+
+from bento_mdf.diff import diff_objects_to_attr_dict
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+
+def diff_record_to_json(obj: object) -> object:
+    """Convert a change record (or any part of one) into plain JSON data."""
+    if isinstance(obj, Entity):
+        obj = diff_objects_to_attr_dict(obj)
+    if isinstance(obj, Mapping):
+        if all(isinstance(k, str) for k in obj):
+            return {k: diff_record_to_json(v) for k, v in obj.items()}
+        return [
+            {"key": diff_record_to_json(k), "value": diff_record_to_json(v)}
+            for k, v in obj.items()
+        ]
+    if isinstance(obj, (list, tuple)):
+        return [diff_record_to_json(x) for x in obj]
+    if obj is None or isinstance(obj, (str, int, float, bool)):
+        return obj
+    return str(obj)
+
+
+class DiffWriter(ABC):
+    """
+    Base class for streaming diff writers.
+
+    Writes change records to an open text file handle. Use as a context
+    manager, or call close() to finish the output (the file handle itself
+    is not closed).
+    """
+
+    def __init__(self, fh: IO[str]) -> None:
+        """Initialize the writer on an open text file handle."""
+        self.fh = fh
+        self.count = 0
+
+    def write(self, record: dict) -> None:
+        """Write one change record."""
+        self._write(diff_record_to_json(record))
+        self.count += 1
+
+    def write_all(self, records: Iterable[dict]) -> int:
+        """Write all records from an iterable; return the number written."""
+        for record in records:
+            self.write(record)
+        return self.count
+
+    def close(self) -> None:
+        """Finish the output."""
+
+    @abstractmethod
+    def _write(self, record: object) -> None:
+        """Write one record, already converted to plain JSON data."""
+
+    def __enter__(self) -> DiffWriter:
+        """Enter context."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        """Finish the output on exiting the context."""
+        self.close()
+
+
+class JSONDiffWriter(DiffWriter):
+    """Write change records as a single JSON array."""
+
+    def _write(self, record: object) -> None:
+        self.fh.write("[\n" if self.count == 0 else ",\n")
+        self.fh.write(json.dumps(record))
+
+    def close(self) -> None:
+        """Close the JSON array."""
+        self.fh.write("[]\n" if self.count == 0 else "\n]\n")
+
+
+class JSONLinesDiffWriter(DiffWriter):
+    """Write change records as JSON Lines, one record per line."""
+
+    def _write(self, record: object) -> None:
+        self.fh.write(json.dumps(record))
+        self.fh.write("\n")
+
+
+class YAMLDiffWriter(DiffWriter):
+    """Write change records as items of a single YAML sequence."""
+
+    def _write(self, record: object) -> None:
+        self.fh.write(yaml.safe_dump([record], sort_keys=False))
+
+    def close(self) -> None:
+        """Write an empty sequence if no records were written."""
+        if self.count == 0:
+            self.fh.write("[]\n")
+
+
+DIFF_WRITERS = {
+    "json": JSONDiffWriter,
+    "jsonl": JSONLinesDiffWriter,
+    "yaml": YAMLDiffWriter,
+}
+
+
+def write_diff(records: Iterable[dict], fh: IO[str], fmt: str = "jsonl") -> int:
+    """
+    Stream change records to fh in format fmt (one of DIFF_WRITERS).
+
+    Returns the number of records written.
+    """
+    if fmt not in DIFF_WRITERS:
+        msg = f"Unknown diff output format '{fmt}'; expected one of {list(DIFF_WRITERS)}"
+        raise ValueError(msg)
+    with DIFF_WRITERS[fmt](fh) as writer:
+        return writer.write_all(records)
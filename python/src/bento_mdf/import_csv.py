@@ -0,0 +1,245 @@
+"""
+bento_mdf.import_csv
+====================
+
+Export of Models as CSV files for ``neo4j-admin database import``.
+
+The graph of each model is the one :class:`bento_mdf.bulk_load.ModelGraph`
+plans for loading through Bolt. Graph nodes are written to one file per
+label (``<label>_nodes.csv``) and relationships to ``relationships.csv``,
+row by row as each model is added. Several models (e.g. the versions of a
+model) can go into one set of files, also over several runs with
+``append=True``; graph nodes that a Bolt load would MERGE (model nodes,
+properties, value sets, terms) are written once, and later models refer to
+them by their first ID.
+
+Every graph node gets a nanoid: its own, or a newly generated one.
+
+Typical usage example:
+    with ImportCSVWriter("import") as wr:
+        for model, commit in versions:
+            wr.add_model(model, commit)
+        print(" ".join(["neo4j-admin database import full", *wr.import_args()]))
+"""
+
+from __future__ import annotations
+
+import csv
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from bento_mdf.bulk_load import ModelGraph
+
+if TYPE_CHECKING:
+    from bento_meta.model import Model
+
+COMMON_COLUMNS = ["_commit", "nanoid", "desc"]
+IMPORT_COLUMNS = {
+    "node": ["handle", "model", *COMMON_COLUMNS],
+    "property": ["handle", "model", "value_domain", *COMMON_COLUMNS],
+    "relationship": [
+        "handle",
+        "model",
+        "multiplicity",
+        "is_required:boolean",
+        *COMMON_COLUMNS,
+    ],
+    "value_set": ["handle", "url", *COMMON_COLUMNS],
+    "term": [
+        "value",
+        "origin_name",
+        "origin_id",
+        "origin_version",
+        "origin_defintion",
+        "handle",
+        *COMMON_COLUMNS,
+    ],
+    "concept": COMMON_COLUMNS,
+    "tag": ["key", "value", *COMMON_COLUMNS],
+}
+RELATIONSHIP_COLUMNS = [":START_ID", ":END_ID", ":TYPE"]
+RELATIONSHIPS_FILE = "relationships.csv"
+
+
+def _ident(label: str, props: dict) -> tuple:
+    # values as read back from CSV; without the nanoid, which the files
+    # hold whether it was the entity's own or generated
+    return (
+        label,
+        frozenset((k, _csv_value(v)) for k, v in props.items() if k != "nanoid"),
+    )
+
+
+def _csv_value(val: object) -> str:
+    if val is None:
+        return ""
+    if isinstance(val, bool):
+        return "true" if val else "false"
+    return str(val)
+
+
+class ImportCSVWriter:
+    """Writes model graphs as neo4j-admin import CSV files in a directory."""
+
+    def __init__(self, directory: str | Path, *, append: bool = False) -> None:
+        """
+        Initialize the writer.
+
+        directory: directory for the CSV files; created if necessary.
+        append: add to the CSV files already in the directory, which must have
+          been written by an ImportCSVWriter; otherwise they are overwritten.
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.append = append
+        # identity of a merged graph node -> its ID
+        self._ids = {}
+        # relationships between merged graph nodes
+        self._merged_links = set()
+        # file name -> (file, csv writer)
+        self._files = {}
+        self._paths = {}
+        if append:
+            self._scan()
+
+    def __enter__(self) -> ImportCSVWriter:
+        """Return the writer."""
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Close the files."""
+        self.close()
+
+    @staticmethod
+    def node_file(label: str) -> str:
+        """Return the name of the node file for a label."""
+        return f"{label}_nodes.csv"
+
+    def _scan(self) -> None:
+        """Register the graph nodes and relationships of existing files."""
+        for label in IMPORT_COLUMNS:
+            path = self.directory / self.node_file(label)
+            if not path.is_file():
+                continue
+            self._paths[path.name] = path
+            if label in ModelGraph.CREATED_LABELS:
+                continue
+            with path.open(newline="", encoding="utf-8") as fh:
+                rows = csv.reader(fh)
+                names = [c.split(":")[0] for c in next(rows, [])]
+                for row in rows:
+                    props = {k: v for k, v in zip(names[1:-1], row[1:-1]) if v}
+                    self._ids.setdefault(_ident(label, props), row[0])
+        path = self.directory / RELATIONSHIPS_FILE
+        if path.is_file():
+            self._paths[path.name] = path
+            merged = set(self._ids.values())
+            with path.open(newline="", encoding="utf-8") as fh:
+                rows = csv.reader(fh)
+                next(rows, None)
+                for src, dst, typ in rows:
+                    if src in merged and dst in merged:
+                        self._merged_links.add((typ, src, dst))
+
+    def _writer(self, name: str, header: list[str]):  # noqa: ANN202
+        if name not in self._files:
+            path = self.directory / name
+            exists = self.append and path.is_file() and path.stat().st_size > 0
+            fh = path.open("a" if exists else "w", newline="", encoding="utf-8")
+            writer = csv.writer(fh)
+            if not exists:
+                writer.writerow(header)
+            self._files[name] = (fh, writer)
+            self._paths[name] = path
+        return self._files[name][1]
+
+    def _write_node(self, label: str, node_id: str, props: dict) -> None:
+        columns = IMPORT_COLUMNS[label]
+        names = [c.split(":")[0] for c in columns]
+        extra = set(props) - set(names)
+        if extra:
+            msg = f"no import columns for {label} properties {sorted(extra)}"
+            raise ValueError(msg)
+        writer = self._writer(self.node_file(label), [":ID", *columns, ":LABEL"])
+        writer.writerow(
+            [node_id, *(_csv_value(props.get(n)) for n in names), label],
+        )
+
+    def add_model(self, model: Model, _commit: str | None = None) -> dict:
+        """
+        Write the graph of a model.
+
+        _commit: 'commit string' for marking graph nodes; overrides _commit
+          attributes of the model's entities.
+        Returns the numbers of graph nodes and relationships written.
+        """
+        graph = ModelGraph(model, _commit, make_nanoids=True)
+        ids = {}
+        created = set()
+        nodes = 0
+        for key, (label, props, create) in graph.nodes.items():
+            if create:
+                created.add(key)
+                ident = None
+            else:
+                ident = _ident(label, props)
+                if ident in self._ids:
+                    ids[key] = self._ids[ident]
+                    continue
+                self._ids[ident] = key
+            ids[key] = key
+            if key in graph.nanoids:
+                props = {**props, "nanoid": graph.nanoids[key]}
+            self._write_node(label, key, props)
+            nodes += 1
+        rels = 0
+        writer = self._writer(RELATIONSHIPS_FILE, RELATIONSHIP_COLUMNS)
+        for typ, src, dst in graph.links:
+            link = (typ, ids[src], ids[dst])
+            if src not in created and dst not in created:
+                if link in self._merged_links:
+                    continue
+                self._merged_links.add(link)
+            writer.writerow([link[1], link[2], typ])
+            rels += 1
+        return {"nodes": nodes, "relationships": rels}
+
+    def close(self) -> None:
+        """Close the files."""
+        for fh, _ in self._files.values():
+            fh.close()
+        self._files = {}
+
+    def import_args(self) -> list[str]:
+        """
+        Return the ``neo4j-admin database import full`` options that import
+        the files.
+        """
+        args = [
+            f"--nodes={path}"
+            for name, path in self._paths.items()
+            if name != RELATIONSHIPS_FILE
+        ]
+        if RELATIONSHIPS_FILE in self._paths:
+            args.append(f"--relationships={self._paths[RELATIONSHIPS_FILE]}")
+        # descriptions may span lines
+        args.append("--multiline-fields=true")
+        return args
+
+
+def write_import_csv(
+    model: Model,
+    directory: str | Path,
+    _commit: str | None = None,
+    *,
+    append: bool = False,
+) -> list[str]:
+    """
+    Write a model as neo4j-admin import CSV files in a directory.
+
+    Returns the ``neo4j-admin database import full`` options that import
+    the files.
+    """
+    with ImportCSVWriter(directory, append=append) as wr:
+        wr.add_model(model, _commit)
+    return wr.import_args()
@@ -1,6 +1,7 @@
-"""YAML loader for MDF files with methods to check for duplicate keys and elements."""
+"""YAML and JSON loaders for MDF files, with checks for duplicate keys and elements."""
 
-from typing import Any
+import json
+from typing import IO, Any
 
 from yaml.constructor import ConstructorError
 from yaml.loader import SafeLoader
@@ -87,3 +88,44 @@ class MDFLoader(SafeLoader):
                         )
                     elts.add(c.value)
         return [self.construct_object(child, deep=deep) for child in node.value]
+
+
+def _mdf_json_object(pairs: list[tuple[str, Any]]) -> dict:
+    """Build a JSON object, making the duplicate checks MDFLoader makes for YAML."""
+    mapping = dict(pairs)
+    if len(mapping) != len(pairs):
+        keys = set()
+        for key, _ in pairs:
+            if key in keys:
+                raise ConstructorError(
+                    "while constructing a mapping",
+                    None,
+                    "found duplicated key (%s)" % key,
+                )
+            keys.add(key)
+    for key in CHECK_SEQS_UNDER_KEYS:
+        seq = mapping.get(key)
+        if isinstance(seq, list):
+            elts = set()
+            for elt in seq:
+                if isinstance(elt, str):  # just check lists of strings
+                    if elt in elts:
+                        raise ConstructorError(
+                            "while constructing a sequence",
+                            None,
+                            "found duplicated element (%s)" % elt,
+                        )
+                    elts.add(elt)
+    return mapping
+
+
+def load_mdf_json(stream: str | bytes | IO) -> Any:  # noqa: ANN401
+    """
+    Load MDF JSON from a string, bytes or file object.
+
+    Duplicate keys, and duplicate elements of Props lists, raise
+    ConstructorError as they do in MDFLoader.
+    """
+    if not isinstance(stream, (str, bytes, bytearray)):
+        stream = stream.read()
+    return json.loads(stream, object_pairs_hook=_mdf_json_object)
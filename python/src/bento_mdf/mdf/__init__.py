@@ -1,6 +1,8 @@
 # mdf
 from .reader import MDFReader, convert_github_url
 from .reader import MDFReader as MDF
-from .writer import MDFWriter
+from .writer import MDFWriter, model_fingerprint
 from .validator import MDFDataValidator
+from .dataset import MDFDatasetValidator
+from .binary import dump_binary_mdf, is_binary_mdf, load_binary_mdf
 
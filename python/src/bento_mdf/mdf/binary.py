@@ -0,0 +1,142 @@
+"""
+bento_mdf.mdf.binary
+====================
+
+Compact binary interchange format for merged MDF.
+
+A binary MDF holds the same merged MDF dict that the YAML path produces
+(:meth:`MDFWriter.write_mdf`, or :attr:`MDFReader.mdf` after loading), so a
+Model read from it is the Model read from the equivalent YAML. Reading it
+skips YAML parsing and schema validation.
+
+Layout: the magic bytes ``MDFB``, a format version byte, then a zlib
+compressed payload of two compact JSON lines:
+
+- the value table: every distinct string and number value, once;
+- the MDF tree, in which each string or number value is replaced by its
+  position in the value table. Mapping keys, booleans and nulls are kept.
+
+The tree is decoded with ``parse_int`` looking positions up in the table,
+so the decoding runs in the json C accelerator, and every occurrence of a
+handle, origin or term value in the loaded MDF is the same string object.
+
+Typical usage example:
+    data = dump_binary_mdf(MDFWriter(model=model).write_mdf())
+    mdf = load_binary_mdf(data)
+"""
+
+from __future__ import annotations
+
+import json
+import zlib
+from io import BufferedIOBase, RawIOBase
+from pathlib import Path
+from typing import BinaryIO
+
+MAGIC = b"MDFB"
+FORMAT_VERSION = 1
+HEADER = MAGIC + bytes([FORMAT_VERSION])
+
+
+def _intern_values(mdf: dict) -> tuple[list, object]:
+    """Return the value table and the MDF tree with values replaced by positions."""
+    table = []
+    positions = {}
+
+    def position(val):
+        # key on type too: 1, 1.0 and "1" are different values
+        key = (type(val), val)
+        pos = positions.get(key)
+        if pos is None:
+            pos = positions[key] = len(table)
+            table.append(val)
+        return pos
+
+    def encode(data):
+        typ = type(data)
+        if typ is dict:
+            for k in data:
+                if not isinstance(k, str):
+                    msg = f"binary MDF requires string mapping keys, got {k!r}"
+                    raise TypeError(msg)
+            return {k: encode(v) for k, v in data.items()}
+        if typ is list or typ is tuple:
+            return [encode(x) for x in data]
+        if data is None or typ is bool:
+            return data
+        if typ is str or typ is int or typ is float:
+            return position(data)
+        msg = f"binary MDF cannot hold a value of type {typ.__name__}: {data!r}"
+        raise TypeError(msg)
+
+    tree = encode(mdf)
+    return table, tree
+
+
+def dump_binary_mdf(mdf: dict, file: str | Path | BinaryIO | None = None) -> bytes:
+    """
+    Return (and optionally write) a merged MDF dict in binary form
+    :param dict mdf: MDF as a dict, as from :meth:`MDFWriter.write_mdf`
+    :param str|Path|file file: File name or binary file object to write to
+    (default None; just return the bytes)
+    :returns: binary MDF
+    """
+    table, tree = _intern_values(mdf)
+    payload = b"\n".join(
+        json.dumps(x, separators=(",", ":")).encode("ascii") for x in (table, tree)
+    )
+    data = HEADER + zlib.compress(payload)
+    if isinstance(file, (str, Path)):
+        Path(file).write_bytes(data)
+    elif file:
+        file.write(data)
+    return data
+
+
+def load_binary_mdf(data: bytes | str | Path | BinaryIO) -> dict:
+    """
+    Return the merged MDF dict held in a binary MDF
+    :param bytes|str|Path|file data: binary MDF, or a file name or binary
+    file object to read it from
+    :returns: MDF as a dict
+    """
+    if isinstance(data, (str, Path)):
+        data = Path(data).read_bytes()
+    elif not isinstance(data, (bytes, bytearray, memoryview)):
+        data = data.read()
+    data = bytes(data)
+    if data[: len(MAGIC)] != MAGIC:
+        msg = "not a binary MDF"
+        raise ValueError(msg)
+    if data[len(MAGIC)] != FORMAT_VERSION:
+        msg = f"unsupported binary MDF format version {data[len(MAGIC)]}"
+        raise ValueError(msg)
+    table_json, tree_json = zlib.decompress(data[len(HEADER) :]).split(b"\n", 1)
+    table = json.loads(table_json)
+    positions = {str(i): val for i, val in enumerate(table)}
+    return json.loads(tree_json, parse_int=positions.__getitem__)
+
+
+def is_binary_mdf(file: str | Path | BinaryIO) -> bool:
+    """
+    Return True if a file name or file object holds a binary MDF; file
+    objects are left at their starting position. Text file objects are
+    never binary MDF.
+    """
+    if isinstance(file, (str, Path)):
+        path = Path(file)
+        if not path.is_file():
+            return False
+        with path.open("rb") as fh:
+            return fh.read(len(MAGIC)) == MAGIC
+    binary = isinstance(file, (BufferedIOBase, RawIOBase)) or "b" in getattr(
+        file,
+        "mode",
+        "",
+    )
+    if not binary or not file.seekable():
+        return False
+    start = file.tell()
+    head = file.read(len(MAGIC))
+    file.seek(start)
+    return head == MAGIC
@@ -8,6 +8,9 @@ Utilities for converting MDF YAML to bento-meta objects
 from __future__ import annotations
 
 import re
+from collections.abc import Iterable, Mapping
+from functools import lru_cache
+from types import MappingProxyType
 from typing import TYPE_CHECKING
 from urllib.parse import unquote
 
@@ -76,6 +79,10 @@ simple_types = [
     "TBD",
 ]
 
+# single-item Enum lists that point to a value set elsewhere
+ENUM_URL = re.compile("^[a-z][a-z]*://")
+ENUM_PATH = re.compile("^/.*")
+
 # "declare"
 process = {}
 
@@ -85,16 +92,22 @@ process = {}
 # entCls: bento-meta entity class (bareword)
 
 
-def spec_to_entity(
+def _translation() -> dict[str, str]:
+    """Return the MDF key -> entity attribute translation from mdf_to_meta."""
+    return {k: att for k, att in mdf_to_meta.items() if att is not None}
+
+
+def _spec_to_entity(
     hdl: str | None,
     spec: dict,
     init: dict,
-    ent_cls: type[Node | Edge | Property | Term | Tag | Transform | TfStep],
+    ent_cls: type,
+    translation: dict[str, str],
 ) -> Entity:
-    """Translate part of MDF YAML to bento-meta entity."""
     for k in spec:
-        if k in mdf_to_meta and mdf_to_meta[k] is not None:
-            init[mdf_to_meta[k]] = spec[k]
+        att = translation.get(k)
+        if att is not None:
+            init[att] = spec[k]
     if hdl and "handle" not in init:
         init["handle"] = hdl
     # init now contains (translated) spec keys and its original keys
@@ -106,18 +119,53 @@ def spec_to_entity(
             else:
                 init["is_required"] = False
     ent = ent_cls(init)
-    info = process[ent_cls](init, spec, ent)
-    if spec.get("Tags"):
-        for t in spec["Tags"]:
-            ent.tags[t] = spec_to_entity(
-                "",
-                {},
-                {"key": t, "value": spec["Tags"][t], "_commit": init.get("_commit")},
-                Tag,
-            )
+    process[ent_cls](init, spec, ent)
+    tags = spec.get("Tags")
+    if tags:
+        commit = init.get("_commit")
+        ent_tags = ent.tags
+        for t in tags:
+            tag_init = {"key": t, "value": tags[t], "_commit": commit}
+            tag = Tag(tag_init)
+            process[Tag](tag_init, {}, tag)
+            ent_tags[t] = tag
     return ent
 
 
+def spec_to_entity(
+    hdl: str | None,
+    spec: dict,
+    init: dict,
+    ent_cls: type[Node | Edge | Property | Term | Tag | Transform | TfStep],
+) -> Entity:
+    """Translate part of MDF YAML to bento-meta entity."""
+    return _spec_to_entity(hdl, spec, init, ent_cls, _translation())
+
+
+def specs_to_entities(
+    specs: Mapping[str, dict] | Iterable[tuple[str | None, dict]],
+    ent_cls: type[Node | Edge | Property | Term | Tag | Transform | TfStep],
+    init: dict | None = None,
+) -> list[Entity]:
+    """
+    Translate many MDF specs to bento-meta entities of one class.
+
+    specs: specs by handle, or (handle, spec) pairs
+    init: additional attributes for every entity (each gets its own copy)
+    Returns the entities in the order of specs, each as
+    spec_to_entity(hdl, spec, dict(init), ent_cls) returns it; the MDF key
+    translation is looked up once for all of them.
+    """
+    if isinstance(specs, Mapping):
+        specs = specs.items()
+    init = init or {}
+    translation = _translation()
+    return [
+        _spec_to_entity(hdl, spec, dict(init), ent_cls, translation)
+        for hdl, spec in specs
+    ]
+
+
 def process_node(init: dict, spec: dict, node: Node) -> None:
     """Additional processing for Node entities."""
     if spec.get("CompKey"):
@@ -143,7 +191,7 @@ def process_tag(init: dict, spec: dict, tag: Tag):
 def process_prop(init: dict, spec: dict, prop: Property) -> None:
     """Additional processing for Property entities."""
     ty_spec = init.get("Enum") or init.get("Type")
-    domain_spec = typespec_to_domain_spec(ty_spec)
+    domain_spec = frozen_domain_spec(ty_spec)
     if (
         domain_spec["value_domain"] != "value_set"
         and domain_spec.get("item_domain") != "value_set"
@@ -183,8 +231,12 @@ def process_prop(init: dict, spec: dict, prop: Property) -> None:
             # but merge them with any Terms section terms in mdf.py
             prop.value_set = ValueSet({"_commit": "dummy"})
             for tm_init in domain_spec["value_set"]:
-                tm_init["origin_name"] = prop.model
-                term = spec_to_entity(None, {"_commit": prop._commit}, tm_init, Term)
+                term = spec_to_entity(
+                    None,
+                    {"_commit": prop._commit},
+                    {**tm_init, "origin_name": prop.model},
+                    Term,
+                )
                 prop.value_set.terms[term.handle] = term
         else:
             msg = f"Can't evaluate value_set spec {domain_spec}"
@@ -257,9 +309,9 @@ def typespec_to_domain_spec(spec: str | dict | list) -> dict:
         #   term values == term handles
         if len(spec) == 1:
             if isinstance(spec[0], str):
-                if re.match("^[a-z][a-z]*://", spec[0]):
+                if ENUM_URL.match(spec[0]):
                     return {"value_domain": "value_set", "url": spec[0]}
-                if re.match("^/.*", spec[0]):
+                if ENUM_PATH.match(spec[0]):
                     return {"value_domain": "value_set", "path": spec[0]}
             elif isinstance(spec[0], dict):
                 # edp term
@@ -274,6 +326,60 @@ def typespec_to_domain_spec(spec: str | dict | list) -> dict:
     return {"value_domain": Property.default("value_domain")}
 
 
+def _typespec_key(spec: object) -> object:
+    """
+    Return a hashable form of a Type or Enum spec. Lists and dicts become
+    tagged tuples, and non-string scalars are tagged with their type, so
+    that (e.g.) True, 1 and 1.0 give different keys.
+    """
+    if isinstance(spec, str):
+        return spec
+    if isinstance(spec, list):
+        if all(type(x) is str for x in spec):
+            return (list, *spec)
+        return (list, *(_typespec_key(x) for x in spec))
+    if isinstance(spec, dict):
+        return (dict, *((k, _typespec_key(v)) for k, v in spec.items()))
+    return (type(spec), spec)
+
+
+def _typespec_from_key(key: object) -> object:
+    """Rebuild the spec from its _typespec_key."""
+    if isinstance(key, str):
+        return key
+    tag, *items = key
+    if tag is list:
+        return [_typespec_from_key(x) for x in items]
+    if tag is dict:
+        return {k: _typespec_from_key(v) for k, v in items}
+    return items[0]
+
+
+def _freeze(data: object) -> object:
+    """Make a domain spec read-only: mappings become proxies, lists tuples."""
+    if isinstance(data, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in data.items()})
+    if isinstance(data, list):
+        return tuple(_freeze(x) for x in data)
+    return data
+
+
+@lru_cache(maxsize=4096)
+def _frozen_domain_spec(key: object) -> MappingProxyType:
+    return _freeze(typespec_to_domain_spec(_typespec_from_key(key)))
+
+
+def frozen_domain_spec(spec: str | dict | list) -> MappingProxyType:
+    """
+    Return typespec_to_domain_spec(spec) as a read-only mapping, memoized on
+    the contents of spec, so that props sharing a Type or Enum spec share
+    its domain spec. Lists in the domain spec (value_set) are tuples.
+    """
+    if isinstance(spec, str):
+        return _frozen_domain_spec(spec)
+    return _frozen_domain_spec(_typespec_key(spec))
+
+
 def entity_to_spec(ent: Entity, spec: dict = None) -> dict:
     if spec is None:
         spec = {}
@@ -0,0 +1,336 @@
+"""
+bento_mdf.mdf.dataset
+=====================
+
+Dataset-level (cross-record) validation of data against an MDF model.
+
+:class:`MDFDataValidator` checks each record on its own. The
+:class:`MDFDatasetValidator` here checks the constraints that span records:
+
+* uniqueness of ``Key: true`` property values within a node,
+* uniqueness of composite keys (``CompKey``) within a node,
+* referential integrity of links along the model's Relationships,
+* required links (``Req: true`` on a relationship end), and
+* relationship multiplicity (``one_to_one``, ``many_to_one``, ``one_to_many``).
+
+Records are fed in node by node (in any order, in as many chunks as
+desired) with :meth:`MDFDatasetValidator.add`; only hash indexes of key
+values and link references are retained, never the records themselves.
+:meth:`MDFDatasetValidator.check` then resolves the links. Total work is
+linear in the number of records.
+
+A record links to a parent record by carrying a field named
+``<parent node>.<parent key property>`` (e.g. ``participant.participant_id``)
+whose value is the parent's key value (or a list of them). The same field
+names are used for components of a composite key that refer to another
+node.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Iterable, List
+
+from bento_meta.model import Model
+
+from .reader import MDFReader
+from .validator import ValidationErrorSummary
+
+if TYPE_CHECKING:
+    from bento_meta.objects import Edge, Node
+
+# multiplicities allowing at most one parent per child record
+SINGLE_DST = ("one_to_one", "many_to_one")
+# multiplicities allowing at most one child record per parent
+SINGLE_SRC = ("one_to_one", "one_to_many")
+
+logger = logging.getLogger(__name__)
+
+
+class MDFDatasetValidator:
+    """Check key uniqueness and relationship integrity across all records of a dataset."""
+
+    def __init__(
+        self,
+        model: MDFReader | Model,
+        max_errors: int | None = None,
+        max_samples: int = 5,
+    ):
+        """
+        Arguments:
+            model: the Model (or MDFReader holding the Model) to validate against
+            max_errors: keep at most this many detailed error dicts in 'errors'.
+              All errors are still counted in 'summary'. Default None (keep all).
+            max_samples: number of sample record indexes kept per summary row.
+        """
+        if isinstance(model, MDFReader):
+            model = model.model
+        if not isinstance(model, Model):
+            raise RuntimeError("MDFDatasetValidator arg1 must be Model or MDFReader")
+        self.model = model
+        self.max_errors = max_errors
+        self.max_samples = max_samples
+        self._key_props = {}
+        self._comp_key_fields = {}
+        self._links = {}
+        # relationships whose links can't be checked: dst node has no Key prop
+        self.unchecked_edges = []
+        for nd in self.model.nodes.values():
+            self._key_props[nd.handle] = sorted(
+                pr.handle for pr in nd.props.values() if pr.is_key
+            )
+            if nd.composite_key_props:
+                self._comp_key_fields[nd.handle] = [
+                    self._comp_key_field(nd, ent, pr)
+                    for (ent, pr) in nd.composite_key_props
+                ]
+        for edge in self.model.edges.values():
+            fields = [
+                f"{edge.dst.handle}.{pr}" for pr in self._key_props[edge.dst.handle]
+            ]
+            if not fields:
+                self.unchecked_edges.append(edge)
+                logger.warning(
+                    "Links of relationship '%s' (%s -> %s) are not checked: "
+                    "'%s' has no Key property",
+                    edge.handle,
+                    edge.src.handle,
+                    edge.dst.handle,
+                    edge.dst.handle,
+                )
+                continue
+            self._links.setdefault(edge.src.handle, []).append((edge, fields))
+        self.reset()
+
+    @staticmethod
+    def _comp_key_field(nd: Node, ent: Node, pr) -> str:
+        """Return the record field holding a composite key component."""
+        if ent is nd:
+            return pr.handle
+        return f"{ent.handle}.{pr.handle}"
+
+    @property
+    def errors(self) -> List[dict]:
+        """Detailed errors found so far (capped by 'max_errors')."""
+        return self._errors
+
+    @property
+    def summary(self) -> ValidationErrorSummary:
+        """All errors found so far, aggregated by node, property and error type."""
+        return self._summary
+
+    def reset(self) -> None:
+        """Discard all indexes and errors, to validate a new dataset."""
+        self._errors = []
+        self._summary = ValidationErrorSummary(max_samples=self.max_samples)
+        self._counts = {}
+        self._keys = {}
+        self._comp_keys = {}
+        self._refs = {}
+        self._more_refs = {}
+        self._dst_use = {}
+
+    def _error(
+        self,
+        err_type: str,
+        node: str,
+        prop: str | None,
+        index: int,
+        msg: str,
+        value=None,
+    ) -> None:
+        self._summary.add(index, "error", node, prop, err_type, msg)
+        if self.max_errors is not None and len(self._errors) >= self.max_errors:
+            return
+        self._errors.append(
+            {
+                "level": "error",
+                "type": err_type,
+                "node": node,
+                "prop": prop,
+                "index": index,
+                "msg": msg,
+                "input": value,
+            }
+        )
+
+    def add(self, node_handle: str, records: dict | Iterable[dict]) -> int:
+        """
+        Index a chunk of records of node 'node_handle'.
+
+        Record indexes reported in errors count from the first record added
+        for the node. Duplicate keys and multiplicity violations are reported
+        immediately; links are resolved by 'check'.
+        Returns the number of records consumed.
+        """
+        if node_handle not in self.model.nodes:
+            raise RuntimeError(f"Model does not contain node '{node_handle}'")
+        if isinstance(records, dict):
+            records = [records]
+        key_props = self._key_props[node_handle]
+        comp_fields = self._comp_key_fields.get(node_handle)
+        links = self._links.get(node_handle, [])
+        start = self._counts.get(node_handle, 0)
+        i = start
+        for rec in records:
+            for pr in key_props:
+                val = rec.get(pr)
+                if val is None:
+                    continue
+                val = _hashable(val)
+                index = self._keys.setdefault((node_handle, pr), {})
+                if val in index:
+                    self._error(
+                        "duplicate_key",
+                        node_handle,
+                        pr,
+                        i,
+                        f"Key value {val!r} already used by record {index[val]}",
+                        val,
+                    )
+                else:
+                    index[val] = i
+            if comp_fields:
+                self._add_comp_key(node_handle, comp_fields, rec, i)
+            for edge, fields in links:
+                self._add_links(node_handle, edge, fields, rec, i)
+            i += 1
+        self._counts[node_handle] = i
+        return i - start
+
+    def _add_comp_key(
+        self, node_handle: str, fields: List[str], rec: dict, i: int
+    ) -> None:
+        vals = tuple(rec.get(f) for f in fields)
+        if any(v is None for v in vals):
+            return
+        vals = _hashable(vals)
+        index = self._comp_keys.setdefault(node_handle, {})
+        if vals in index:
+            self._error(
+                "composite_key_collision",
+                node_handle,
+                None,
+                i,
+                f"Composite key {dict(zip(fields, vals))!r} already used "
+                f"by record {index[vals]}",
+                vals,
+            )
+        else:
+            index[vals] = i
+
+    def _add_links(
+        self, node_handle: str, edge: Edge, fields: List[str], rec: dict, i: int
+    ) -> None:
+        dst = edge.dst.handle
+        found = False
+        for f in fields:
+            vals = rec.get(f)
+            if vals is None:
+                continue
+            if not isinstance(vals, (list, tuple)):
+                vals = [vals]
+            if not vals:
+                continue
+            found = True
+            if len(vals) > 1 and edge.multiplicity in SINGLE_DST:
+                self._error(
+                    "multiplicity",
+                    node_handle,
+                    f,
+                    i,
+                    f"Relationship '{edge.handle}' is {edge.multiplicity}, but "
+                    f"record links to {len(vals)} '{dst}' records",
+                    vals,
+                )
+            pr = f.split(".", 1)[1]
+            refs = self._refs.setdefault((dst, pr), {})
+            use = self._dst_use.setdefault(edge.triplet, {})
+            for val in vals:
+                val = _hashable(val)
+                self._add_ref(refs, (dst, pr, val), node_handle, i)
+                if edge.multiplicity not in SINGLE_SRC:
+                    continue
+                if (pr, val) in use and use[(pr, val)] != i:
+                    self._error(
+                        "multiplicity",
+                        node_handle,
+                        f,
+                        i,
+                        f"Relationship '{edge.handle}' is {edge.multiplicity}, but "
+                        f"'{dst}' record {val!r} is already linked by "
+                        f"record {use[(pr, val)]}",
+                        val,
+                    )
+                else:
+                    use[(pr, val)] = i
+        if not found and edge.is_required:
+            self._error(
+                "missing_link",
+                node_handle,
+                None,
+                i,
+                f"Required relationship '{edge.handle}' to '{dst}' not specified "
+                f"(expected one of {', '.join(fields)})",
+            )
+
+    def _add_ref(self, refs: dict, ref: tuple, node_handle: str, i: int) -> None:
+        """Record that record 'i' of 'node_handle' links to parent 'ref'."""
+        recs = refs.setdefault(ref[2], [])
+        if recs and recs[-1] == (node_handle, i):
+            return
+        if self.max_errors is None or len(recs) < self.max_errors:
+            recs.append((node_handle, i))
+            return
+        # more than 'errors' can hold; only counted, for the summary
+        more = self._more_refs.setdefault(ref, {})
+        if node_handle in more:
+            more[node_handle][0] += 1
+        else:
+            more[node_handle] = [1, i]
+
+    def check(self) -> bool:
+        """
+        Resolve all links recorded so far against the indexed key values.
+
+        Returns True if no errors have been found in the dataset.
+        """
+        for (dst, pr), refs in self._refs.items():
+            index = self._keys.get((dst, pr), {})
+            for val, recs in refs.items():
+                if val in index:
+                    continue
+                msg = f"No '{dst}' record with {pr} {val!r}"
+                for src, i in recs:
+                    self._error("missing_parent", src, f"{dst}.{pr}", i, msg, val)
+                more = self._more_refs.get((dst, pr, val), {})
+                for src, (count, i) in more.items():
+                    self._summary.add(
+                        i, "error", src, f"{dst}.{pr}", "missing_parent", msg, count
+                    )
+        # refs resolved; don't report them again on a later check()
+        self._refs = {}
+        self._more_refs = {}
+        return len(self._summary) == 0
+
+    def validate(self, data: dict[str, dict | Iterable[dict]]) -> bool:
+        """
+        Validate a complete dataset, given as a dict of node handle to records.
+
+        Discards the results of any previous validation.
+        Returns True if no errors were found.
+        """
+        self.reset()
+        for node_handle, records in data.items():
+            self.add(node_handle, records)
+        return self.check()
+
+
+def _hashable(val):
+    if isinstance(val, list):
+        return tuple(_hashable(v) for v in val)
+    if isinstance(val, tuple):
+        return tuple(_hashable(v) for v in val)
+    if isinstance(val, dict):
+        return tuple(sorted((k, _hashable(v)) for k, v in val.items()))
+    return val
@@ -22,7 +22,8 @@ from bento_meta.objects import Edge, Node, Property, Tag, Term
 from nanoid import generate
 from tqdm import tqdm
 
-from bento_mdf.mdf.convert import spec_to_entity
+from bento_mdf.mdf.convert import spec_to_entity, specs_to_entities
+from bento_mdf.mdf.binary import is_binary_mdf, load_binary_mdf
 from bento_mdf.validator import MDFValidator
 from bento_mdf.config import settings
 
@@ -107,18 +108,24 @@ class MDFReader:
         return self._model
 
     def load_yaml(self, *, verify: bool = True) -> None:
-        """Validate and load YAML files or open file handles specified in constructor."""
+        """Validate and load YAML or JSON files or open file handles specified in constructor."""
         vargs = []
         for f in self.files:
             if isinstance(f, str) and re.match("(?:file|https?)://", f):
                 fh = self.load_yaml_from_url(f)
                 vargs.append(fh)
             elif isinstance(f, str) and Path(f).exists():
-                fh = Path(f).open(encoding="utf-8")
+                if is_binary_mdf(f):
+                    fh = Path(f).open("rb")
+                else:
+                    fh = Path(f).open(encoding="utf-8")
                 vargs.append(fh)
             else:  # assume file-like object
                 vargs.append(f)
 
+        if any(is_binary_mdf(fh) for fh in vargs):
+            self.load_binary(vargs)
+            return
         v = MDFValidator(self.mdf_schema, *vargs, raise_error=True)
         self.mdf_schema = v.load_and_validate_schema()
         self.mdf = v.load_and_validate_yaml()
@@ -134,6 +141,20 @@ class MDFReader:
             if hasattr(fh, "close") and callable(fh.close):
                 fh.close()
 
+    def load_binary(self, files: list) -> None:
+        """
+        Load a binary MDF (see :mod:`bento_mdf.mdf.binary`) from the one file
+        or file object given. A binary MDF is already merged and validated, so YAML
+        parsing and schema validation are skipped.
+        """
+        if len(files) != 1:
+            msg = "A binary MDF must be the only MDF input"
+            raise ValueError(msg)
+        (fh,) = files
+        self.mdf = load_binary_mdf(fh)
+        if hasattr(fh, "close") and callable(fh.close):
+            fh.close()
+
     def load_yaml_from_url(self, url: str) -> TemporaryFile:
         """Load YAML from a URL. Converts GitHub repo URLs to raw URLs."""
 
@@ -216,7 +237,7 @@ class MDFReader:
         """Create terms from loaded YAML."""
         if "Terms" not in self.mdf:
             return
-        for t_hdl, spec in tqdm(self.mdf["Terms"].items()):
+        for t_hdl, spec in self.mdf["Terms"].items():
             if "Value" not in spec:
                 self.logger.error(
                     "Term specs must have a Value key and a non-null string value"
@@ -228,7 +249,8 @@ class MDFReader:
                 self.logger.warning(
                     f"No Origin provided for term '{t_hdl}'",
                 )
-            term = spec_to_entity(t_hdl, spec, {"_commit": self._commit}, Term)
+        terms = specs_to_entities(self.mdf["Terms"], Term, {"_commit": self._commit})
+        for term in tqdm(terms):
             term_key = (
                 term.handle,
                 term.origin_name,
@@ -239,15 +261,13 @@ class MDFReader:
 
     def create_nodes(self) -> None:
         """Create nodes from loaded YAML."""
-        for n, spec in self.mdf["Nodes"].items():
-            node = self.model.add_node(
-                spec_to_entity(
-                    n,
-                    spec,
-                    {"model": self.handle, "_commit": self._commit},
-                    Node,
-                ),
-            )
+        nodes = specs_to_entities(
+            self.mdf["Nodes"],
+            Node,
+            {"model": self.handle, "_commit": self._commit},
+        )
+        for spec, node in zip(self.mdf["Nodes"].values(), nodes):
+            self.model.add_node(node)
             if "Term" in spec:
                 self.annotate_entity_from_mdf(node, spec["Term"])
 
@@ -701,12 +721,9 @@ class MDFReader:
                             )
                             self.create_model_success = False
                         else:
-                            key_props.append(
-                                (
-                                    list(nd.props[key_pr].belongs.values())[0],
-                                    nd.props[key_pr],
-                                ),
-                            )
+                            # the owner is the node named in the CompKey, not
+                            # whichever node a shared prop belongs to first
+                            key_props.append((nd, nd.props[key_pr]))
                     elif self.model.nodes.get(ref_nd) is None:
                         self.logger.error(
                             "Composite key property in node '%s', '%s', refers to "
@@ -726,16 +743,8 @@ class MDFReader:
                         )
                         self.create_model_success = False
                     else:
-                        key_props.append(
-                            (
-                                list(
-                                    self.model.nodes[ref_nd]
-                                    .props[key_pr]
-                                    .belongs.values(),
-                                )[0],
-                                self.model.nodes[ref_nd].props[key_pr],
-                            ),
-                        )
+                        ref_node = self.model.nodes[ref_nd]
+                        key_props.append((ref_node, ref_node.props[key_pr]))
                 nd.composite_key_props = key_props
 
 def convert_github_url(url: str) -> str:
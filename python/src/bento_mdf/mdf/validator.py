@@ -1,8 +1,12 @@
 from __future__ import annotations
+import asyncio
 import re
 import sys
 import importlib.util
-from functools import cache
+from collections.abc import Callable, Iterable, Sized
+from concurrent.futures import Executor
+from functools import cache, partial
+from itertools import islice
 from pathlib import Path
 from .reader import MDFReader
 from bento_meta.objects import Property
@@ -120,6 +124,96 @@ class GenerateQualJsonSchema(GenerateJsonSchema):
         return self.sort(json_schema)
 
 
+class ValidationErrorSummary:
+    """
+    Bounded, columnar store of aggregated data validation errors.
+
+    Identical errors (same level, node, property and error type) are collapsed
+    into a single row holding a count and a capped list of sample record
+    indexes, so memory use depends on the number of distinct errors rather
+    than on the number of records validated.
+    """
+
+    columns = ("level", "node", "prop", "type", "msg", "count", "samples")
+
+    def __init__(self, max_samples: int = 5):
+        self.max_samples = max_samples
+        self.level = []
+        self.node = []
+        self.prop = []
+        self.type = []
+        self.msg = []
+        self.count = []
+        self.samples = []
+        self._rows = {}
+
+    def __len__(self) -> int:
+        return len(self.count)
+
+    @property
+    def total(self) -> int:
+        """Total number of errors recorded, including aggregated duplicates."""
+        return sum(self.count)
+
+    def add(
+        self,
+        index: int,
+        level: str,
+        node: str | None,
+        prop: str | None,
+        err_type: str,
+        msg: str,
+        count: int = 1,
+    ) -> None:
+        """
+        Record one error found in the record at position 'index' (or 'count'
+        identical errors, the first of them in that record).
+        """
+        key = (level, node, prop, err_type)
+        row = self._rows.get(key)
+        if row is None:
+            row = len(self.count)
+            self._rows[key] = row
+            self.level.append(level)
+            self.node.append(node)
+            self.prop.append(prop)
+            self.type.append(err_type)
+            self.msg.append(msg)
+            self.count.append(0)
+            self.samples.append([])
+        self.count[row] += count
+        samples = self.samples[row]
+        if len(samples) < self.max_samples and (not samples or samples[-1] != index):
+            samples.append(index)
+
+    def records(self) -> List[dict]:
+        """Return the aggregated errors as a list of dicts, one per row."""
+        return [
+            dict(zip(self.columns, row))
+            for row in zip(
+                self.level,
+                self.node,
+                self.prop,
+                self.type,
+                self.msg,
+                self.count,
+                self.samples,
+            )
+        ]
+
+
+class _ValidationRun:
+    """Error state accumulated by a single call to validate/validate_async."""
+
+    def __init__(self, max_samples: int = 5):
+        self.result = True
+        self.failed = 0
+        self.truncated = False
+        self.errors = {}
+        self.warnings = {}
+        self.summary = ValidationErrorSummary(max_samples=max_samples)
+
+
 class MDFDataValidator:
     typemap = {
         "boolean": bool,
@@ -132,14 +226,26 @@ class MDFDataValidator:
         "TBD": Any,
     }
 
-    def __init__(self, mdf: MDFReader):
+    def __init__(self, mdf: MDFReader, large_enum_threshold: int | None = None):
+        """
+        Arguments:
+            mdf: MDFReader holding the model to generate validation classes for
+            large_enum_threshold: value sets with at least this many terms are
+              generated as frozenset-backed membership validators instead of
+              Python Enum classes. These import and validate much faster for
+              very large enums; errors keep the 'enum' type, so strict/non-strict
+              semantics are unchanged. Default None (always generate Enum classes).
+        """
         self.model = mdf.model
+        self.large_enum_threshold = large_enum_threshold
         self._pymodel = None
         self._module = None
         self._node_classes = []
         self._enum_classes = []
         self._validation_errors = None
         self._validation_warnings = None  # warnings separate from errors
+        self._validation_summary = None
+        self._validation_truncated = False
         self.generate_data_model()
         self.import_data_model()
 
@@ -174,6 +280,14 @@ class MDFDataValidator:
     def last_validation_warnings(self) -> dict | None:
         return self._validation_warnings
 
+    @property
+    def last_validation_summary(self) -> ValidationErrorSummary | None:
+        return self._validation_summary
+
+    @property
+    def last_validation_truncated(self) -> bool:
+        return self._validation_truncated
+
     def generate_data_model(self) -> NoReturn:
         """
         Generates Pydantic classes for each node in the MDF model.
@@ -181,24 +295,55 @@ class MDFDataValidator:
         # write down classes to be generated
         for node in self.model.nodes.values():
             self._node_classes.append(toCamelCase(node.handle))
+        # one type alias per Property object, shared by all nodes having the prop
+        prop_types = {}
+        enum_classes = {}
+        taken = set(self._node_classes)
+        prop_uses = {}
+        for node in self.model.nodes.values():
             for pr in node.props.values():
+                prop_uses[id(pr)] = prop_uses.get(id(pr), 0) + 1
+                if id(pr) in prop_types:
+                    continue
+                alias = "{}PropType".format(toCamelCase(pr.handle))
+                i = 1
+                while alias in taken:
+                    i += 1
+                    alias = "{}PropType{}".format(toCamelCase(pr.handle), i)
+                taken.add(alias)
+                prop_types[id(pr)] = (alias, pr)
                 if pr.value_domain == "value_set" or pr.item_domain == "value_set":
-                    if pr.value_set.url:
-                        self._enum_classes.append(
-                            "{}EnumURL".format(toCamelCase(pr.handle))
-                        )
+                    # props sharing a handle may have different value sets,
+                    # so enum classes get unique names too
+                    if pr.terms:
+                        suffix = "Enum"
+                    elif pr.value_set.url:
+                        suffix = "EnumURL"
                     elif pr.value_set.path:
-                        self._enum_classes.append(
-                            "{}EnumPath".format(toCamelCase(pr.handle))
-                        )
+                        suffix = "EnumPath"
                     else:
-                        self._enum_classes.append(
-                            "{}Enum".format(toCamelCase(pr.handle))
-                        )
+                        suffix = "Enum"
+                    enum_class = "{}{}".format(toCamelCase(pr.handle), suffix)
+                    i = 1
+                    while enum_class in taken:
+                        i += 1
+                        enum_class = "{}{}{}".format(toCamelCase(pr.handle), suffix, i)
+                    taken.add(enum_class)
+                    enum_classes[id(pr)] = enum_class
+                    self._enum_classes.append(enum_class)
         self._node_classes.sort()
         self._enum_classes.sort()
         template = jenv.get_template("pymodel.py.jinja2")
-        self._pymodel = template.render(model=self.model, typemap=self.typemap)
+        self._pymodel = template.render(
+            model=self.model,
+            typemap=self.typemap,
+            large_enum_threshold=self.large_enum_threshold,
+            prop_types=[
+                (alias, pr, prop_uses[id(pr)]) for (alias, pr) in prop_types.values()
+            ],
+            type_alias=lambda pr: prop_types[id(pr)][0],
+            enum_class=lambda pr: enum_classes[id(pr)],
+        )
 
     def import_data_model(self) -> NoReturn:
         """
@@ -246,7 +391,7 @@ class MDFDataValidator:
         Return a validator function appropriate to the class named 'clsname'
         """
         model = self.model_of(clsname)
-        if issubclass(model, BaseModel):
+        if isinstance(model, type) and issubclass(model, BaseModel):
             return model.model_validate
         else:
             return TypeAdapter(model).validate_python
@@ -258,13 +403,28 @@ class MDFDataValidator:
         """
 
         model = self.model_of(clsname)
-        if issubclass(model, BaseModel):
+        if isinstance(model, type) and issubclass(model, BaseModel):
             return model.model_json_schema(schema_generator=GenerateQualJsonSchema)
         else:
             return TypeAdapter(model).json_schema(
                 schema_generator=GenerateQualJsonSchema
             )
 
+    def _locate_error(
+        self, err: dict, handle_name: str, validate_level: AllowedValLevel
+    ) -> tuple[str | None, str | None]:
+        """
+        Return the (node handle, property handle) to which a pydantic error refers.
+        """
+        loc = err["loc"]
+        if validate_level == "model":
+            node_name = loc[0] if len(loc) > 0 else None
+            prop_name = loc[1] if len(loc) > 1 else None
+        else:
+            node_name = handle_name
+            prop_name = loc[0] if len(loc) > 0 else None
+        return (node_name, prop_name)
+
     def validate(
         self,
         handle_name: str,
@@ -272,6 +432,10 @@ class MDFDataValidator:
         validate_level: AllowedValLevel = "node",
         strict: bool = False,
         verbose: bool = False,
+        max_failed_records: int | None = None,
+        max_errors_per_record: int | None = None,
+        aggregate: bool = False,
+        max_samples: int = 5,
     ) -> bool:
         """
         Validate a dict or list of dicts against a given model class.
@@ -281,62 +445,199 @@ class MDFDataValidator:
         which are lists of specific errors found in the item.
         ('last_validation_errors' is reset to None if validation succeeds.)
 
+        Every error found is also tallied in 'last_validation_summary', a
+        ValidationErrorSummary that aggregates identical errors (same node,
+        property and error type) into counts with a few sample record indexes.
+        Its size is bounded by the number of distinct errors, not by the size
+        of the input. (It is also reset to None if validation succeeds.)
+
         Arguments:
             handle_name: the handle of the model/node to validate against
             data: a dict or list of dicts to validate
             validate_level: the level of validation to perform. If 'model', validates at the model scope; if 'node', validates properties of the specified node. Default is 'node'.
             strict: if True, enforce strict validation on all fields/properties. Default is False.
             verbose: if True, print validation errors to stderr. Default is False.
+            max_failed_records: stop validating after this many records have failed. 'last_validation_truncated' is set to True if records were skipped. Default is None (validate all records).
+            max_errors_per_record: keep at most this many error dicts per record in 'last_validation_errors'/'last_validation_warnings'. The summary still counts all errors. Default is None (keep all).
+            aggregate: if True, do not keep per-record error dicts at all; report errors only through 'last_validation_summary'. Default is False.
+            max_samples: number of sample record indexes kept per summary row. Default is 5.
         """
         dta = []
         if isinstance(data, dict):
             dta = [data]
         else:
             dta = data
-        result = True
-        self._validation_errors = {}
-        self._validation_warnings = {}
+        run = _ValidationRun(max_samples)
+        valf = self.validator(self._clsname_for(handle_name, validate_level))
+        self._validate_records(
+            run,
+            valf,
+            dta,
+            0,
+            handle_name,
+            validate_level,
+            strict=strict,
+            verbose=verbose,
+            max_failed_records=max_failed_records,
+            max_errors_per_record=max_errors_per_record,
+            aggregate=aggregate,
+        )
+        return self._publish(run)
+
+    async def validate_async(
+        self,
+        handle_name: str,
+        data: dict | Iterable[dict],
+        validate_level: AllowedValLevel = "node",
+        strict: bool = False,
+        verbose: bool = False,
+        max_failed_records: int | None = None,
+        max_errors_per_record: int | None = None,
+        aggregate: bool = False,
+        max_samples: int = 5,
+        chunk_size: int = 1000,
+        executor: Executor | None = None,
+        progress: Callable[[int, int | None], Any] | None = None,
+    ) -> bool:
+        """
+        Asynchronous version of 'validate', for use in asyncio applications.
+
+        Records are validated in chunks of 'chunk_size' in 'executor' (the
+        event loop's default thread pool if None), so the event loop is free
+        to run other tasks between and during chunks. The generated model
+        classes are not picklable, so a process pool cannot be used. If the
+        awaiting task is cancelled, validation stops after the current chunk
+        and no results are recorded.
+
+        Each call keeps its own error state until it finishes, then sets the
+        'last_validation_*' attributes just as 'validate' does. These can be
+        read immediately after the await returns, even when several
+        validations run concurrently on the same validator.
+
+        Arguments are as for 'validate', plus:
+            chunk_size: number of records validated per executor job. Default 1000.
+            executor: a concurrent.futures.Executor (threads). Default None.
+            progress: a callable progress(done, total), called after each chunk
+              with the number of records validated so far and the total number
+              of records (None if 'data' has no length).
+        """
+        if isinstance(data, dict):
+            data = [data]
+        total = len(data) if isinstance(data, Sized) else None
+        run = _ValidationRun(max_samples)
+        valf = self.validator(self._clsname_for(handle_name, validate_level))
+        loop = asyncio.get_running_loop()
+        records = iter(data)
+        done = 0
+        while True:
+            chunk = list(islice(records, chunk_size))
+            if not chunk:
+                break
+            go_on = await loop.run_in_executor(
+                executor,
+                partial(
+                    self._validate_records,
+                    run,
+                    valf,
+                    chunk,
+                    done,
+                    handle_name,
+                    validate_level,
+                    strict=strict,
+                    verbose=verbose,
+                    max_failed_records=max_failed_records,
+                    max_errors_per_record=max_errors_per_record,
+                    aggregate=aggregate,
+                ),
+            )
+            done += len(chunk)
+            if progress:
+                progress(done, total)
+            if not go_on:
+                break
+        return self._publish(run)
+
+    def _clsname_for(self, handle_name: str, validate_level: AllowedValLevel) -> str:
         # validate at model level
         if handle_name == self.model.handle and validate_level == "model":
-            clsname = self.model_class
+            return self.model_class
+        # validate at node level
+        return toCamelCase(handle_name)
+
+    def _publish(self, run: _ValidationRun) -> bool:
+        """Set the 'last_validation_*' attributes from a finished run."""
+        self._validation_truncated = run.truncated
+        if run.result:
+            self._validation_errors = None
+            self._validation_warnings = None
+            self._validation_summary = None
         else:
-            # validate at node level
-            clsname = toCamelCase(handle_name)
-        valf = self.validator(clsname)
-        for i, rec in enumerate(dta):
+            self._validation_errors = run.errors
+            self._validation_warnings = run.warnings
+            self._validation_summary = run.summary
+        return run.result
+
+    def _validate_records(
+        self,
+        run: _ValidationRun,
+        valf: Callable,
+        records: Iterable[dict],
+        start: int,
+        handle_name: str,
+        validate_level: AllowedValLevel,
+        strict: bool = False,
+        verbose: bool = False,
+        max_failed_records: int | None = None,
+        max_errors_per_record: int | None = None,
+        aggregate: bool = False,
+    ) -> bool:
+        """
+        Validate records, numbered from 'start', accumulating errors in 'run'.
+        Returns False if validation stopped early (max_failed_records reached).
+        """
+        for i, rec in enumerate(records, start):
+            if max_failed_records is not None and run.failed >= max_failed_records:
+                run.truncated = True
+                return False
             try:
                 valf(rec, strict=strict)
             except ValidationError as e:
-                result = False
+                run.result = False
+                run.failed += 1
                 if verbose:
                     print(e.title, file=sys.stderr)
                 warnings = []
                 errs = []
                 for err in e.errors():
+                    node_name, prop_name = self._locate_error(
+                        err, handle_name, validate_level
+                    )
+                    level = "error"
                     # handle enum violations if the enum is non-strict, treat as warning instead of error
                     if err["type"] == "enum":
-                        if validate_level == "model":
-                            node_name = err["loc"][0]
-                            prop_name = err["loc"][1]
-                        else:
-                            node_name = handle_name
-                            prop_name = err["loc"][0]
                         prop_instance = self.model.nodes[node_name].props[prop_name]
                         if not prop_instance.is_strict:
                             # non-strict enum violation, treat as warning
-                            # add level key
-                            err = {"level": "warning", **err}
-                            warnings.append(err)
-                        else:
-                            err = {"level": "error", **err}
-                            errs.append(err)
+                            level = "warning"
+                    run.summary.add(
+                        i, level, node_name, prop_name, err["type"], err["msg"]
+                    )
+                    if aggregate:
+                        continue
+                    if (
+                        max_errors_per_record is not None
+                        and len(errs) + len(warnings) >= max_errors_per_record
+                    ):
+                        continue
+                    # add level key
+                    err = {"level": level, **err}
+                    if level == "warning":
+                        warnings.append(err)
                     else:
-                        err = {"level": "error", **err}
                         errs.append(err)
-                self._validation_errors[i] = errs
+                if aggregate:
+                    continue
+                run.errors[i] = errs
                 if len(warnings) > 0:
-                    self._validation_warnings[i] = warnings
-        if result:
-            self._validation_errors = None
-            self._validation_warnings = None
-        return result
+                    run.warnings[i] = warnings
+        return True
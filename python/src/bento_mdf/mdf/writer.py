@@ -1,14 +1,233 @@
+import hashlib
+import json
 import logging
-from collections import Counter
-from functools import reduce
+import re
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from pathlib import Path
+from types import GeneratorType
 
 import yaml
 from bento_meta.model import Model
-from bento_meta.objects import Edge
+from bento_meta.objects import Concept, Edge, Node, Property, Tag, Term, ValueSet
+from yaml.events import (
+    DocumentEndEvent,
+    DocumentStartEvent,
+    MappingEndEvent,
+    MappingStartEvent,
+    ScalarEvent,
+    SequenceEndEvent,
+    SequenceStartEvent,
+)
+from yaml.nodes import ScalarNode
+from yaml.serializer import Serializer
 
+from .binary import dump_binary_mdf
 from .convert import entity_to_spec
 from .reader import MDFReader
 
+# the libyaml emitter, if PyYAML was built with it
+CDumper = getattr(yaml, "CDumper", None)
+
+MAP_TAG = "tag:yaml.org,2002:map"
+SEQ_TAG = "tag:yaml.org,2002:seq"
+STR_TAG = "tag:yaml.org,2002:str"
+BOOL_TAG = "tag:yaml.org,2002:bool"
+NULL_TAG = "tag:yaml.org,2002:null"
+
+# libyaml and the pure Python emitter write the same text, except when
+# folding long double-quoted scalars (used for line breaks, tabs and
+# non-ASCII characters) and for empty or long (explicit "? ") keys
+PRINTABLE_ASCII = re.compile(r"[\x20-\x7e]*")
+MAX_C_KEY_LENGTH = 64
+# string attributes of each entity class that are written to the MDF (see
+# convert.entity_to_spec); other classes have all simple attributes checked
+MDF_STRING_ATTS = {
+    Node: ("handle", "desc"),
+    Edge: ("handle", "desc", "multiplicity"),
+    Property: ("handle", "desc", "value_domain", "item_domain", "units", "pattern"),
+    Term: (
+        "handle",
+        "desc",
+        "value",
+        "origin_name",
+        "origin_id",
+        "origin_version",
+        "origin_definition",
+    ),
+    ValueSet: ("desc", "url", "path"),
+    Concept: ("desc",),
+    Tag: ("key", "value"),
+}
+
+
+def _c_emitter_safe(model):
+    """
+    Return True if the libyaml emitter writes the model's MDF exactly as the
+    pure Python emitter does: all strings in the model are printable ASCII,
+    and all strings that become keys (handles, tag keys) are short and not
+    empty. The check looks at every string attribute written to the MDF
+    (MDF_STRING_ATTS), one at a time, and stops at the first that fails.
+    """
+    printable = PRINTABLE_ASCII.fullmatch
+    string_atts = dict(MDF_STRING_ATTS)
+
+    def key_ok(key):
+        return isinstance(key, str) and 0 < len(key) <= MAX_C_KEY_LENGTH
+
+    def strings_ok(ent):
+        cls = type(ent)
+        atts = string_atts.get(cls)
+        if atts is None:
+            atts = string_atts[cls] = [
+                att for att, kind in cls.attspec.items() if kind == "simple"
+            ]
+        for att in atts:
+            val = getattr(ent, att)
+            if isinstance(val, str) and not printable(val):
+                return False
+        return True
+
+    def tags_ok(ent):
+        return all(
+            key_ok(tag.key) and strings_ok(tag) for tag in ent.tags.values()
+        )
+
+    def terms_ok(container):
+        return all(
+            printable(str(key)) and strings_ok(term) and tags_ok(term)
+            for key, term in container.terms.items()
+        )
+
+    if not all(
+        printable(x)
+        for x in (model.handle, model.version, model.uri)
+        if isinstance(x, str)
+    ):
+        return False
+    # value sets and concepts are often shared; check each once
+    seen = set()
+    for ent in chain(
+        model.nodes.values(),
+        model.props.values(),
+        model.edges.values(),
+        model.terms.values(),
+    ):
+        if not (key_ok(ent.handle) and strings_ok(ent) and tags_ok(ent)):
+            return False
+        for att in ("concept", "value_set"):
+            if att not in ent.attspec:
+                continue
+            container = getattr(ent, att)
+            if container is None or id(container) in seen:
+                continue
+            seen.add(id(container))
+            if not (strings_ok(container) and terms_ok(container)):
+                return False
+    return True
+
+
+# lists whose order carries no meaning in a model
+UNORDERED_LISTS = ("Props", "Ends", "Enum", "Term")
+
+
+def _canonical_sort_key(data):
+    if isinstance(data, dict) and "Src" in data:
+        data = [data.get("Src"), data.get("Dst"), data]
+    return json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+
+
+def _canonical(data, key=None):
+    """
+    Return MDF data in canonical form: mapping keys sorted, and the items of
+    unordered lists (Props, Ends, Enum values, Terms) sorted, Ends by Src
+    and Dst.
+    """
+    if isinstance(data, dict):
+        return {k: _canonical(v, k) for k, v in sorted(data.items())}
+    if isinstance(data, (list, tuple)):
+        items = [_canonical(x) for x in data]
+        if key in UNORDERED_LISTS:
+            items.sort(key=_canonical_sort_key)
+        return items
+    return data
+
+
+class _StreamEmitter:
+    """
+    Emit a YAML document piece by piece, as yaml.dump(data, indent=4) would.
+
+    The document is a single block mapping; keys and values are passed to
+    data() in turn, and a value may itself be streamed as a mapping between
+    start_mapping() and end_mapping(). Dicts, lists, strings, booleans and
+    None are turned into events directly; other data goes through the
+    dumper's representer and serializer, with anchors and aliases resolved
+    only within each data() call.
+    """
+
+    def __init__(self, fh, dumper):
+        self.dumper = dumper(fh, indent=4, default_flow_style=False, sort_keys=True)
+        self.emit = self.dumper.emit
+        # Serializer state, which CDumper does not initialize
+        self.dumper.last_anchor_id = 0
+
+    def start(self):
+        self.dumper.open()
+        self.emit(DocumentStartEvent(explicit=None))
+        self.start_mapping()
+
+    def end(self):
+        self.end_mapping()
+        self.emit(DocumentEndEvent(explicit=None))
+        self.dumper.close()
+        self.dumper.dispose()
+
+    def start_mapping(self):
+        self.emit(MappingStartEvent(None, MAP_TAG, True, flow_style=False))
+
+    def end_mapping(self):
+        self.emit(MappingEndEvent())
+
+    def data(self, data):
+        typ = type(data)
+        if typ is str:
+            plain = self.dumper.resolve(ScalarNode, data, (True, False)) == STR_TAG
+            self.emit(ScalarEvent(None, STR_TAG, (plain, True), data))
+        elif typ is dict:
+            items = list(data.items())
+            try:
+                items = sorted(items)
+            except TypeError:
+                pass
+            self.start_mapping()
+            for key, val in items:
+                self.data(key)
+                self.data(val)
+            self.end_mapping()
+        elif typ is list:
+            self.emit(SequenceStartEvent(None, SEQ_TAG, True, flow_style=False))
+            for item in data:
+                self.data(item)
+            self.emit(SequenceEndEvent())
+        elif typ is bool:
+            value = "true" if data else "false"
+            self.emit(ScalarEvent(None, BOOL_TAG, (True, False), value))
+        elif data is None:
+            self.emit(ScalarEvent(None, NULL_TAG, (True, False), "null"))
+        else:
+            self._represent(data)
+
+    def _represent(self, data):
+        dumper = self.dumper
+        node = dumper.represent_data(data)
+        dumper.represented_objects = {}
+        dumper.object_keeper = []
+        dumper.alias_key = None
+        dumper.anchors = {}
+        dumper.serialized_nodes = {}
+        Serializer.anchor_node(dumper, node)
+        Serializer.serialize_node(dumper, node, None, None)
+
 
 class MDFWriter:
     def __init__(self, model: MDFReader | Model = None):
@@ -36,6 +255,98 @@ class MDFWriter:
             self.write_mdf()
         return self._mdf
 
+    def _header(self):
+        """Return the Handle, Version and (if any) URI entries of the MDF."""
+        header = {
+            "Handle": self.model.handle or "NEED_MODEL_HANDLE",
+            "Version": self.model.version or "NEED_MODEL_VERSION",
+        }
+        if self.model.uri:
+            header["URI"] = self.model.uri
+        return header
+
+    def _dumper(self):
+        """Return the libyaml dumper if it writes this model as yaml.Dumper would."""
+        if CDumper is not None and _c_emitter_safe(self.model):
+            return CDumper
+        return yaml.Dumper
+
+    def _props_by_handle(self):
+        """Return the props to write, by handle (the last of the sorted prop keys wins)."""
+        props = {}
+        for pr in sorted(self.model.props):
+            prop = self.model.props[pr]
+            props[prop.handle] = prop
+        return props
+
+    def _terms_by_handle(self):
+        """Return the terms to write, by handle (the last of the sorted term keys wins)."""
+        terms = {}
+        for tm in sorted(self.model.terms):
+            term = self.model.terms[tm]
+            terms[term.handle] = term
+        return terms
+
+    def _edges_by_handle(self):
+        """Return lists of the model's edges, by edge handle."""
+        edges = {}
+        for rl in self.model.edges.values():
+            edges.setdefault(rl.handle, []).append(rl)
+        return edges
+
+    def _relationship_spec(self, edges, *, canonical=False):
+        """
+        Return the Relationships entry for all the edges with one handle.
+        If canonical, the edges are taken in (Src, Dst) order, so that the
+        hoisted Mul and Desc do not depend on the order of model.edges.
+        """
+        specs = [entity_to_spec(rl) for rl in edges]
+        if canonical:
+            specs.sort(key=lambda x: (x["Src"], x["Dst"]))
+        # tally Mul, Desc, Req and Props of the Ends in one pass; dicts keep
+        # first-seen order, so ties go to the earliest End, as with Counter
+        muls = {}
+        descs = {}
+        reqs = set()
+        req_missing = False
+        props = None
+        for spec in specs:
+            mul = spec.get("Mul")
+            muls[mul] = muls.get(mul, 0) + 1
+            desc = spec.get("Desc")
+            if desc:
+                descs[desc] = descs.get(desc, 0) + 1
+            if "Req" in spec:
+                reqs.add(spec["Req"])
+            else:
+                req_missing = True
+            # merge props - this logic raises all Props specified in
+            # Ends members to the Relationship[<handle>] level
+            # (MDF schema does not currently allow Props to be specified
+            #  at the End level)
+            if spec["Props"]:
+                end_props = set(spec.pop("Props"))
+                props = end_props if props is None else props | end_props
+        top = {}
+        # determine default Mul
+        top["Mul"] = max(muls, key=muls.get) or Edge.default("multiplicity")
+        # raise common Desc
+        if sum(descs.values()) == len(specs):
+            top["Desc"] = max(descs, key=descs.get)
+        # raise common Req (if all Ends share the same value, hoist it)
+        if not req_missing and len(reqs) == 1:
+            top["Req"] = next(iter(reqs))
+        top["Props"] = list(props) if props else None
+        for spec in specs:
+            if spec.get("Mul") and spec["Mul"] == top["Mul"]:
+                del spec["Mul"]
+            if spec.get("Desc") and spec["Desc"] == top.get("Desc"):
+                del spec["Desc"]
+            if "Req" in spec and spec["Req"] == top.get("Req"):
+                del spec["Req"]
+        top["Ends"] = specs
+        return top
+
     def write_mdf(self, file=None):
         """
         Use a :class:`Model` to create model description file (MDF) formatted dict
@@ -43,79 +354,255 @@ class MDFWriter:
         :param str|file file: File name or object to write to (default is None; just return the MDF as dict)
         :returns: MDF as dict
         """
-        self._mdf["Handle"] = self.model.handle or "NEED_MODEL_HANDLE"
-        self._mdf["Version"] = self.model.version or "NEED_MODEL_VERSION"
-        if self.model.uri:
-            self._mdf["URI"] = self.model.uri
+        header = self._header()
+        self._mdf["Handle"] = header["Handle"]
+        self._mdf["Version"] = header["Version"]
+        if "URI" in header:
+            self._mdf["URI"] = header["URI"]
         else:
-            del self._mdf["URI"]
+            self._mdf.pop("URI", None)
 
         for nd in sorted(self.model.nodes):
             node = self.model.nodes[nd]
             self._mdf["Nodes"][nd] = entity_to_spec(node)
 
-        for pr in sorted(self.model.props):
-            prop = self.model.props[pr]
-            self._mdf["PropDefinitions"][prop.handle] = entity_to_spec(prop)
+        for hdl, prop in self._props_by_handle().items():
+            self._mdf["PropDefinitions"][hdl] = entity_to_spec(prop)
 
-        edge_specs = {}
-        for rl in self.model.edges.values():
-            if rl.handle in edge_specs:
-                edge_specs[rl.handle].append(entity_to_spec(rl))
-            else:
-                edge_specs[rl.handle] = [entity_to_spec(rl)]
-
-        for hdl in edge_specs:
-            top = {}
-            # determine default Mul
-            muls = Counter([x.get("Mul") for x in edge_specs[hdl]])
-            dfMul = muls.most_common(1)[0][0]
-            top["Mul"] = dfMul or Edge.default("multiplicity")
-            # raise common Desc
-            top["Desc"] = None
-            descs = Counter([x.get("Desc") for x in edge_specs[hdl] if x.get("Desc")])
-            if descs.total() == len(edge_specs[hdl]):
-                dfDesc = descs.most_common(1)[0][0]
-                top["Desc"] = dfDesc
-            if not top["Desc"]:
-                del top["Desc"]
-            # raise common Req (if all Ends share the same value, hoist it)
-            req_values = [x.get("Req") for x in edge_specs[hdl]]
-            if all(v is not None for v in req_values) and len(set(req_values)) == 1:
-                top["Req"] = req_values[0]
-            # merge props - this logic raises all Props specified in
-            # Ends members to the Relationship[<handle>] level
-            # (MDF schema does not currently allow Props to be specified
-            #  at the End level)
-            propsets = [set(x.get("Props")) for x in edge_specs[hdl] if x.get("Props")]
-            if not any([len(s) > 0 for s in propsets]):
-                top["Props"] = None
-            else:
-                mrgd = list(reduce(lambda x, y: x | y, propsets))
-                top["Props"] = mrgd
-            top["Ends"] = []
-            for spec in edge_specs[hdl]:
-                if spec.get("Mul") and spec.get("Mul") == top.get("Mul"):
-                    del spec["Mul"]
-                if spec.get("Desc") and top.get("Desc"):
-                    if spec["Desc"] == top["Desc"]:
-                        del spec["Desc"]
-                if spec.get("Props"):
-                    del spec["Props"]
-                if "Req" in spec and spec.get("Req") == top.get("Req"):
-                    del spec["Req"]
-                top["Ends"].append(spec)
-            self._mdf["Relationships"][hdl] = top
+        for hdl, edges in self._edges_by_handle().items():
+            self._mdf["Relationships"][hdl] = self._relationship_spec(edges)
 
         # collect Terms?
-        for tm in sorted(self.model.terms):
-            term = self.model.terms[tm]
-            self._mdf["Terms"][term.handle] = entity_to_spec(term)
+        for hdl, term in self._terms_by_handle().items():
+            self._mdf["Terms"][hdl] = entity_to_spec(term)
 
         if file:
             fh = file
             if isinstance(file, str):
                 fh = open(file, "w")
-            yaml.dump(self._mdf, stream=fh, indent=4)
+            yaml.dump(self._mdf, stream=fh, indent=4, Dumper=self._dumper())
 
         return self._mdf
+
+    def canonical_mdf(self):
+        """
+        Return the model as a canonical MDF dict
+        Equal models give equal dicts, whatever the order in which their
+        entities were added: mapping keys and unordered lists (Props, Ends,
+        Enum values, Terms) are sorted, hoisted Relationship attributes are
+        taken from Ends in (Src, Dst) order, and Handle and Version are
+        strings.
+        """
+        header = self._header()
+        mdf = {
+            "Handle": str(header["Handle"]),
+            "Version": str(header["Version"]),
+            "Nodes": {
+                hdl: entity_to_spec(nd) for hdl, nd in self.model.nodes.items()
+            },
+            "PropDefinitions": {
+                hdl: entity_to_spec(prop)
+                for hdl, prop in self._props_by_handle().items()
+            },
+            "Relationships": {
+                hdl: self._relationship_spec(edges, canonical=True)
+                for hdl, edges in self._edges_by_handle().items()
+            },
+            "Terms": {
+                hdl: entity_to_spec(term)
+                for hdl, term in self._terms_by_handle().items()
+            },
+        }
+        if "URI" in header:
+            mdf["URI"] = str(header["URI"])
+        return _canonical(mdf)
+
+    def write_canonical_mdf(self, file=None):
+        """
+        Return (and optionally write) the model as canonical MDF YAML
+        :param str|Path|file file: File name or object to write to (default
+        None; just return the YAML text)
+        :returns: canonical YAML text
+        The text is that of :meth:`canonical_mdf`, dumped by the pure Python
+        safe dumper without line folding, so it is the same in any
+        environment and can be compared byte for byte.
+        """
+        text = yaml.dump(
+            self.canonical_mdf(),
+            Dumper=yaml.SafeDumper,
+            indent=4,
+            width=float("inf"),
+            allow_unicode=True,
+            sort_keys=True,
+            default_flow_style=False,
+        )
+        if isinstance(file, (str, Path)):
+            Path(file).write_text(text, encoding="utf-8")
+        elif file:
+            file.write(text)
+        return text
+
+    def write_binary_mdf(self, file=None):
+        """
+        Return (and optionally write) the model as binary MDF
+        :param str|Path|file file: File name or binary file object to write
+        to (default None; just return the bytes)
+        :returns: binary MDF bytes
+        The binary MDF holds the dict of :meth:`write_mdf`; see
+        :mod:`bento_mdf.mdf.binary`. :class:`MDFReader` reads it without
+        parsing YAML or validating against the MDF schema.
+        """
+        return dump_binary_mdf(self.write_mdf(), file)
+
+    def fingerprint(self):
+        """
+        Return a SHA-256 hex digest of the canonical MDF
+        Two models have the same fingerprint exactly when their canonical
+        MDFs are equal. The digest is taken over compact JSON, which is much
+        faster to produce than YAML.
+        """
+        data = json.dumps(
+            self.canonical_mdf(),
+            sort_keys=True,
+            ensure_ascii=False,
+            separators=(",", ":"),
+            default=str,
+        )
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _specs(ents, make_spec):
+        """Generate (handle, spec) in handle order, making each spec as it is needed."""
+        for hdl in sorted(ents):
+            yield hdl, make_spec(ents[hdl])
+
+    def _sections(self):
+        """
+        Return the MDF top-level entries in the order yaml.dump sorts them;
+        sections of entities are generators of (handle, spec).
+        """
+        header = self._header()
+        sections = {
+            "Handle": header["Handle"],
+            "Nodes": self._specs(self.model.nodes, entity_to_spec),
+            "PropDefinitions": self._specs(self._props_by_handle(), entity_to_spec),
+            "Relationships": self._specs(
+                self._edges_by_handle(),
+                self._relationship_spec,
+            ),
+            "Terms": self._specs(self._terms_by_handle(), entity_to_spec),
+        }
+        if "URI" in header:
+            sections["URI"] = header["URI"]
+        sections["Version"] = header["Version"]
+        return sections
+
+    @staticmethod
+    def _stream_sections(file, sections, dumper):
+        """Write a document of (possibly generated) top-level entries to a file."""
+        if isinstance(file, (str, Path)):
+            with Path(file).open("w") as fh:
+                MDFWriter._stream_sections(fh, sections, dumper)
+            return
+        emitter = _StreamEmitter(file, dumper)
+        emitter.start()
+        for key, val in sections.items():
+            emitter.data(key)
+            if isinstance(val, GeneratorType):
+                emitter.start_mapping()
+                for hdl, spec in val:
+                    emitter.data(hdl)
+                    emitter.data(spec)
+                emitter.end_mapping()
+            else:
+                emitter.data(val)
+        emitter.end()
+
+    def stream_mdf(self, file):
+        """
+        Write the model as MDF to a file, one entity at a time
+        :param str|Path|file file: File name or object to write to
+        Output is identical to that of :meth:`write_mdf`, but the MDF dict is
+        not built; each entity's spec is created, emitted and dropped in turn.
+        Both use the libyaml emitter, if PyYAML was built with it and the
+        model has no strings the two emitters would write differently.
+        """
+        self._stream_sections(file, self._sections(), self._dumper())
+
+    def write_mdf_files(
+        self,
+        model_file,
+        props_file=None,
+        terms_file=None,
+        *,
+        shard_terms=False,
+        max_workers=None,
+    ):
+        """
+        Write the model as MDF split into model, props and terms files
+        :param str|Path model_file: File for Handle, Version, URI, Nodes and
+        Relationships
+        :param str|Path props_file: File for PropDefinitions (default
+        <model_file stem>-props<suffix>)
+        :param str|Path terms_file: File for Terms (default
+        <model_file stem>-terms<suffix>)
+        :param bool shard_terms: Write Terms to one file per term origin,
+        <terms_file stem>-<origin><suffix>, instead of to terms_file
+        :param int max_workers: Number of files written concurrently (threads)
+        :returns: list of the Paths written, in merge order for MDFReader
+        Each file is streamed as by :meth:`stream_mdf`. Reading the files with
+        MDFReader(*paths) gives the model that reading the single MDF does.
+        """
+        model_file = Path(model_file)
+        props_file = Path(
+            props_file or model_file.with_stem(f"{model_file.stem}-props"),
+        )
+        terms_file = Path(
+            terms_file or model_file.with_stem(f"{model_file.stem}-terms"),
+        )
+        sections = self._sections()
+        files = [
+            (
+                model_file,
+                {
+                    k: v
+                    for k, v in sections.items()
+                    if k not in ("PropDefinitions", "Terms")
+                },
+            ),
+            (props_file, {"PropDefinitions": sections["PropDefinitions"]}),
+        ]
+        terms = self._terms_by_handle()
+        if shard_terms and terms:
+            shards = {}
+            for hdl, term in terms.items():
+                origin = re.sub(r"[^\w.-]+", "_", str(term.origin_name))
+                shards.setdefault(origin, {})[hdl] = term
+            files.extend(
+                (
+                    terms_file.with_stem(f"{terms_file.stem}-{origin}"),
+                    {"Terms": self._specs(shards[origin], entity_to_spec)},
+                )
+                for origin in sorted(shards)
+            )
+        else:
+            files.append((terms_file, {"Terms": sections["Terms"]}))
+        paths = [path for path, _ in files]
+        if len(set(paths)) < len(paths):
+            msg = f"MDFWriter: output files must be distinct: {paths}"
+            self.logger.error(msg)
+            raise RuntimeError(msg)
+        dumper = self._dumper()
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = [
+                pool.submit(self._stream_sections, path, file_sections, dumper)
+                for path, file_sections in files
+            ]
+            for future in futures:
+                future.result()
+        return paths
+
+
+def model_fingerprint(model: MDFReader | Model) -> str:
+    """Return the fingerprint of a model (see :meth:`MDFWriter.fingerprint`)."""
+    return MDFWriter(model).fingerprint()
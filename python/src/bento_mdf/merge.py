@@ -0,0 +1,312 @@
+"""
+Three-way merge of model changes.
+
+Given a base model and two models derived from it ("ours" and "theirs"),
+:class:`ModelMerge` diffs each derived model against the base with
+:func:`bento_mdf.diff.diff_models`, applies every change made on only one
+side, combines changes made on both sides attribute by attribute (and
+collection item by collection item), and reports the rest as conflicts.
+
+Typical usage example:
+    merge = ModelMerge(base, ours, theirs)
+    merge.merge()
+    merge.write_mdf("merged.yml")
+    for conflict in merge.conflicts:
+        ...
+
+Changes are looked up in the diff results by entity key, so the merge does
+a constant amount of work per changed entity on top of the two diffs.
+The merged Model shares unchanged entity objects with the input models;
+entities changed on both sides are copies.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from bento_meta.entity import Entity
+from bento_meta.model import Model
+from bento_meta.objects import Concept, Tag, ValueSet
+
+from bento_mdf.diff import DIFF_ENT_TYPES, Diff, diff_models, entity_digest, get_ent_atts
+from bento_mdf.mdf.writer import MDFWriter
+
+if TYPE_CHECKING:
+    from io import TextIOWrapper
+
+# object attributes that diff_models reports as collections of terms
+TERM_CONTAINERS = {"value_set": ValueSet, "concept": Concept}
+
+
+class ModelMerge:
+    """Three-way merge of two models derived from a common base model."""
+
+    def __init__(
+        self,
+        base: Model,
+        ours: Model,
+        theirs: Model,
+        *,
+        prefer: str = "ours",
+        version: str | None = None,
+    ) -> None:
+        """
+        Initialize the merge.
+
+        prefer: "ours" or "theirs"; the side whose change is kept in the
+          merged model when the two sides conflict.
+        version: version of the merged model (default: that of ours).
+        """
+        if prefer not in ("ours", "theirs"):
+            msg = f"prefer must be 'ours' or 'theirs', not '{prefer}'"
+            raise ValueError(msg)
+        self.base = base
+        self.sides = {"ours": ours, "theirs": theirs}
+        self.prefer = prefer
+        self.version = version if version is not None else ours.version
+        self.model = None
+        self.conflicts = []
+        self._ent_atts = {
+            ent_type: get_ent_atts(ent_type, Diff()) for ent_type in DIFF_ENT_TYPES
+        }
+
+    def merge(self) -> Model:
+        """Compute the merged model (also available as self.model) and conflicts."""
+        diffs = {
+            side: diff_models(self.base, mdl) for side, mdl in self.sides.items()
+        }
+        self.conflicts = []
+        self.model = Model(
+            handle=self.base.handle,
+            version=self.version,
+            uri=self.base.uri,
+        )
+        for ent_type in DIFF_ENT_TYPES:
+            changes = {side: diffs[side].get(ent_type, {}) for side in diffs}
+            merged = dict(getattr(self.base, ent_type))
+            self._merge_removed(ent_type, merged, changes)
+            self._merge_added(ent_type, merged, changes)
+            self._merge_changed(ent_type, merged, changes)
+            setattr(self.model, ent_type, merged)
+        self._drop_dangling()
+        return self.model
+
+    def write_mdf(self, file: str | TextIOWrapper | None = None) -> dict:
+        """Write the merged model as MDF (see MDFWriter.write_mdf); return the MDF dict."""
+        if self.model is None:
+            self.merge()
+        return MDFWriter(self.model).write_mdf(file)
+
+    def _conflict(  # noqa: PLR0913
+        self,
+        kind: str,
+        ent_type: str,
+        entk: str | tuple,
+        att: str | None,
+        ours: object,
+        theirs: object,
+        resolution: str | None = None,
+    ) -> None:
+        self.conflicts.append(
+            {
+                "kind": kind,
+                "entity_type": ent_type,
+                "key": entk,
+                "attribute": att,
+                "ours": ours,
+                "theirs": theirs,
+                "resolution": resolution or self.prefer,
+            },
+        )
+
+    def _merge_removed(self, ent_type: str, merged: dict, changes: dict) -> None:
+        removed = {side: changes[side].get("removed") or {} for side in changes}
+        changed = {side: changes[side].get("changed") or {} for side in changes}
+        for side, other in (("ours", "theirs"), ("theirs", "ours")):
+            for entk in removed[side]:
+                if entk in changed[other]:
+                    # removed on one side, modified on the other
+                    self._conflict(
+                        "modify/remove",
+                        ent_type,
+                        entk,
+                        None,
+                        None if side == "ours" else changed[other][entk],
+                        None if side == "theirs" else changed[other][entk],
+                    )
+                    if self.prefer == other:
+                        continue
+                merged.pop(entk, None)
+
+    def _merge_added(self, ent_type: str, merged: dict, changes: dict) -> None:
+        added = {side: changes[side].get("added") or {} for side in changes}
+        for side, other in (("ours", "theirs"), ("theirs", "ours")):
+            for entk, ent in added[side].items():
+                if entk in merged:
+                    continue
+                other_ent = added[other].get(entk)
+                if other_ent is not None:
+                    ent_atts = self._ent_atts[ent_type]
+                    if entity_digest(ent, ent_atts) != entity_digest(other_ent, ent_atts):
+                        self._conflict(
+                            "add/add",
+                            ent_type,
+                            entk,
+                            None,
+                            added["ours"][entk],
+                            added["theirs"][entk],
+                        )
+                        ent = added[self.prefer][entk]
+                merged[entk] = ent
+
+    def _merge_changed(self, ent_type: str, merged: dict, changes: dict) -> None:
+        changed = {side: changes[side].get("changed") or {} for side in changes}
+        for side, other in (("ours", "theirs"), ("theirs", "ours")):
+            side_ents = getattr(self.sides[side], ent_type)
+            for entk, atts in changed[side].items():
+                if entk not in merged:
+                    continue  # removed (conflict already recorded)
+                if entk not in changed[other]:
+                    merged[entk] = side_ents[entk]
+                elif side == "ours":
+                    merged[entk] = self._merge_entity(
+                        ent_type,
+                        entk,
+                        merged[entk],
+                        atts,
+                        changed[other][entk],
+                    )
+
+    def _merge_entity(
+        self,
+        ent_type: str,
+        entk: str | tuple,
+        base_ent: Entity,
+        ours_atts: dict,
+        theirs_atts: dict,
+    ) -> Entity:
+        """Return a copy of base_ent with both sides' attribute changes applied."""
+        ent = type(base_ent)()
+        ent.set_with_entity(base_ent)
+        for att in {**ours_atts, **theirs_atts}:
+            change = {"ours": ours_atts.get(att), "theirs": theirs_atts.get(att)}
+            if _is_item_change(change):
+                self._apply_collection_changes(ent_type, entk, ent, att, change)
+                continue
+            if change["ours"] and change["theirs"]:
+                if change["ours"]["added"] != change["theirs"]["added"]:
+                    self._conflict(
+                        "modify/modify",
+                        ent_type,
+                        entk,
+                        att,
+                        change["ours"]["added"],
+                        change["theirs"]["added"],
+                    )
+                value = change[self.prefer]["added"]
+            else:
+                value = (change["ours"] or change["theirs"])["added"]
+            setattr(ent, att, value)
+        return ent
+
+    def _apply_collection_changes(
+        self,
+        ent_type: str,
+        entk: str | tuple,
+        ent: Entity,
+        att: str,
+        change: dict,
+    ) -> None:
+        """Apply removed/added items of a collection (or term container) att."""
+        if att in TERM_CONTAINERS:
+            old = getattr(ent, att)
+            container = TERM_CONTAINERS[att]()
+            if old is not None:
+                container.handle = old.handle
+                for termk, term in old.terms.items():
+                    container.terms[termk] = term
+            setattr(ent, att, container)
+            coll = container.terms
+        else:
+            coll = getattr(ent, att)
+        removed = {}
+        added = {}
+        for side in ("theirs", "ours") if self.prefer == "ours" else ("ours", "theirs"):
+            if not change[side]:
+                continue
+            removed.update(change[side]["removed"] or {})
+            for key, item in (change[side]["added"] or {}).items():
+                if key in added and _item_value(added[key]) != _item_value(item):
+                    self._conflict(
+                        "modify/modify",
+                        ent_type,
+                        entk,
+                        att,
+                        change["ours"]["added"][key],
+                        change["theirs"]["added"][key],
+                    )
+                added[key] = item
+        for key in removed:
+            if key in coll and key not in added:
+                del coll[key]
+        for key, item in added.items():
+            coll[key] = item
+
+    def _drop_dangling(self) -> None:
+        """Drop edges and props whose nodes or edges the merge removed."""
+        nodes = self.model.nodes
+        for triplet in list(self.model.edges):
+            if triplet[1] not in nodes or triplet[2] not in nodes:
+                self._conflict(
+                    "dangling",
+                    "edges",
+                    triplet,
+                    None,
+                    None,
+                    None,
+                    resolution="removed",
+                )
+                del self.model.edges[triplet]
+        for propk in list(self.model.props):
+            parent = propk[0] if len(propk) == 2 else propk[:-1]  # noqa: PLR2004
+            if parent not in nodes and parent not in self.model.edges:
+                self._conflict(
+                    "dangling",
+                    "props",
+                    propk,
+                    None,
+                    None,
+                    None,
+                    resolution="removed",
+                )
+                del self.model.props[propk]
+
+
+def _is_item_change(change: dict) -> bool:
+    """Whether both sides' changes to an attribute are removed/added item dicts."""
+    return all(
+        isinstance(c["removed"], (dict, type(None)))
+        and isinstance(c["added"], (dict, type(None)))
+        and (c["removed"] is not None or c["added"] is not None)
+        for c in change.values()
+        if c
+    )
+
+
+def _item_value(item: Entity) -> object:
+    """Value compared for items added to a collection by both sides."""
+    if isinstance(item, Tag):
+        return item.value
+    return getattr(item, "handle", None) or id(item)
+
+
+def merge_models(
+    base: Model,
+    ours: Model,
+    theirs: Model,
+    *,
+    prefer: str = "ours",
+) -> tuple[Model, list[dict]]:
+    """Three-way merge of models; return the merged model and the conflicts."""
+    merge = ModelMerge(base, ours, theirs, prefer=prefer)
+    return merge.merge(), merge.conflicts
@@ -0,0 +1,706 @@
+"""
+Patches: model diffs that can be applied.
+
+:func:`make_patch` turns the diff between two models into a patch, a plain
+dict that can be written as JSON or YAML as is::
+
+    {
+        "handle": <model handle>,
+        "from_version": <version of the first model>,
+        "to_version": <version of the second model>,
+        "operations": [<op>, ...],
+    }
+
+Each operation names an entity by type ("nodes", "edges", "props" or
+"terms") and key (as in the ``Model`` collections, with tuples given as
+lists), and is one of
+
+* ``{"op": "add", ..., "value": {attribute: value}}`` -- add the entity.
+  Tags are given as a dict, concept and value_set terms as lists of term
+  attribute dicts. A node's or edge's props are added by their own ops.
+* ``{"op": "remove", ...}`` -- remove the entity.
+* ``{"op": "set", ..., "attribute": att, "value": value}`` -- set a simple
+  attribute.
+* ``{"op": "update", ..., "attribute": att, "remove": [item keys],
+  "add": [items]}`` -- remove and add items of tags (items are
+  ``{"key": k, "value": v}``), concept or value_set (items are term
+  attribute dicts).
+
+:func:`apply_patch` applies a patch in place to a ``Model`` or to a merged
+MDF dict (e.g. ``load_mdf_dict(...).as_dict()``). Every operation looks up
+its entity by key and changes only that entity, so applying a patch takes
+time linear in the size of the patch, not of the model.
+
+Typical usage example:
+    patch = make_patch(mdl_v1, mdl_v2)
+    json.dump(patch, fh)
+    ...
+    apply_patch(mdl, json.load(fh))
+"""
+
+from __future__ import annotations
+
+import copy
+from typing import TYPE_CHECKING, Mapping
+
+from bento_meta.entity import Entity
+from bento_meta.model import Model
+from bento_meta.objects import Edge, Node, Property, Tag, Term, ValueSet
+
+from bento_mdf.diff import DIFF_ENT_TYPES, iter_diff
+from bento_mdf.mdf.convert import (
+    domain_spec_to_typespec,
+    mdf_to_meta,
+    to_snake_case,
+    typespec_to_domain_spec,
+)
+from bento_mdf.merge import TERM_CONTAINERS
+from bento_mdf.structural_diff import PROP_DEFAULTS
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+PATCH_OPS = ("add", "remove", "set", "update")
+# attributes given as collections of items in "update" ops
+ITEM_ATTS = ("tags", *TERM_CONTAINERS)
+# Property attributes that make up its MDF Type or Enum spec
+DOMAIN_ATTS = ("value_domain", "item_domain", "units", "pattern")
+# MDF keys of an Ends entry, which override those of its Relationship
+END_KEYS = ("Mul", "Req", "Tags", "Term", "Props")
+meta_to_mdf = {
+    att: key for key, att in mdf_to_meta.items() if att and att not in ("Enum", "Type")
+}
+ENT_CLASSES = {"nodes": Node, "edges": Edge, "props": Property, "terms": Term}
+
+
+def _entity_value(ent: Entity) -> dict:
+    """Return the attributes of ent as a JSON-ready dict."""
+    value = {
+        att: getattr(ent, att)
+        for att, kind in type(ent).attspec.items()
+        if kind == "simple" and att[0] != "_" and getattr(ent, att) is not None
+    }
+    if ent.tags:
+        value["tags"] = {k: t.value for k, t in ent.tags.items()}
+    for att in TERM_CONTAINERS:
+        container = getattr(ent, att) if att in type(ent).attspec else None
+        if isinstance(ent, Term) or container is None or not container.terms:
+            continue
+        value[att] = [_entity_value(t) for t in container.terms.values()]
+    return value
+
+
+def _term_key(term: Mapping) -> tuple:
+    return (
+        term.get("handle") or term.get("value"),
+        term.get("origin_name"),
+        term.get("origin_id"),
+        term.get("origin_version"),
+    )
+
+
+def _json_key(key: str | tuple) -> str | list:
+    return list(key) if isinstance(key, tuple) else key
+
+
+def _item_key(att: str, item: Mapping) -> str | tuple:
+    """Key of an "update" item in the attribute's collection."""
+    if att == "tags":
+        return item["key"]
+    if att == "value_set":
+        return item.get("handle") or item.get("value")
+    return _term_key(item)
+
+
+def _items(att: str, items: Mapping | None) -> list[dict]:
+    if att == "tags":
+        return [{"key": k, "value": t.value} for k, t in (items or {}).items()]
+    return [_entity_value(t) for t in (items or {}).values()]
+
+
+def _ent_key(ent_type: str, key: str | list | tuple) -> str | tuple:
+    return key if ent_type == "nodes" else tuple(key)
+
+
+def make_patch(
+    mdl_a: Model,
+    mdl_b: Model,
+    *,
+    ent_types: list[str] | tuple[str, ...] | None = None,
+) -> dict:
+    """
+    Return the patch that turns mdl_a into mdl_b.
+
+    ent_types: only include changes to these entity types (default: all).
+
+    Operations are ordered so they can be applied in sequence: terms are
+    added and changed first, then nodes, edges and props are added and
+    changed, then everything removed is removed (props before the edges and
+    nodes they belong to).
+    """
+    added = []
+    changed = []
+    removed = {ent_type: [] for ent_type in DIFF_ENT_TYPES}
+    for rec in iter_diff(mdl_a, mdl_b, ent_types=ent_types):
+        ent_type = rec["entity_type"]
+        op = {"entity_type": ent_type, "key": _json_key(rec["key"])}
+        att = rec["attribute"]
+        if rec["action"] == "removed":
+            removed[ent_type].append({"op": "remove", **op})
+        elif rec["action"] == "added":
+            added.append({"op": "add", **op, "value": _entity_value(rec["added"])})
+        elif att == "props":
+            continue  # props are added and removed by their own ops
+        elif att in ITEM_ATTS:
+            changed.append(
+                {
+                    "op": "update",
+                    **op,
+                    "attribute": att,
+                    "remove": [_json_key(k) for k in rec["removed"] or {}],
+                    "add": _items(att, rec["added"]),
+                },
+            )
+        elif isinstance(rec["added"], Entity) or isinstance(rec["removed"], Entity):
+            msg = (
+                f"Can't express a change to object attribute '{att}' of "
+                f"{ent_type[:-1]} {rec['key']!r} in a patch"
+            )
+            raise ValueError(msg)
+        else:
+            changed.append({"op": "set", **op, "attribute": att, "value": rec["added"]})
+    term_ops = [op for op in added + changed if op["entity_type"] == "terms"]
+    other_ops = [op for op in added if op["entity_type"] != "terms"] + [
+        op for op in changed if op["entity_type"] != "terms"
+    ]
+    return {
+        "handle": mdl_b.handle,
+        "from_version": mdl_a.version,
+        "to_version": mdl_b.version,
+        "operations": term_ops
+        + other_ops
+        + removed["props"]
+        + removed["edges"]
+        + removed["nodes"]
+        + removed["terms"],
+    }
+
+
+def apply_patch(
+    target: Model | dict,
+    patch: Mapping,
+    *,
+    check_version: bool = True,
+) -> Model | dict:
+    """
+    Apply patch in place to a Model or merged MDF dict; return the target.
+
+    check_version: raise ValueError if the target's version is not the
+      patch's from_version (when both are given).
+
+    The target's version is set to the patch's to_version. Raises
+    ValueError if an operation refers to an entity that is missing (or,
+    for "add", already present); operations before it have been applied.
+    """
+    if isinstance(target, Model):
+        patcher = _ModelPatcher(target)
+    elif isinstance(target, dict):
+        patcher = _MDFPatcher(target, patch.get("handle"))
+    else:
+        msg = f"Can't apply a patch to {type(target).__name__}; expected Model or dict"
+        raise TypeError(msg)
+    from_version = patch.get("from_version")
+    if check_version and from_version is not None:
+        version = patcher.version
+        if version is not None and str(version) != str(from_version):
+            msg = f"Patch is from version '{from_version}', but target is version '{version}'"
+            raise ValueError(msg)
+    patcher.apply_all(patch.get("operations") or [])
+    if patch.get("to_version") is not None:
+        patcher.version = patch["to_version"]
+    return target
+
+
+class _Patcher:
+    """Applies patch operations; subclasses implement _add, _remove, _set, _update."""
+
+    def apply_all(self, ops: Iterable[Mapping]) -> None:
+        for op in ops:
+            if op.get("op") not in PATCH_OPS:
+                msg = f"Unknown patch op '{op.get('op')}'; expected one of {PATCH_OPS}"
+                raise ValueError(msg)
+            ent_type = op["entity_type"]
+            if ent_type not in DIFF_ENT_TYPES:
+                msg = f"Unknown entity type '{ent_type}'; expected one of {DIFF_ENT_TYPES}"
+                raise ValueError(msg)
+            getattr(self, f"_{op['op']}")(ent_type, _ent_key(ent_type, op["key"]), op)
+
+    @staticmethod
+    def _error(ent_type: str, entk: str | tuple, what: str = "not found") -> ValueError:
+        return ValueError(f"Can't apply patch: {ent_type[:-1]} {entk!r} {what}")
+
+
+class _ModelPatcher(_Patcher):
+    """Applies patch operations to a Model."""
+
+    def __init__(self, model: Model) -> None:
+        self.model = model
+        # props that are known to belong to a single parent (see _target)
+        self._own_props = set()
+
+    @property
+    def version(self) -> str | None:
+        return self.model.version
+
+    @version.setter
+    def version(self, value: str) -> None:
+        self.model.version = value
+
+    def _parent(self, propk: tuple) -> Node | Edge:
+        parentk = propk[0] if len(propk) == 2 else propk[:-1]  # noqa: PLR2004
+        parent = self.model.nodes.get(parentk) or self.model.edges.get(parentk)
+        if parent is None:
+            raise self._error("props", propk, "has no parent in the model")
+        return parent
+
+    def _term(self, spec: Mapping) -> Term:
+        """Return the model's term for a term attribute dict, adding it if new."""
+        termk = _term_key(spec)
+        term = self.model.terms.get(termk)
+        if term is None:
+            term = Term(_simple_init(Term, spec))
+            self.model.terms[termk] = term
+        return term
+
+    def _add(self, ent_type: str, entk: str | tuple, op: Mapping) -> None:
+        coll = getattr(self.model, ent_type)
+        if entk in coll:
+            raise self._error(ent_type, entk, "already exists")
+        value = op.get("value") or {}
+        cls = ENT_CLASSES[ent_type]
+        init = _simple_init(cls, value)
+        if ent_type != "terms":
+            init.setdefault("model", self.model.handle)
+        if ent_type == "edges":
+            try:
+                init["src"] = self.model.nodes[entk[1]]
+                init["dst"] = self.model.nodes[entk[2]]
+            except KeyError:
+                raise self._error(ent_type, entk, "has no end node in the model") from None
+        ent = cls(init)
+        for att in ITEM_ATTS:
+            items = value.get(att)
+            if att == "tags" and items:
+                items = [{"key": k, "value": v} for k, v in items.items()]
+            if items and att in ent.attspec:
+                self._update_items(ent, att, [], items)
+        if ent_type == "props":
+            self._parent(entk).props[entk[-1]] = ent
+            self._own_props.add(entk)
+        coll[entk] = ent
+
+    def _remove(self, ent_type: str, entk: str | tuple, op: Mapping) -> None:  # noqa: ARG002
+        coll = getattr(self.model, ent_type)
+        if entk not in coll:
+            raise self._error(ent_type, entk)
+        ent = coll.pop(entk)
+        if ent_type == "props":
+            parentk = entk[0] if len(entk) == 2 else entk[:-1]  # noqa: PLR2004
+            parent = self.model.nodes.get(parentk) or self.model.edges.get(parentk)
+            if parent is not None and parent.props.get(entk[-1]) is ent:
+                del parent.props[entk[-1]]
+            self._own_props.discard(entk)
+
+    def _target(self, ent_type: str, entk: str | tuple) -> Entity:
+        """
+        Return the entity to change.
+
+        The MDFReader shares a Property among the nodes and edges that use
+        an unqualified PropDefinition, so a prop is copied (once) before its
+        first change.
+        """
+        coll = getattr(self.model, ent_type)
+        if entk not in coll:
+            raise self._error(ent_type, entk)
+        ent = coll[entk]
+        if ent_type == "props" and entk not in self._own_props:
+            ent = type(ent)()
+            ent.set_with_entity(coll[entk])
+            ent.belongs = {}
+            self._parent(entk).props[entk[-1]] = ent
+            coll[entk] = ent
+            self._own_props.add(entk)
+        return ent
+
+    def _set(self, ent_type: str, entk: str | tuple, op: Mapping) -> None:
+        setattr(self._target(ent_type, entk), op["attribute"], op.get("value"))
+
+    def _update(self, ent_type: str, entk: str | tuple, op: Mapping) -> None:
+        remove = [k if isinstance(k, str) else tuple(k) for k in op.get("remove") or []]
+        self._update_items(
+            self._target(ent_type, entk),
+            op["attribute"],
+            remove,
+            op.get("add") or [],
+        )
+
+    def _update_items(self, ent: Entity, att: str, remove: list, add: list) -> None:
+        if att in TERM_CONTAINERS:
+            # containers may be shared with other entities; change a copy
+            old = getattr(ent, att)
+            container = TERM_CONTAINERS[att]()
+            if old is not None:
+                container.set_with_entity(old)
+            setattr(ent, att, container)
+            coll = container.terms
+        elif att == "tags":
+            coll = ent.tags
+        else:
+            msg = f"Can't update items of attribute '{att}'; expected one of {ITEM_ATTS}"
+            raise ValueError(msg)
+        for key in remove:
+            coll.pop(key, None)
+        for item in add:
+            coll[_item_key(att, item)] = (
+                Tag({"key": item["key"], "value": item["value"]})
+                if att == "tags"
+                else self._term(item)
+            )
+
+
+def _simple_init(cls: type[Entity], value: Mapping) -> dict:
+    return {
+        att: val
+        for att, val in value.items()
+        if cls.attspec.get(att) == "simple" and att[0] != "_"
+    }
+
+
+class _MDFPatcher(_Patcher):
+    """
+    Applies patch operations to a merged MDF dict.
+
+    Changes are made where the MDFReader would read them from:
+
+    * Edge attributes that an Ends entry can override (Mul, Req, Tags, Term
+      and Props) are set on the Ends entry. If the Relationship gives one of
+      them, it is first copied down to each Ends entry it applies to, so the
+      other edges keep their values.
+    * A prop is changed through a qualified ``<parent>.<prop>``
+      PropDefinition, created from the plain one on its first change. Adding a
+      prop reuses an equal plain PropDefinition.
+    * Enum terms that the MDFReader would not create from the Enum value
+      alone are added to the Terms section.
+
+    Term entities have no MDF spec of their own: terms are added and
+    removed with the value sets and annotations that use them, and term
+    changes update only their Terms section entry. PropDefinitions left
+    unreferenced by a patch are kept, since finding other uses would mean
+    scanning the whole MDF.
+    """
+
+    def __init__(self, mdf: dict, handle: str | None = None) -> None:
+        self.mdf = mdf
+        self.handle = handle or mdf.get("Handle")
+
+    @property
+    def version(self) -> str | None:
+        return self.mdf.get("Version")
+
+    @version.setter
+    def version(self, value: str) -> None:
+        self.mdf["Version"] = value
+
+    def _section(self, name: str) -> dict:
+        if self.mdf.get(name) is None:
+            self.mdf[name] = {}
+        return self.mdf[name]
+
+    # specs
+
+    def _term_spec(self, term: Mapping) -> dict:
+        spec = _mdf_spec(term, "terms")
+        if spec.get("Handle") == to_snake_case(str(term.get("value"))):
+            del spec["Handle"]
+        return spec
+
+    def _spec_term_key(self, spec: Mapping) -> tuple:
+        """Model key of the term the MDFReader makes from an annotation spec."""
+        return (
+            spec.get("Handle") or to_snake_case(str(spec.get("Value"))),
+            spec.get("Origin") or self.handle,
+            spec.get("Code"),
+            spec.get("Version"),
+        )
+
+    def _enum_term(self, term: Mapping) -> str:
+        """Return the Enum entry for a term, adding it to Terms if needed."""
+        hdl = term.get("handle") or term.get("value")
+        plain = {"handle": hdl, "value": hdl, "origin_name": self.handle}
+        if {k: v for k, v in term.items() if k not in ("nanoid", "model")} != plain:
+            spec = self._term_spec(term)
+            spec.pop("Handle", None)
+            self._section("Terms").setdefault(hdl, spec)
+        return hdl
+
+    def _prop_spec(self, value: Mapping) -> dict:
+        spec = _mdf_spec(
+            {
+                k: v
+                for k, v in value.items()
+                if k not in PROP_DEFAULTS or PROP_DEFAULTS[k] != v
+            },
+            "props",
+        )
+        domain = {att: value[att] for att in DOMAIN_ATTS if value.get(att)}
+        if value.get("value_set"):
+            domain["value_set"] = [self._enum_term(t) for t in value["value_set"]]
+        _set_typespec(spec, domain)
+        if value.get("tags"):
+            spec["Tags"] = dict(value["tags"])
+        if value.get("concept"):
+            spec["Term"] = [self._term_spec(t) for t in value["concept"]]
+        return spec
+
+    # entity lookup
+
+    def _node(self, hdl: str) -> dict:
+        node = self._section("Nodes").get(hdl)
+        if node is None:
+            raise self._error("nodes", hdl)
+        return node
+
+    def _rel_end(self, triplet: tuple) -> tuple[dict, dict]:
+        hdl, src, dst = triplet
+        rel = self._section("Relationships").get(hdl)
+        for end in (rel or {}).get("Ends") or []:
+            if end["Src"] == src and end["Dst"] == dst:
+                return rel, end
+        raise self._error("edges", triplet)
+
+    def _end_value(self, rel: dict, end: dict, key: str) -> object:
+        """Value of an Ends key as the MDFReader reads it."""
+        if key == "Mul":
+            # spec_to_entity lets the Relationship-level Mul win
+            return rel.get("Mul") or end.get("Mul") or Edge.default("multiplicity")
+        if key == "Req":
+            return end["Req"] if end.get("Req") is not None else rel.get("Req")
+        return end.get(key) or rel.get(key)
+
+    def _own_end_key(self, rel: dict, key: str) -> None:
+        """Copy a Relationship-level key down to the Ends entries it applies to."""
+        if rel.get(key) is None:
+            rel.pop(key, None)
+            return
+        for end in rel["Ends"]:
+            if key == "Mul" or self._end_value({}, end, key) in (None, [], {}):
+                end[key] = copy.deepcopy(rel[key])
+        del rel[key]
+
+    def _set_end_key(self, rel: dict, end: dict, key: str, value: object) -> None:
+        if self._end_value(rel, end, key) == value:
+            return
+        self._own_end_key(rel, key)
+        _set_or_pop(end, key, value)
+
+    def _propdef(self, propk: tuple) -> dict:
+        """Return the qualified PropDefinition of a prop, creating it if needed."""
+        defs = self._section("PropDefinitions")
+        qual = f"{propk[0]}.{propk[-1]}"
+        if qual not in defs:
+            if propk[-1] not in defs:
+                raise self._error("props", propk, "has no PropDefinition")
+            defs[qual] = copy.deepcopy(defs[propk[-1]])
+        return defs[qual]
+
+    def _prop_parent(self, propk: tuple) -> dict:
+        """Return the spec holding the parent's Props list."""
+        if len(propk) == 2:  # noqa: PLR2004
+            return self._node(propk[0])
+        rel, end = self._rel_end(propk[:-1])
+        self._own_end_key(rel, "Props")
+        return end
+
+    def _spec(self, ent_type: str, entk: str | tuple, key: str) -> dict | None:
+        """Return the spec holding MDF key key of an entity."""
+        if ent_type == "nodes":
+            return self._node(entk)
+        if ent_type == "edges":
+            rel, end = self._rel_end(entk)
+            if key in END_KEYS:
+                self._own_end_key(rel, key)
+                return end
+            return rel
+        if ent_type == "props":
+            return self._propdef(entk)
+        spec = (self.mdf.get("Terms") or {}).get(entk[0])
+        if spec is not None and self._spec_term_key({"Handle": entk[0], **spec}) == entk:
+            return spec
+        return None
+
+    # operations
+
+    def _add(self, ent_type: str, entk: str | tuple, op: Mapping) -> None:
+        value = op.get("value") or {}
+        if ent_type == "nodes":
+            nodes = self._section("Nodes")
+            if entk in nodes:
+                raise self._error(ent_type, entk, "already exists")
+            spec = _mdf_spec(value, ent_type)
+            spec.pop("Handle", None)
+            spec["Props"] = None
+            if value.get("tags"):
+                spec["Tags"] = dict(value["tags"])
+            if value.get("concept"):
+                spec["Term"] = [self._term_spec(t) for t in value["concept"]]
+            nodes[entk] = spec
+        elif ent_type == "edges":
+            self._add_edge(entk, value)
+        elif ent_type == "props":
+            self._add_prop(entk, value)
+
+    def _add_edge(self, triplet: tuple, value: Mapping) -> None:
+        hdl, src, dst = triplet
+        for node in (src, dst):
+            self._node(node)
+        rels = self._section("Relationships")
+        rel = rels.get(hdl)
+        if rel is None:
+            rel = rels[hdl] = {"Mul": value.get("multiplicity") or Edge.default("multiplicity")}
+        if any(e["Src"] == src and e["Dst"] == dst for e in rel.get("Ends") or []):
+            raise self._error("edges", triplet, "already exists")
+        end = {"Src": src, "Dst": dst}
+        rel["Ends"] = [*(rel.get("Ends") or []), end]
+        end_values = {
+            "Mul": value.get("multiplicity") or Edge.default("multiplicity"),
+            "Req": value.get("is_required"),
+            "Tags": dict(value["tags"]) if value.get("tags") else None,
+            "Term": [self._term_spec(t) for t in value.get("concept") or []] or None,
+            "Props": None,
+        }
+        for key, val in end_values.items():
+            self._set_end_key(rel, end, key, val)
+        for key, val in _mdf_spec(value, "edges").items():
+            if key not in END_KEYS and key not in ("Handle", "Src", "Dst"):
+                rel.setdefault(key, val)
+
+    def _add_prop(self, propk: tuple, value: Mapping) -> None:
+        parent = self._prop_parent(propk)
+        pname = propk[-1]
+        pnames = parent.get("Props") or []
+        if pname in pnames:
+            raise self._error("props", propk, "already exists")
+        parent["Props"] = [*pnames, pname]
+        spec = self._prop_spec(value)
+        defs = self._section("PropDefinitions")
+        qual = f"{propk[0]}.{pname}"
+        if pname not in defs:
+            defs[pname] = spec
+        elif defs[pname] != spec or qual in defs:
+            defs[qual] = spec
+
+    def _remove(self, ent_type: str, entk: str | tuple, op: Mapping) -> None:  # noqa: ARG002
+        if ent_type == "nodes":
+            self._node(entk)
+            del self.mdf["Nodes"][entk]
+        elif ent_type == "edges":
+            rel, end = self._rel_end(entk)
+            rel["Ends"].remove(end)
+            if not rel["Ends"]:
+                del self.mdf["Relationships"][entk[0]]
+        elif ent_type == "props":
+            parent = self._prop_parent(propk=entk)
+            pnames = parent.get("Props") or []
+            if entk[-1] not in pnames:
+                raise self._error(ent_type, entk)
+            parent["Props"] = [p for p in pnames if p != entk[-1]] or None
+
+    def _set(self, ent_type: str, entk: str | tuple, op: Mapping) -> None:
+        att = op["attribute"]
+        value = op.get("value")
+        if ent_type == "props" and att in DOMAIN_ATTS:
+            spec = self._propdef(entk)
+            domain = _domain(spec)
+            domain[att] = value
+            _set_typespec(spec, domain)
+            return
+        key = meta_to_mdf.get(att)
+        if key is None:
+            return  # not represented in MDF
+        if ent_type == "edges" and key in END_KEYS:
+            rel, end = self._rel_end(entk)
+            self._set_end_key(rel, end, key, value)
+            return
+        spec = self._spec(ent_type, entk, key)
+        if spec is not None:
+            _set_or_pop(spec, key, value)
+
+    def _update(self, ent_type: str, entk: str | tuple, op: Mapping) -> None:
+        att = op["attribute"]
+        remove = [k if isinstance(k, str) else tuple(k) for k in op.get("remove") or []]
+        add = op.get("add") or []
+        if att == "value_set":
+            spec = self._propdef(entk)
+            domain = _domain(spec)
+            hdls = [h for h in domain.get("value_set") or [] if h not in remove]
+            hdls += [h for h in map(self._enum_term, add) if h not in hdls]
+            domain["value_set"] = hdls
+            _set_typespec(spec, domain)
+            return
+        key = "Tags" if att == "tags" else "Term"
+        spec = self._spec(ent_type, entk, key)
+        if spec is None:
+            return
+        if att == "tags":
+            tags = {k: v for k, v in (spec.get("Tags") or {}).items() if k not in remove}
+            tags.update({item["key"]: item["value"] for item in add})
+            _set_or_pop(spec, "Tags", tags or None)
+        else:
+            terms = [
+                t for t in spec.get("Term") or [] if self._spec_term_key(t) not in remove
+            ]
+            terms += [self._term_spec(t) for t in add]
+            _set_or_pop(spec, "Term", terms or None)
+
+
+def _mdf_spec(value: Mapping, ent_type: str) -> dict:
+    """MDF keys for the simple attributes in an entity attribute dict."""
+    return {
+        meta_to_mdf[att]: val
+        for att, val in value.items()
+        if att in meta_to_mdf
+        and (ent_type != "props" or att not in DOMAIN_ATTS)
+        and val is not None
+    }
+
+
+def _set_or_pop(spec: dict, key: str, value: object) -> None:
+    if value is None:
+        spec.pop(key, None)
+    else:
+        spec[key] = value
+
+
+def _domain(spec: Mapping) -> dict:
+    """Property domain attributes of a PropDefinition, value_set as Enum entries."""
+    domain = typespec_to_domain_spec(spec.get("Enum") or spec.get("Type"))
+    if "value_set" in domain:
+        domain["value_set"] = [t["handle"] for t in domain["value_set"]]
+    return domain
+
+
+def _set_typespec(spec: dict, domain: Mapping) -> None:
+    """Set the Type or Enum of a PropDefinition from domain attributes."""
+    if domain.get("edp_term"):
+        return  # left as given
+    prop = Property({att: domain[att] for att in DOMAIN_ATTS if domain.get(att)})
+    if not prop.value_domain:
+        prop.value_domain = Property.default("value_domain")
+    if "value_set" in (prop.value_domain, prop.item_domain):
+        prop.value_set = ValueSet({"url": domain.get("url"), "path": domain.get("path")})
+        for hdl in domain.get("value_set") or []:
+            prop.value_set.terms[hdl] = Term({"handle": hdl, "value": hdl})
+    spec.pop("Enum", None)
+    spec.pop("Type", None)
+    key = "Enum" if prop.value_domain == "value_set" else "Type"
+    spec[key] = domain_spec_to_typespec(prop)
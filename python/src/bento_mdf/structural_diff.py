@@ -0,0 +1,293 @@
+"""
+Structural diff of MDF dicts, without building bento_meta Models.
+
+Answers "did this change the model?" quickly: the merged MDF dicts (as
+returned by :meth:`MDFValidator.load_and_validate_yaml`) are normalized
+into plain per-entity attribute dicts, keyed like the corresponding
+``Model`` collections, and compared directly. The change categories and
+record layout are those of :func:`bento_mdf.diff.iter_diff`:
+
+* nodes by handle, edges by (handle, src, dst), props by
+  (parent handle(s)..., prop handle), terms by (handle, origin, code, version)
+* "removed"/"added" entities, and "changed" attributes of common entities
+
+Only what the MDFReader would make of the MDF is normalized: Ends entries
+override Relationship-level specs, qualified ``<parent>.<prop>``
+PropDefinitions override plain ones, universal properties are attached,
+Type/Enum specs become value domains, and Enum values are resolved
+against the Terms section. Enums given by reference (url, path or EDP
+term) are compared by their reference; nothing is fetched, so no network
+access is needed.
+
+Typical usage example:
+    result = diff_mdf_dicts(load_mdf_dict("a.yml"), load_mdf_dict("b.yml"))
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Iterator, Mapping
+
+from bento_meta.objects import Edge
+
+from bento_mdf.diff import DIFF_ENT_TYPES, diff_record
+from bento_mdf.mdf.convert import mdf_to_meta, to_snake_case, typespec_to_domain_spec
+from bento_mdf.validator import MDFValidator
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+# spec keys handled specifically rather than copied as simple attributes
+SPECIAL_KEYS = ("Enum", "Type", "Src", "Dst", "Mul", "Req")
+# as set for unprovided attrs by bento_mdf.mdf.convert.process_prop
+PROP_DEFAULTS = {
+    "is_extended": False,
+    "is_strict": True,
+    "is_key": False,
+    "is_nullable": False,
+    "is_required": False,
+}
+
+
+def load_mdf_dict(*files: str | Path) -> dict:
+    """Load and merge MDF files into a dict, without building a Model."""
+    return MDFValidator(None, *files, raise_error=True).load_and_validate_yaml()
+
+
+def _flatten_req(req: object) -> object:
+    """Flatten string Req values as spec_to_entity does."""
+    if isinstance(req, str):
+        return req.lower() in ("yes", "true", "1")
+    return req
+
+
+def _simple_atts(spec: Mapping) -> dict:
+    atts = {
+        mdf_to_meta[k]: v
+        for k, v in spec.items()
+        if mdf_to_meta.get(k) and k not in SPECIAL_KEYS
+    }
+    if spec.get("Req") is not None:
+        atts["is_required"] = _flatten_req(spec["Req"])
+    return atts
+
+
+class _Normalizer:
+    """Turns one MDF dict into {ent_type: {entk: attribute dict}}."""
+
+    def __init__(self, mdf: Mapping, handle: str | None = None) -> None:
+        # item access on a MergedOptions is slow; work on a plain dict
+        self.mdf = mdf.as_dict() if hasattr(mdf, "as_dict") else mdf
+        mdf = self.mdf
+        self.handle = handle or mdf.get("Handle")
+        self.ents = {ent_type: {} for ent_type in DIFF_ENT_TYPES}
+        # Terms section terms by handle, first one wins (cf. lookup_term_by_handle)
+        self.terms_by_handle = {}
+        for t_hdl, spec in (mdf.get("Terms") or {}).items():
+            term = self._term(spec, t_hdl)
+            self.terms_by_handle.setdefault(term["handle"], term)
+
+    def _term(self, spec: Mapping, hdl: str | None = None, origin: str | None = None) -> dict:
+        term = _simple_atts(spec)
+        if origin and not term.get("origin_name"):
+            term["origin_name"] = origin
+        if not term.get("handle"):
+            term["handle"] = hdl or to_snake_case(str(term.get("value")))
+        return term
+
+    def _add_term(self, term: dict) -> tuple:
+        termk = (
+            term["handle"] or term.get("value"),
+            term.get("origin_name"),
+            term.get("origin_id"),
+            term.get("origin_version"),
+        )
+        self.ents["terms"].setdefault(termk, term)
+        return termk
+
+    def _concept(self, term_specs: list | None) -> list | None:
+        if not term_specs:
+            return None
+        return sorted(
+            {self._add_term(self._term(spec, origin=self.handle)) for spec in term_specs},
+            key=repr,
+        )
+
+    def _tags(self, tags: Mapping | None) -> dict | None:
+        return {k: str(v) for k, v in tags.items()} if tags else None
+
+    def normalize(self) -> dict[str, dict]:
+        """Return the normalized entities."""
+        mdf = self.mdf
+        unps = mdf.get("UniversalNodeProperties") or {}
+        urps = mdf.get("UniversalRelationshipProperties") or {}
+        universal_nps = (unps.get("mayHave") or []) + (unps.get("mustHave") or [])
+        universal_rps = (urps.get("mayHave") or []) + (urps.get("mustHave") or [])
+        parents = []
+        for hdl, spec in (mdf.get("Nodes") or {}).items():
+            spec = spec or {}
+            pnames = list(spec.get("Props") or []) + universal_nps
+            node = _simple_atts(spec)
+            node.update(
+                handle=hdl,
+                tags=self._tags(spec.get("Tags")),
+                concept=self._concept(spec.get("Term")),
+            )
+            self.ents["nodes"][hdl] = node
+            parents.append(((hdl,), node, pnames))
+        for hdl, spec in (mdf.get("Relationships") or {}).items():
+            for end in spec.get("Ends") or []:
+                triplet = (hdl, end["Src"], end["Dst"])
+                if triplet in self.ents["edges"]:
+                    continue
+                req = end.get("Req") if end.get("Req") is not None else spec.get("Req")
+                pnames = list(end.get("Props") or spec.get("Props") or []) + universal_rps
+                edge = _simple_atts(spec)
+                edge.update(
+                    handle=hdl,
+                    src=end["Src"],
+                    dst=end["Dst"],
+                    # as in the MDFReader, where spec_to_entity lets the
+                    # Relationship-level Mul win over the Ends entry
+                    multiplicity=spec.get("Mul")
+                    or end.get("Mul")
+                    or Edge.default("multiplicity"),
+                    is_required=_flatten_req(req),
+                    tags=self._tags(end.get("Tags") or spec.get("Tags")),
+                    concept=self._concept(end.get("Term") or spec.get("Term")),
+                )
+                self.ents["edges"][triplet] = edge
+                parents.append((triplet, edge, pnames))
+        propdefs = mdf.get("PropDefinitions") or {}
+        for parentk, parent, pnames in parents:
+            parent_hdl = parent["handle"]
+            defined = set()
+            for pname in pnames:
+                spec = propdefs.get(f"{parent_hdl}.{pname}") or propdefs.get(pname)
+                if spec is None:
+                    # the MDFReader skips props without a PropDefinition
+                    continue
+                defined.add(pname)
+                self.ents["props"][(*parentk, pname)] = self._prop(pname, spec)
+            parent["props"] = sorted(defined) or None
+        return self.ents
+
+    def _prop(self, pname: str, spec: Mapping) -> dict:
+        prop = {**PROP_DEFAULTS, **_simple_atts(spec), "handle": pname}
+        domain = typespec_to_domain_spec(spec.get("Enum") or spec.get("Type"))
+        value_set = domain.pop("value_set", None)
+        edp_term = domain.pop("edp_term", None)
+        prop.update(domain)
+        if edp_term:
+            prop["edp_term"] = self._add_term(self._term(edp_term))
+        if value_set is not None:
+            terms = []
+            for tm_init in value_set:
+                term = self.terms_by_handle.get(tm_init["handle"]) or {
+                    **tm_init,
+                    "origin_name": self.handle,
+                }
+                terms.append(self._add_term(term))
+            prop["value_set"] = sorted(set(terms), key=repr)
+        prop["tags"] = self._tags(spec.get("Tags"))
+        prop["concept"] = self._concept(spec.get("Term"))
+        return prop
+
+
+def normalize_mdf(mdf: Mapping, handle: str | None = None) -> dict[str, dict]:
+    """
+    Normalize a merged MDF dict into {ent_type: {entk: attribute dict}}.
+
+    handle: model handle, used as default term origin as by MDFReader
+      (default: the MDF's Handle).
+
+    Attribute names are those of the bento_meta entities. Collection
+    attributes are given as sorted lists of keys (props, concept, value_set
+    terms) or as a dict (tags).
+    """
+    return _Normalizer(mdf, handle).normalize()
+
+
+def _empty_to_none(val: object) -> object:
+    return val if val not in ([], {}) else None
+
+
+def _changed_atts(a_ent: dict, b_ent: dict) -> Iterator[tuple[str, object, object]]:
+    for att in sorted(a_ent.keys() | b_ent.keys()):
+        a_val = a_ent.get(att)
+        b_val = b_ent.get(att)
+        if a_val == b_val:
+            continue
+        if isinstance(a_val, dict) or isinstance(b_val, dict):
+            a_val = a_val or {}
+            b_val = b_val or {}
+            removed = {k: v for k, v in a_val.items() if b_val.get(k) != v}
+            added = {k: v for k, v in b_val.items() if a_val.get(k) != v}
+        elif isinstance(a_val, list) or isinstance(b_val, list):
+            a_set = set(a_val or [])
+            b_set = set(b_val or [])
+            removed = [x for x in a_val or [] if x not in b_set]
+            added = [x for x in b_val or [] if x not in a_set]
+        else:
+            removed, added = a_val, b_val
+        yield att, _empty_to_none(removed), _empty_to_none(added)
+
+
+def iter_structural_diff(
+    mdf_a: Mapping,
+    mdf_b: Mapping,
+    *,
+    ent_types: list[str] | tuple[str, ...] | None = None,
+    handle: str | None = None,
+) -> Iterator[dict]:
+    """
+    Generate change records between two MDF dicts, as iter_diff does for Models.
+
+    Entities are the normalized attribute dicts of normalize_mdf (to which
+    handle is passed).
+    """
+    ent_types = ent_types or DIFF_ENT_TYPES
+    unknown = [t for t in ent_types if t not in DIFF_ENT_TYPES]
+    if unknown:
+        msg = f"Unknown entity type(s) {unknown}; expected one of {DIFF_ENT_TYPES}"
+        raise ValueError(msg)
+    norm_a = normalize_mdf(mdf_a, handle)
+    norm_b = normalize_mdf(mdf_b, handle)
+    for ent_type in ent_types:
+        a_ents = norm_a[ent_type]
+        b_ents = norm_b[ent_type]
+        for entk in sorted(a_ents.keys() - b_ents.keys(), key=repr):
+            yield diff_record(ent_type, "removed", entk, None, a_ents[entk], None)
+        for entk in sorted(b_ents.keys() - a_ents.keys(), key=repr):
+            yield diff_record(ent_type, "added", entk, None, None, b_ents[entk])
+        for entk in sorted(a_ents.keys() & b_ents.keys(), key=repr):
+            if a_ents[entk] == b_ents[entk]:
+                continue
+            for att, removed, added in _changed_atts(a_ents[entk], b_ents[entk]):
+                yield diff_record(ent_type, "changed", entk, att, removed, added)
+
+
+def diff_mdf_dicts(
+    mdf_a: Mapping,
+    mdf_b: Mapping,
+    *,
+    ent_types: list[str] | tuple[str, ...] | None = None,
+    handle: str | None = None,
+) -> dict:
+    """
+    Find the structural diff between two MDF dicts.
+
+    Returns a dict shaped like the result of diff_models:
+    {ent_type: {"removed": {entk: ent}, "added": {...},
+    "changed": {entk: {att: {"removed": ..., "added": ...}}}}}, with only the
+    non-empty parts present. An empty dict means no changes.
+    """
+    result = {}
+    records = iter_structural_diff(mdf_a, mdf_b, ent_types=ent_types, handle=handle)
+    for rec in records:
+        diffs = result.setdefault(rec["entity_type"], {})
+        if rec["action"] == "changed":
+            atts = diffs.setdefault("changed", {}).setdefault(rec["key"], {})
+            atts[rec["attribute"]] = {"removed": rec["removed"], "added": rec["added"]}
+        else:
+            diffs.setdefault(rec["action"], {})[rec["key"]] = rec[rec["action"]]
+    return result
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import collections.abc
+import json
 import logging
 from io import BufferedRandom, TextIOWrapper
 from pathlib import Path
@@ -19,7 +20,7 @@ from yaml.nodes import MappingNode, SequenceNode
 from yaml.parser import ParserError
 from yaml.scanner import ScannerError
 
-from bento_mdf.loader import MDFLoader
+from bento_mdf.loader import MDFLoader, load_mdf_json
 
 if TYPE_CHECKING:
     from referencing.jsonschema import ObjectSchema
@@ -33,6 +34,7 @@ class MDFValidator:
     Schema and YAML instance validation for the Bento Model Description Format.
 
     Use to check and load MDF YAML into a python dict (see load_and_validate).
+    Instance files may also be JSON, and may be mixed with YAML files.
     """
 
     def __init__(
@@ -152,6 +154,45 @@ class MDFValidator:
         inst_yaml = yaml.load(file, Loader=self.yloader)  # noqa: S506
         self.instance.update(inst_yaml)
 
+    def update_instance_from_json_file(
+        self,
+        file: TextIOWrapper | _TemporaryFileWrapper | BufferedRandom,
+    ) -> None:
+        """Update self.instance with the contents of the JSON file object."""
+        self.instance.update(load_mdf_json(file))
+
+    def update_instance_from_file(
+        self,
+        file: TextIOWrapper | _TemporaryFileWrapper | BufferedRandom,
+    ) -> None:
+        """
+        Update self.instance with the contents of a YAML or JSON file object.
+
+        Files named *.json are read as JSON. Other seekable files are read as
+        JSON if they hold a JSON object, and as YAML otherwise (JSON is YAML,
+        so either way gives the same instance). The file object itself is
+        passed to the YAML loader, so YAML errors name the file.
+        """
+        name = getattr(file, "name", None)
+        if isinstance(name, str) and name.lower().endswith(".json"):
+            self.update_instance_from_json_file(file)
+            return
+        if file.seekable():
+            start = file.tell()
+            char = file.read(1)
+            while char and char.isspace():
+                char = file.read(1)
+            file.seek(start)
+            if char in ("{", b"{"):
+                try:
+                    inst_json = load_mdf_json(file)
+                except json.JSONDecodeError:
+                    file.seek(start)
+                else:
+                    self.instance.update(inst_json)
+                    return
+        self.update_instance_from_yaml_file(file)
+
     def load_yaml_from_inst_file(
         self,
         inst_file: str
@@ -161,17 +202,17 @@ class MDFValidator:
         | BufferedRandom
         | None,
     ) -> None:
-        """Load the YAML instance from files."""
+        """Load the YAML or JSON instance from files."""
         # inst_file is a file path
         if isinstance(inst_file, (str, Path)):
             with Path(inst_file).open(encoding="UTF-8") as f:
-                self.update_instance_from_yaml_file(f)
+                self.update_instance_from_file(f)
         # inst_file is a file object
         elif isinstance(
             inst_file,
             (TextIOWrapper, _TemporaryFileWrapper, BufferedRandom),
         ):
-            self.update_instance_from_yaml_file(inst_file)
+            self.update_instance_from_file(inst_file)
         else:
             self.logger.error(
                 "Invalid instance file type: %s",
@@ -196,6 +237,11 @@ class MDFValidator:
             if self.raise_error:
                 raise
             return None
+        except json.JSONDecodeError:
+            self.logger.exception("JSON error in '%s'", inst_file)
+            if self.raise_error:
+                raise
+            return None
         except Exception:
             self.logger.exception(
                 "Exception in loading yaml (instance) %s",
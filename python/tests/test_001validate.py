@@ -1,6 +1,9 @@
+import json
 from pathlib import Path
+from tempfile import TemporaryFile
 
 import pytest
+import yaml
 from bento_mdf.validator import MDFValidator
 from jsonschema import SchemaError, ValidationError
 from yaml.constructor import ConstructorError
@@ -196,3 +199,63 @@ def test_enum_by_edp_term_validates():
     assert v.load_and_validate_yaml()
     assert v.validate_instance_with_schema()
     
+
+
+def as_json(tmp_path, yaml_file):
+    path = tmp_path / f"{yaml_file.stem}.json"
+    with yaml_file.open(encoding="utf-8") as f:
+        path.write_text(json.dumps(yaml.safe_load(f)), encoding="utf-8")
+    return path
+
+
+def test_json_mixed_with_yaml(tmp_path):
+    expected = MDFValidator(test_schema_file, *test_mdf_files).load_and_validate_yaml()
+    props_json = as_json(tmp_path, test_mdf_files[1])
+    v = MDFValidator(test_latest_schema, test_mdf_files[0], props_json, raise_error=True)
+    assert v.load_and_validate_schema()
+    assert v.load_and_validate_yaml().as_dict() == expected.as_dict()
+    assert v.validate_instance_with_schema()
+    # a JSON file object without a .json name is recognized by its content
+    with TemporaryFile() as fh:
+        fh.write(props_json.read_bytes())
+        fh.seek(0)
+        v = MDFValidator(test_schema_file, str(test_mdf_files[0]), fh)
+        assert v.load_and_validate_yaml().as_dict() == expected.as_dict()
+
+
+def test_json_not_valid_wrt_schema(tmp_path):
+    mdfs = [as_json(tmp_path, f) for f in test_mdf_files_invalid_wrt_schema]
+    v = MDFValidator(test_schema_file, *mdfs, raise_error=True)
+    assert v.load_and_validate_schema()
+    assert v.load_and_validate_yaml()
+    with pytest.raises(ValidationError):
+        v.validate_instance_with_schema()
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        '{"Nodes": {"case": {}, "case": {}}}',
+        '{"Nodes": {"case": {"Props": ["case_id", "case_id"]}}}',
+        '{"Nodes": {"case": {"Props": ["case_id"]},}}',
+    ],
+)
+def test_bad_json(tmp_path, text):
+    path = tmp_path / "model.json"
+    path.write_text(text, encoding="utf-8")
+    v = MDFValidator(test_schema_file, path, raise_error=True)
+    with pytest.raises((ConstructorError, json.JSONDecodeError)):
+        v.load_and_validate_yaml()
+    v = MDFValidator(test_schema_file, path)
+    assert v.load_and_validate_yaml() is None
+
+
+def test_yaml_error_names_file(tmp_path):
+    v = MDFValidator(test_schema_file, test_yaml_bad, raise_error=True)
+    with pytest.raises(ParserError, match=test_yaml_bad.name):
+        v.load_and_validate_yaml()
+    # a YAML flow mapping is not JSON, and is read again as YAML
+    flow = tmp_path / "flow.yaml"
+    flow.write_text("\n  {Handle: flow, Nodes: {}}\n", encoding="utf-8")
+    v = MDFValidator(test_schema_file, flow)
+    assert v.load_and_validate_yaml().as_dict() == {"Handle": "flow", "Nodes": {}}
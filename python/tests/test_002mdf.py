@@ -1,14 +1,23 @@
 """Tests for bento_mdf.mdf."""
 
+import copy
 import json
 from pathlib import Path
 
 import pytest
 import responses
+import yaml
+from bento_mdf.diff import diff_models
 from bento_mdf.mdf import MDF, convert_github_url
+from bento_mdf.mdf.convert import (
+    frozen_domain_spec,
+    spec_to_entity,
+    specs_to_entities,
+    typespec_to_domain_spec,
+)
 from bento_meta.entity import ArgError
 from bento_meta.model import Model
-from bento_meta.objects import ValueSet
+from bento_meta.objects import Edge, Node, Property, Tag, Term, ValueSet
 
 from tests.samples.test_urls import TEST_CONVERT_URLS
 
@@ -625,3 +634,69 @@ def test_edge_req_inherited_from_relationship_level() -> None:
     # test-model.yml has no Req on Ends or relationship level for of_case
     sample_case = m.model.edges[("of_case", "sample", "case")]
     assert sample_case.is_required is None or sample_case.is_required is False
+
+
+def test_load_json_mixed_with_yaml(tmp_path) -> None:
+    """Test that JSON MDF files load and merge with YAML files."""
+    props_json = tmp_path / "ctdc_model_properties_file.json"
+    with CTDC_MODEL_PROPS_FILE.open(encoding="utf-8") as f:
+        props_json.write_text(json.dumps(yaml.safe_load(f)), encoding="utf-8")
+    m_yaml = MDF(CTDC_MODEL_FILE, CTDC_MODEL_PROPS_FILE, handle="ctdc")
+    m_json = MDF(str(CTDC_MODEL_FILE), str(props_json), handle="ctdc")
+    assert m_json.mdf == m_yaml.mdf
+    assert diff_models(m_yaml.model, m_json.model) == {}
+
+
+def test_frozen_domain_spec() -> None:
+    """Test that memoized domain specs match typespec_to_domain_spec."""
+    specs = [
+        "string",
+        {"value_type": "list", "item_type": ["a", "b"]},
+        {"value_type": "number", "units": ["mg", "kg"]},
+        {"pattern": "^[0-9]+$"},
+        ["https://example.org/terms.yml"],
+        ["/terms.yml"],
+        [{"Value": "x", "Origin": "edp"}],
+        ["yes", "no", True],
+        None,
+    ]
+    for spec in specs:
+        frozen = frozen_domain_spec(spec)
+        assert frozen is frozen_domain_spec(copy.deepcopy(spec))
+        expected = typespec_to_domain_spec(copy.deepcopy(spec))
+        assert json.dumps(frozen, default=dict) == json.dumps(expected)
+        with pytest.raises(TypeError):
+            frozen["value_domain"] = "string"
+    assert frozen_domain_spec([True]) is not frozen_domain_spec([1])
+    assert frozen_domain_spec([1])["value_set"][0]["value"] == 1
+
+
+def test_shared_enum_terms_not_shared() -> None:
+    """Test that props with the same Enum get their own Terms and origins."""
+    mdls = [MDF(TEST_MODEL_FILE, handle="test").model for _ in range(2)]
+    props = [m.props[("sample", "sample_type")] for m in mdls]
+    terms = [p.value_set.terms for p in props]
+    assert terms[0].keys() == terms[1].keys()
+    for hdl in terms[0]:
+        assert terms[0][hdl] is not terms[1][hdl]
+        assert terms[0][hdl].origin_name == props[0].model
+
+
+def test_specs_to_entities() -> None:
+    """Test that specs_to_entities makes what spec_to_entity makes."""
+    m = MDF(TEST_MODEL_FILE, handle="test")
+    init = {"model": "test", "_commit": "c1"}
+    for section, ent_cls in (("Nodes", Node), ("Terms", Term)):
+        specs = m.mdf[section]
+        ents = specs_to_entities(specs, ent_cls, init)
+        assert init == {"model": "test", "_commit": "c1"}
+        assert len(ents) == len(specs)
+        for (hdl, spec), ent in zip(specs.items(), ents):
+            expected = spec_to_entity(hdl, spec, dict(init), ent_cls)
+            assert ent.handle == hdl
+            assert ent.get_attr_dict() == expected.get_attr_dict()
+            assert sorted(ent.tags) == sorted(expected.tags)
+            for key, tag in ent.tags.items():
+                assert tag.get_attr_dict() == expected.tags[key].get_attr_dict()
+                assert tag.belongs == {(id(ent), "tags", key): ent}
+    assert specs_to_entities([("x", {"Value": "x"})], Term)[0].value == "x"
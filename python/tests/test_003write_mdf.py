@@ -1,3 +1,5 @@
+import re
+from io import StringIO
 from pathlib import Path
 from pdb import set_trace
 from tempfile import NamedTemporaryFile
@@ -6,8 +8,9 @@ import pytest
 import yaml
 from bento_mdf import MDFReader, MDFValidator, MDFWriter
 from bento_mdf.diff import diff_models
+from bento_mdf.mdf import model_fingerprint
 from bento_meta.model import Model
-from bento_meta.objects import Concept, Node, Property, Tag, Term
+from bento_meta.objects import Concept, Edge, Node, Property, Tag, Term
 from yaml import Loader as yloader
 
 TDIR = Path("tests/").resolve() if Path("tests").exists() else Path.cwd()
@@ -317,3 +320,170 @@ def test_write_req_on_ends_uniform():
     # Individual Ends should NOT have Req (stripped as redundant)
     for end in of_sample["Ends"]:
         assert "Req" not in end
+
+
+def legacy_dump(model):
+    """MDF text as write_mdf wrote it with the pure Python emitter."""
+    out = StringIO()
+    yaml.dump(MDFWriter(model=model).write_mdf(), stream=out, indent=4)
+    return out.getvalue()
+
+
+@pytest.mark.parametrize(
+    "sample",
+    ["test-model.yml", "crdc_datahub_mdf.yml", "test-model-null-cde.yml"],
+)
+def test_stream_mdf_matches_write_mdf(sample):
+    m = MDFReader(TDIR / "samples" / sample, handle="test", ignore_enum_by_reference=True)
+    expected = legacy_dump(m.model)
+    written = StringIO()
+    MDFWriter(model=m.model).write_mdf(file=written)
+    streamed = StringIO()
+    assert MDFWriter(model=m.model).stream_mdf(streamed) is None
+    assert written.getvalue() == expected
+    assert streamed.getvalue() == expected
+
+
+def test_stream_mdf_text_needing_python_emitter(tmp_path):
+    """Line breaks, non-ASCII and long keys are written as the Python emitter does."""
+    model = Model(handle="test", version="1.0", uri="https://example.org/test")
+    node = Node({"handle": "ñode", "desc": "Ünïcode description " * 8})
+    node.tags["Category"] = Tag({"key": "Category", "value": "yes"})
+    model.add_node(node)
+    prop = Property(
+        {
+            "handle": "p" * 100,
+            "value_domain": "string",
+            "desc": "line one\n\tline two " + "and more words " * 8,
+            "is_required": True,
+        }
+    )
+    model.add_prop(node, prop)
+    wr_m = MDFWriter(model=model)
+    assert wr_m._dumper() is yaml.Dumper
+    wr_m.stream_mdf(tmp_path / "out.yml")
+    assert (tmp_path / "out.yml").read_text() == legacy_dump(model)
+
+
+def test_stream_mdf_empty_model():
+    streamed = StringIO()
+    MDFWriter(model=Model(handle="test")).stream_mdf(streamed)
+    assert streamed.getvalue() == legacy_dump(Model(handle="test"))
+    assert yaml.safe_load(streamed.getvalue())["Nodes"] == {}
+
+
+@pytest.mark.parametrize("shard_terms", [False, True])
+def test_write_mdf_files_roundtrip(tmp_path, shard_terms):
+    m = MDFReader(
+        TDIR / "samples" / "crdc_datahub_mdf.yml",
+        handle="test",
+        ignore_enum_by_reference=True,
+    )
+    wr_m = MDFWriter(model=m.model)
+    wr_m.stream_mdf(tmp_path / "single.yml")
+    paths = wr_m.write_mdf_files(tmp_path / "crdc-model.yml", shard_terms=shard_terms)
+    names = [p.name for p in paths]
+    assert names[:2] == ["crdc-model.yml", "crdc-model-props.yml"]
+    if shard_terms:
+        assert "crdc-model-terms-caDSR.yml" in names
+        assert len(names) > 3
+    else:
+        assert names[2:] == ["crdc-model-terms.yml"]
+    assert set(yaml.safe_load(paths[0].read_text())) == {
+        "Handle",
+        "Nodes",
+        "Relationships",
+        "URI",
+        "Version",
+    }
+    assert set(yaml.safe_load(paths[1].read_text())) == {"PropDefinitions"}
+    single = MDFReader(tmp_path / "single.yml", handle="test", ignore_enum_by_reference=True)
+    split = MDFReader(*paths, handle="test", ignore_enum_by_reference=True)
+    assert split.mdf == single.mdf
+    assert diff_models(split.model, single.model) == {}
+
+
+def test_write_mdf_files_distinct(tmp_path):
+    m = MDFReader(TDIR / "samples" / "test-model.yml", handle="test")
+    with pytest.raises(RuntimeError, match="distinct"):
+        MDFWriter(model=m.model).write_mdf_files(
+            tmp_path / "model.yml",
+            props_file=tmp_path / "model.yml",
+        )
+
+
+def edge_order_model(reverse):
+    """A model with two edges of one handle, added in either order."""
+    model = Model(handle="test", version="1.0")
+    for hdl in ("case", "sample", "diagnosis"):
+        model.add_node(Node({"handle": hdl}))
+    nodes = model.nodes
+    ends = [
+        ("sample", "case", "one_to_one", "a sample of a case"),
+        ("diagnosis", "case", "many_to_one", "a diagnosis of a case"),
+    ]
+    for src, dst, mul, desc in reversed(ends) if reverse else ends:
+        edge = Edge(
+            {
+                "handle": "of_case",
+                "src": nodes[src],
+                "dst": nodes[dst],
+                "multiplicity": mul,
+                "desc": desc,
+            },
+        )
+        model.add_edge(edge)
+        for prop_hdl in ("z_prop", "a_prop", "m_prop"):
+            model.add_prop(edge, Property({"handle": prop_hdl, "value_domain": "string"}))
+    return model
+
+
+def test_canonical_mdf_ignores_entity_order():
+    models = [edge_order_model(reverse=False), edge_order_model(reverse=True)]
+    mdfs = [MDFWriter(model=m).write_mdf() for m in models]
+    # the plain writer hoists the Mul of whichever edge came first
+    assert mdfs[0]["Relationships"]["of_case"]["Mul"] == "one_to_one"
+    assert mdfs[1]["Relationships"]["of_case"]["Mul"] == "many_to_one"
+    texts = [MDFWriter(model=m).write_canonical_mdf() for m in models]
+    assert texts[0] == texts[1]
+    canon = MDFWriter(model=models[0]).canonical_mdf()
+    of_case = canon["Relationships"]["of_case"]
+    assert of_case["Props"] == ["a_prop", "m_prop", "z_prop"]
+    assert [(e["Src"], e["Dst"]) for e in of_case["Ends"]] == [
+        ("diagnosis", "case"),
+        ("sample", "case"),
+    ]
+    assert of_case["Mul"] == "many_to_one"
+    assert canon["Version"] == "1.0"
+    assert model_fingerprint(models[0]) == model_fingerprint(models[1])
+
+
+def test_fingerprint_detects_changes():
+    m = MDFReader(TDIR / "samples" / "test-model.yml", handle="test")
+    fp = model_fingerprint(m)
+    assert re.fullmatch("[0-9a-f]{64}", fp)
+    assert model_fingerprint(MDFReader(TDIR / "samples" / "test-model.yml", handle="test")) == fp
+    # enum order carries no meaning
+    vs = m.model.props[("sample", "sample_type")].value_set
+    vs.terms.data = dict(reversed(list(vs.terms.data.items())))
+    assert model_fingerprint(m) == fp
+    m.model.nodes["case"].desc = "changed"
+    assert model_fingerprint(m) != fp
+
+
+def test_canonical_mdf_roundtrip(tmp_path):
+    m = MDFReader(
+        TDIR / "samples" / "crdc_datahub_mdf.yml",
+        handle="test",
+        ignore_enum_by_reference=True,
+    )
+    wr_m = MDFWriter(model=m.model)
+    text = wr_m.write_canonical_mdf(tmp_path / "canonical.yml")
+    assert (tmp_path / "canonical.yml").read_text(encoding="utf-8") == text
+    m2 = MDFReader(
+        tmp_path / "canonical.yml",
+        handle="test",
+        ignore_enum_by_reference=True,
+    )
+    assert diff_models(m2.model, m.model) == {}
+    assert MDFWriter(model=m2.model).write_canonical_mdf() == text
@@ -5,7 +5,8 @@ from pathlib import Path
 
 from bento_mdf.diff import Diff, diff_models
 from bento_mdf.mdf import MDF
-from bento_meta.objects import Property, Term, ValueSet
+from bento_meta.model import Model
+from bento_meta.objects import Node, Property, Tag, Term, ValueSet
 
 # constants
 TDIR = Path(__file__).resolve().parent
@@ -1014,3 +1015,248 @@ class TestDiffSummaryChangedTerms:
         overall = summary.create_overall_summary()
         assert "attribute(s) changed" in overall
         assert "term(s)" in overall
+
+
+class TestDiffAnnotationIndex:
+    """Tests for the term -> annotated entity index in Diff."""
+
+    def test_index_built_from_update_annotations(self):
+        from bento_mdf.diff import Diff
+
+        diff = Diff()
+        tk_a = ("term_a", "NCIt", "C1", "1")
+        tk_b = ("term_b", "NCIt", "C2", "1")
+        assert diff.annotated_entity("added", tk_a) is None
+        diff.update_annotations("nodes", "case", None, {tk_a: True})
+        diff.update_annotations("props", ("case", "case_id"), {tk_b: True}, {tk_a: True})
+        assert diff.annotations["props"][("case", "case_id")] == {
+            "removed": {tk_b: True},
+            "added": {tk_a: True},
+        }
+        # first annotated entity recorded wins
+        assert diff.annotated_entity("added", tk_a) == ("nodes", "case")
+        assert diff.annotated_entity("removed", tk_b) == ("props", ("case", "case_id"))
+        assert diff.annotated_entity("removed", tk_a) is None
+
+    def test_index_reset_when_annotations_replaced(self):
+        from bento_mdf.diff import Diff
+
+        diff = Diff()
+        tk = ("term_a", "NCIt", "C1", "1")
+        diff.update_annotations("nodes", "case", None, {tk: True})
+        assert diff.annotated_entity("added", tk) == ("nodes", "case")
+        diff.annotations = {
+            "nodes": {},
+            "edges": {("of_case", "sample", "case"): {"added": {tk: True}}},
+            "props": {},
+            "terms": {},
+        }
+        assert diff.annotated_entity("added", tk) == (
+            "edges",
+            ("of_case", "sample", "case"),
+        )
+
+
+class TestDiffDigests:
+    """Tests for structural digests used to skip unchanged entities."""
+
+    def test_entity_digest(self):
+        from bento_mdf.diff import entity_digest
+
+        atts = Property.attspec
+        pa = Property({"handle": "p", "model": "test", "value_domain": "string"})
+        pb = Property({"handle": "p", "model": "test", "value_domain": "string"})
+        assert entity_digest(pa, atts) == entity_digest(pb, atts)
+        pb.desc = "changed"
+        assert entity_digest(pa, atts) != entity_digest(pb, atts)
+        vs_a = ValueSet({"handle": "vs"})
+        vs_b = ValueSet({"handle": "vs"})
+        vs_a.terms["a"] = Term({"value": "a"})
+        vs_b.terms["b"] = Term({"value": "b"})
+        pa.value_set = vs_a
+        pb.desc = None
+        pb.value_set = vs_b
+        assert entity_digest(pa, atts) != entity_digest(pb, atts)
+
+    def test_digests_do_not_change_result(self):
+        from bento_mdf.diff import model_digests
+
+        pairs = [
+            (TEST_MODEL_A, TEST_MODEL_B),
+            (TEST_MODEL_C, TEST_MODEL_D),
+            (TEST_MODEL_TERMS_A, TEST_MODEL_TERMS_B),
+        ]
+        for mdf_a, mdf_b in pairs:
+            expected = diff_models(
+                mdf_a.model,
+                mdf_b.model,
+                include_summary=True,
+                use_digests=False,
+            )
+            assert (
+                diff_models(mdf_a.model, mdf_b.model, include_summary=True)
+                == expected
+            )
+            assert (
+                diff_models(
+                    mdf_a.model,
+                    mdf_b.model,
+                    include_summary=True,
+                    digests_a=model_digests(mdf_a.model),
+                    digests_b=model_digests(mdf_b.model),
+                )
+                == expected
+            )
+
+    def test_identical_models_have_no_changes(self):
+        from bento_mdf.diff import model_digests
+
+        digests = model_digests(TEST_MODEL_A.model)
+        assert set(digests) == {"nodes", "edges", "props", "terms"}
+        assert digests == model_digests(TEST_MODEL_A.model)
+        result = diff_models(
+            TEST_MODEL_A.model,
+            TEST_MODEL_A.model,
+            digests_a=digests,
+            digests_b=digests,
+        )
+        assert result == {}
+
+
+class TestDiffParallel:
+    """Tests for diffing entity types concurrently in a process pool."""
+
+    MODELS = (
+        TEST_MODEL_A,
+        TEST_MODEL_B,
+        TEST_MODEL_C,
+        TEST_MODEL_D,
+        TEST_MODEL_E,
+        TEST_MODEL_F,
+        TEST_MODEL_G,
+        TEST_MODEL_H,
+        TEST_MODEL_I,
+        TEST_MODEL_TERMS_A,
+        TEST_MODEL_TERMS_B,
+        TEST_MODEL_TERMS_C,
+    )
+
+    def test_parallel_matches_serial(self) -> None:
+        models = self.MODELS
+        for mdf_a, mdf_b in zip(models, models[1:] + models[:1]):
+            serial = diff_models(mdf_a.model, mdf_b.model, include_summary=True)
+            parallel = diff_models(
+                mdf_a.model,
+                mdf_b.model,
+                include_summary=True,
+                parallel=True,
+                max_workers=2,
+            )
+            assert parallel == serial
+            assert list(parallel) == list(serial)
+            for ent_type, changes in serial.items():
+                if ent_type != "summary":
+                    assert list(parallel[ent_type]) == list(changes)
+
+    def test_parallel_options(self) -> None:
+        from bento_mdf.diff import model_digests
+
+        mdl_a, mdl_b = TEST_MODEL_TERMS_A.model, TEST_MODEL_TERMS_B.model
+        expected = diff_models(mdl_a, mdl_b, objects_as_dicts=True, use_digests=False)
+        assert expected
+        for kwargs in (
+            {"use_digests": False},
+            {"digests_a": model_digests(mdl_a), "digests_b": model_digests(mdl_b)},
+        ):
+            assert (
+                diff_models(
+                    mdl_a,
+                    mdl_b,
+                    objects_as_dicts=True,
+                    parallel=True,
+                    **kwargs,
+                )
+                == expected
+            )
+
+
+class TestDiffTagValues:
+    """Tests for tag value changes reported alongside added or removed tags."""
+
+    def test_changed_tag_value_with_removed_tag(self) -> None:
+        """Test that a changed tag value is reported when another tag is removed."""
+        mdl_a, mdl_b = Model(handle=TEST_HANDLE), Model(handle=TEST_HANDLE)
+        for mdl, tags in (
+            (mdl_a, {"item1": "value1", "item2": "value2"}),
+            (mdl_b, {"item1": "other"}),
+        ):
+            node = Node({"handle": "case"})
+            for key, value in tags.items():
+                node.tags[key] = Tag({"key": key, "value": value})
+            mdl.add_node(node)
+        result = diff_models(mdl_a, mdl_b, objects_as_dicts=True)
+        change = result["nodes"]["changed"]["case"]["tags"]
+        assert set(change["removed"]) == {"item1", "item2"}
+        assert change["added"] == {"item1": {"key": "item1", "value": "other"}}
+
+
+class TestTermSetCache:
+    """Tests for memoized value set comparisons."""
+
+    @staticmethod
+    def value_set(*values):
+        vs = ValueSet()
+        for value in values:
+            vs.terms[value] = Term({"value": value})
+        return vs
+
+    def test_equal_key_sets_are_interned(self) -> None:
+        from bento_mdf.diff import TermSetCache
+
+        cache = TermSetCache()
+        vs_1 = self.value_set("a", "b", "c")
+        vs_2 = self.value_set("c", "b", "a")
+        vs_3 = self.value_set("a", "b")
+        assert cache.keys(vs_1) == {"a", "b", "c"}
+        assert cache.keys(vs_1) is cache.keys(vs_2)
+        assert cache.keys(vs_1) is not cache.keys(vs_3)
+        assert cache.keys(None) is cache.keys(ValueSet())
+        assert cache.digest_part(vs_1) is cache.digest_part(vs_2)
+        assert cache.digest_part(vs_1) == ("ValueSet", ["'a'", "'b'", "'c'"])
+
+    def test_compare(self) -> None:
+        from bento_mdf.diff import TermSetCache
+
+        cache = TermSetCache()
+        vs_1 = self.value_set("a", "b", "c")
+        vs_2 = self.value_set("b", "c", "d")
+        removed, added = cache.compare(vs_1, vs_2)
+        assert (removed, added) == ({"a"}, {"d"})
+        # the same comparison is shared by containers with the same terms
+        assert cache.compare(self.value_set("a", "b", "c"), vs_2)[0] is removed
+        assert cache.compare(vs_1, self.value_set("a", "c", "b")) == (set(), set())
+        assert cache.compare(None, vs_1) == (set(), {"a", "b", "c"})
+
+    def test_shared_enums_in_model_diff(self) -> None:
+        """Props sharing large value sets report the same changes as unshared ones."""
+        values = [f"v{i}" for i in range(200)]
+        results = []
+        for shared in (True, False):
+            mdl_a, mdl_b = Model(handle=TEST_HANDLE), Model(handle=TEST_HANDLE)
+            for mdl in (mdl_a, mdl_b):
+                mdl.add_node(Node({"handle": "case"}))
+            vs_a = self.value_set(*values)
+            vs_b = self.value_set(*values, "new")
+            for i in range(20):
+                for mdl, vs in ((mdl_a, vs_a), (mdl_b, vs_b if i % 2 else vs_a)):
+                    prop = Property({"handle": f"p{i}", "value_domain": "value_set"})
+                    prop.value_set = vs if shared else self.value_set(*vs.terms)
+                    mdl.add_prop(mdl.nodes["case"], prop)
+            results.append(diff_models(mdl_a, mdl_b, objects_as_dicts=True))
+        assert results[0] == results[1]
+        changed = results[0]["props"]["changed"]
+        assert sorted(changed) == sorted(("case", f"p{i}") for i in range(1, 20, 2))
+        assert changed[("case", "p1")]["value_set"] == {
+            "removed": None,
+            "added": {"new": {"value": "new"}},
+        }
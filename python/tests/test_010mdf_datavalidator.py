@@ -1,5 +1,6 @@
 """Tests for bento_mdf.mdf.validator.MDFDataValidator."""
 
+import asyncio
 from pathlib import Path
 import re
 import pytest
@@ -406,6 +407,283 @@ class TestMDFDataValidatorEnumValidation:
             assert isinstance(simple_validator.last_validation_warnings, dict)
 
 
+class TestMDFDataValidatorBoundedErrors:
+    """Tests for bounded error collection and early-exit policies."""
+
+    bad_rec = {
+        "participant_id": ["PART_001"],  # should be string
+        "race": ["White"],
+        "sex_at_birth": "Non-Binary",  # non-strict enum violation
+    }
+
+    def test_summary_aggregates_identical_errors(self, simple_validator):
+        """Test that identical errors are counted once per node/prop/type."""
+        data = [dict(self.bad_rec) for _ in range(10)]
+        result = simple_validator.validate("participant", data)
+        assert result is False
+        summary = simple_validator.last_validation_summary
+        assert summary.total == 20
+        assert len(summary) == 2
+        rows = {(r["prop"], r["level"]): r for r in summary.records()}
+        assert rows[("participant_id", "error")]["count"] == 10
+        assert rows[("participant_id", "error")]["samples"] == [0, 1, 2, 3, 4]
+        assert rows[("sex_at_birth", "warning")]["type"] == "enum"
+        assert rows[("sex_at_birth", "warning")]["node"] == "participant"
+
+    def test_summary_reset_on_success(self, simple_validator):
+        """Test that the summary is None after a successful validation."""
+        simple_validator.validate("participant", self.bad_rec)
+        assert simple_validator.last_validation_summary is not None
+        data = {
+            "participant_id": "PART_001",
+            "race": ["White"],
+            "sex_at_birth": "Female",
+        }
+        assert simple_validator.validate("participant", data)
+        assert simple_validator.last_validation_summary is None
+
+    def test_max_failed_records_stops_early(self, simple_validator):
+        """Test that validation stops after max_failed_records failures."""
+        data = [dict(self.bad_rec) for _ in range(10)]
+        result = simple_validator.validate(
+            "participant", data, max_failed_records=3
+        )
+        assert result is False
+        assert simple_validator.last_validation_truncated is True
+        assert sorted(simple_validator.last_validation_errors) == [0, 1, 2]
+        assert simple_validator.last_validation_summary.total == 6
+
+    def test_max_failed_records_not_reached(self, simple_validator):
+        """Test that the truncation flag is not set if the cap is not reached."""
+        simple_validator.validate(
+            "participant", self.bad_rec, max_failed_records=3
+        )
+        assert simple_validator.last_validation_truncated is False
+
+    def test_max_errors_per_record(self, simple_validator):
+        """Test that stored errors per record are capped."""
+        result = simple_validator.validate(
+            "participant", self.bad_rec, max_errors_per_record=1
+        )
+        assert result is False
+        errs = simple_validator.last_validation_errors[0]
+        warns = (simple_validator.last_validation_warnings or {}).get(0, [])
+        assert len(errs) + len(warns) == 1
+        # summary still counts everything
+        assert simple_validator.last_validation_summary.total == 2
+
+    def test_aggregate_only(self, simple_validator):
+        """Test that aggregate mode keeps no per-record error dicts."""
+        data = [dict(self.bad_rec) for _ in range(10)]
+        result = simple_validator.validate(
+            "participant", data, aggregate=True
+        )
+        assert result is False
+        assert simple_validator.last_validation_errors == {}
+        assert simple_validator.last_validation_warnings == {}
+        assert simple_validator.last_validation_summary.total == 20
+
+
+class TestMDFDataValidatorLargeEnums:
+    """Tests for the value-set fast path used for large enums."""
+
+    @pytest.fixture
+    def fast_validator(self):
+        mdf = MDFReader(TEST_MODEL_VALIDATOR_FILE, handle="test_validator")
+        return MDFDataValidator(mdf, large_enum_threshold=5)
+
+    def test_large_enums_not_generated_as_enum_classes(self, fast_validator):
+        """Test that value sets over the threshold use ValueSetType."""
+        code = fast_validator.data_model
+        assert "RaceEnum = ValueSetType(" in code
+        assert "class RaceEnum(str, Enum)" not in code
+        # below threshold: still an Enum class
+        assert "class OccupationEnum(str, Enum)" in code
+        assert "RaceEnum" in fast_validator.enum_classes
+
+    def test_valid_values(self, fast_validator):
+        """Test that permissible values validate on the fast path."""
+        data = {
+            "participant_id": "PART_001",
+            "race": ["Asian", "White"],
+            "sex_at_birth": "Male",
+        }
+        assert fast_validator.validate("participant", data) is True
+        assert fast_validator.validate("participant", data, strict=True) is True
+        assert fast_validator.validator("SexAtBirthEnum")("Male") == "Male"
+
+    def test_non_strict_violation_is_warning(self, fast_validator):
+        """Test that fast path errors keep 'enum' type and warning semantics."""
+        data = {
+            "participant_id": "PART_001",
+            "race": ["White", "white "],
+            "sex_at_birth": "Non-Binary",
+        }
+        assert fast_validator.validate("participant", data) is False
+        warnings = fast_validator.last_validation_warnings[0]
+        assert len(warnings) == 2
+        assert all(w["type"] == "enum" for w in warnings)
+        assert all(w["level"] == "warning" for w in warnings)
+        assert warnings[0]["ctx"]["suggestion"] == "White"
+        assert "did you mean 'White'" in warnings[0]["msg"]
+        assert "suggestion" not in warnings[1]["ctx"]
+
+    def test_json_schema(self, fast_validator):
+        """Test that the fast path type still emits an enum JSON schema."""
+        sch = fast_validator.json_schema("SexAtBirthEnum")
+        assert sch["type"] == "string"
+        assert "Female" in sch["enum"]
+
+
+class TestMDFDataValidatorSharedPropTypes:
+    """Tests for property types shared across generated node classes."""
+
+    @pytest.fixture
+    def shared_validator(self):
+        mdf = MDFReader(TDIR / "samples" / "test-model-shared-props.yml")
+        return MDFDataValidator(mdf)
+
+    def test_shared_types_defined_once(self, shared_validator):
+        """Test that compiled types of shared props are emitted once."""
+        code = shared_validator.data_model
+        assert code.count("MatchedStrType(r'^[A-Z]{2,5}-\\d{4,8}$')") == 1
+        assert code.count("CrdcIdPropType = ") == 1
+        assert code.count("WeightPropType = ") == 1
+        assert code.count("crdc_id: CrdcIdPropType") == 3
+        # props on a single node are not aliased
+        assert "ParticipantAgePropType" not in code
+        assert "participant_age: Optional[Annotated[int, Unit('years')]]" in code
+
+    def test_shared_types_validate(self, shared_validator):
+        """Test that each node class validates with the shared types."""
+        for node in ("study", "participant", "sample"):
+            assert shared_validator.validate(node, {"crdc_id": "AB-1234", "weight": 2.5})
+            assert not shared_validator.validate(node, {"crdc_id": "ab-1234"})
+            err = shared_validator.last_validation_errors[0][0]
+            assert err["loc"] == ("crdc_id",)
+
+    def test_same_handle_enums(self, tmp_path):
+        """Test that qualified props sharing a handle keep their own enums."""
+        mdf_file = tmp_path / "same-handle.yml"
+        mdf_file.write_text(
+            "Handle: same_handle\n"
+            "Nodes:\n"
+            "  alpha:\n"
+            "    Props: [status]\n"
+            "  beta:\n"
+            "    Props: [status]\n"
+            "Relationships: {}\n"
+            "PropDefinitions:\n"
+            "  alpha.status:\n"
+            "    Enum: [red, green]\n"
+            "  beta.status:\n"
+            "    Enum: [cat, dog]\n"
+        )
+        val = MDFDataValidator(MDFReader(mdf_file))
+        assert val.enum_classes == ["StatusEnum", "StatusEnum2"]
+        assert val.validate("alpha", {"status": "red"})
+        assert not val.validate("alpha", {"status": "cat"})
+        assert val.validate("beta", {"status": "dog"})
+        assert not val.validate("beta", {"status": "green"})
+
+
+class TestMDFDataValidatorAsync:
+    """Tests for validate_async."""
+
+    good_rec = {
+        "participant_id": "PART_001",
+        "race": ["White"],
+        "sex_at_birth": "Female",
+    }
+    bad_rec = {
+        "participant_id": ["PART_001"],
+        "race": ["White"],
+        "sex_at_birth": "Female",
+    }
+
+    def test_validate_async_valid(self, simple_validator):
+        """Test async validation of valid records, in chunks, with progress."""
+        seen = []
+        data = [self.good_rec] * 25
+        result = asyncio.run(
+            simple_validator.validate_async(
+                "participant",
+                data,
+                chunk_size=10,
+                progress=lambda done, total: seen.append((done, total)),
+            )
+        )
+        assert result is True
+        assert simple_validator.last_validation_errors is None
+        assert seen == [(10, 25), (20, 25), (25, 25)]
+
+    def test_validate_async_matches_validate(self, simple_validator):
+        """Test that async results match the synchronous ones."""
+        data = [self.good_rec, self.bad_rec] * 5
+        assert simple_validator.validate("participant", data) is False
+        errors = simple_validator.last_validation_errors
+        total = simple_validator.last_validation_summary.total
+        result = asyncio.run(
+            simple_validator.validate_async("participant", data, chunk_size=3)
+        )
+        assert result is False
+        assert simple_validator.last_validation_errors == errors
+        assert simple_validator.last_validation_summary.total == total
+
+    def test_validate_async_generator_and_early_exit(self, simple_validator):
+        """Test async validation of an iterator with max_failed_records."""
+        seen = []
+        data = (self.bad_rec for _ in range(100))
+        result = asyncio.run(
+            simple_validator.validate_async(
+                "participant",
+                data,
+                chunk_size=4,
+                max_failed_records=6,
+                progress=lambda done, total: seen.append((done, total)),
+            )
+        )
+        assert result is False
+        assert simple_validator.last_validation_truncated is True
+        assert sorted(simple_validator.last_validation_errors) == list(range(6))
+        assert seen == [(4, None), (8, None)]
+
+    def test_validate_async_concurrent(self, simple_validator):
+        """Test that concurrent validations keep separate results."""
+
+        async def run(data):
+            result = await simple_validator.validate_async(
+                "participant", data, chunk_size=2
+            )
+            return result, simple_validator.last_validation_errors
+
+        async def main():
+            return await asyncio.gather(
+                run([self.good_rec] * 7), run([self.good_rec] * 4 + [self.bad_rec])
+            )
+
+        (ok, ok_errs), (bad, bad_errs) = asyncio.run(main())
+        assert ok is True and ok_errs is None
+        assert bad is False and list(bad_errs) == [4]
+
+    def test_validate_async_cancel(self, simple_validator):
+        """Test that a cancelled validation records no results."""
+
+        async def main():
+            task = asyncio.create_task(
+                simple_validator.validate_async(
+                    "participant", [self.bad_rec] * 10000, chunk_size=10
+                )
+            )
+            await asyncio.sleep(0)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(main())
+        assert simple_validator.last_validation_errors is None
+
+
 class TestMDFDataValidatorHelperFunctions:
     """Tests for helper functions used in validator."""
 
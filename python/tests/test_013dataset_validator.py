@@ -0,0 +1,235 @@
+"""Tests for bento_mdf.mdf.dataset.MDFDatasetValidator."""
+
+from pathlib import Path
+
+import pytest
+from bento_mdf import MDFReader
+from bento_mdf.mdf.dataset import MDFDatasetValidator
+
+TDIR = Path("tests/").resolve() if Path("tests").exists() else Path().resolve()
+TEST_MODEL_DATASET_FILE = TDIR / "samples" / "test-model-dataset.yml"
+
+
+@pytest.fixture(scope="module")
+def mdf():
+    return MDFReader(TEST_MODEL_DATASET_FILE, handle="test_dataset")
+
+
+@pytest.fixture
+def dsv(mdf):
+    return MDFDatasetValidator(mdf)
+
+
+def good_dataset():
+    return {
+        "study": [{"study_id": "S1"}],
+        "participant": [
+            {"participant_id": "P1", "study.study_id": "S1"},
+            {"participant_id": "P2", "study.study_id": "S1"},
+        ],
+        "visit": [
+            {"visit_date": "2020-01-01", "participant.participant_id": "P1"},
+            {"visit_date": "2020-01-01", "participant.participant_id": "P2"},
+        ],
+        "sample": [
+            {"sample_id": "SA1", "participant.participant_id": "P1"},
+            {"sample_id": "SA2"},
+        ],
+        "image": [{"image_id": "I1", "sample.sample_id": "SA1"}],
+    }
+
+
+def test_init(dsv, mdf):
+    assert dsv.model is mdf.model
+    with pytest.raises(RuntimeError, match="must be Model or MDFReader"):
+        MDFDatasetValidator("boog")
+
+
+def test_valid_dataset(dsv):
+    assert dsv.validate(good_dataset()) is True
+    assert dsv.errors == []
+    assert len(dsv.summary) == 0
+
+
+def test_unknown_node(dsv):
+    with pytest.raises(RuntimeError, match="does not contain node"):
+        dsv.add("boog", [{}])
+
+
+def test_duplicate_key(dsv):
+    data = good_dataset()
+    data["participant"].append({"participant_id": "P1", "study.study_id": "S1"})
+    assert dsv.validate(data) is False
+    assert len(dsv.errors) == 1
+    err = dsv.errors[0]
+    assert err["type"] == "duplicate_key"
+    assert (err["node"], err["prop"], err["index"]) == ("participant", "participant_id", 2)
+
+
+def test_composite_key_collision(dsv):
+    data = good_dataset()
+    data["visit"].append(
+        {"visit_date": "2020-01-01", "participant.participant_id": "P1"}
+    )
+    assert dsv.validate(data) is False
+    assert [e["type"] for e in dsv.errors] == ["composite_key_collision"]
+    assert dsv.errors[0]["index"] == 2
+
+
+def test_missing_parent(dsv):
+    data = good_dataset()
+    data["sample"].append({"sample_id": "SA3", "participant.participant_id": "P9"})
+    assert dsv.validate(data) is False
+    err = dsv.errors[0]
+    assert err["type"] == "missing_parent"
+    assert (err["node"], err["prop"], err["index"]) == (
+        "sample",
+        "participant.participant_id",
+        2,
+    )
+
+
+def test_missing_required_link(dsv):
+    data = good_dataset()
+    data["participant"].append({"participant_id": "P3"})
+    assert dsv.validate(data) is False
+    assert [e["type"] for e in dsv.errors] == ["missing_link"]
+    # of_participant is not required for sample
+    data = good_dataset()
+    data["sample"].append({"sample_id": "SA3"})
+    assert dsv.validate(data) is True
+
+
+def test_multiplicity(dsv):
+    data = good_dataset()
+    # many_to_one: a sample has at most one participant
+    data["sample"].append(
+        {"sample_id": "SA3", "participant.participant_id": ["P1", "P2"]}
+    )
+    # one_to_one: a sample is the parent of at most one image
+    data["image"].append({"image_id": "I2", "sample.sample_id": "SA1"})
+    assert dsv.validate(data) is False
+    assert sorted(e["type"] for e in dsv.errors) == ["multiplicity", "multiplicity"]
+    assert {e["node"] for e in dsv.errors} == {"sample", "image"}
+
+
+def test_streaming_chunks(dsv):
+    """Children may arrive before parents, in several chunks."""
+    dsv.reset()
+    assert dsv.add("image", {"image_id": "I1", "sample.sample_id": "SA1"}) == 1
+    assert dsv.add("sample", [{"sample_id": "SA1"}]) == 1
+    assert dsv.add("sample", iter([{"sample_id": "SA1"}])) == 1
+    assert dsv.check() is False
+    assert [(e["type"], e["index"]) for e in dsv.errors] == [("duplicate_key", 1)]
+
+
+def test_max_errors(mdf):
+    dsv = MDFDatasetValidator(mdf, max_errors=2)
+    recs = [{"study_id": "S1"} for _ in range(10)]
+    assert dsv.validate({"study": recs}) is False
+    assert len(dsv.errors) == 2
+    assert dsv.summary.total == 9
+
+
+def test_dict_values(dsv):
+    data = good_dataset()
+    data["study"] = [
+        {"study_id": {"name": "S1", "site": "A"}},
+        {"study_id": {"site": "A", "name": "S1"}},
+    ]
+    data["participant"] = [
+        {"participant_id": "P1", "study.study_id": {"site": "A", "name": "S1"}},
+    ]
+    data["visit"] = data["visit"][:1]
+    data["sample"] = data["sample"][1:]
+    data["image"] = []
+    assert dsv.validate(data) is False
+    assert [(e["type"], e["index"]) for e in dsv.errors] == [("duplicate_key", 1)]
+
+
+SHARED_COMP_KEY_MODEL = """\
+Handle: shared_comp_key
+Nodes:
+  participant:
+    Props:
+      - participant_id
+      - visit_date
+  visit:
+    CompKey:
+      - participant.participant_id
+      - visit_date
+    Props:
+      - visit_date
+      - visit_note
+Relationships:
+  of_participant:
+    Mul: many_to_one
+    Props: ~
+    Ends:
+      - Src: visit
+        Dst: participant
+  follows:
+    Mul: many_to_one
+    Props: ~
+    Ends:
+      - Src: participant
+        Dst: visit
+PropDefinitions:
+  participant_id:
+    Type: string
+    Key: true
+  visit_date:
+    Type: string
+  visit_note:
+    Type: string
+"""
+
+
+@pytest.fixture
+def shared_dsv(tmp_path):
+    path = tmp_path / "shared-comp-key.yml"
+    path.write_text(SHARED_COMP_KEY_MODEL)
+    return MDFDatasetValidator(MDFReader(path, handle="shared_comp_key"))
+
+
+def test_comp_key_owner(shared_dsv):
+    """A component prop also used by another node still belongs to its CompKey node."""
+    visit = shared_dsv.model.nodes["visit"]
+    assert [(ent.handle, pr.handle) for ent, pr in visit.composite_key_props] == [
+        ("participant", "participant_id"),
+        ("visit", "visit_date"),
+    ]
+    assert shared_dsv._comp_key_fields["visit"] == [
+        "participant.participant_id",
+        "visit_date",
+    ]
+
+
+def test_unchecked_edges(shared_dsv, caplog):
+    assert [e.handle for e in shared_dsv.unchecked_edges] == ["follows"]
+    with caplog.at_level("WARNING", logger="bento_mdf.mdf.dataset"):
+        MDFDatasetValidator(shared_dsv.model)
+    assert "'follows'" in caplog.text
+    assert "'visit' has no Key property" in caplog.text
+
+
+def test_shared_missing_parent(mdf):
+    data = good_dataset()
+    data["sample"] += [
+        {"sample_id": "SA3", "participant.participant_id": "P9"},
+        {"sample_id": "SA4", "participant.participant_id": "P9"},
+        {"sample_id": "SA5", "participant.participant_id": "P9"},
+    ]
+    dsv = MDFDatasetValidator(mdf)
+    assert dsv.validate(data) is False
+    assert [(e["type"], e["index"]) for e in dsv.errors] == [
+        ("missing_parent", 2),
+        ("missing_parent", 3),
+        ("missing_parent", 4),
+    ]
+    # records beyond max_errors are still counted
+    dsv = MDFDatasetValidator(mdf, max_errors=1)
+    assert dsv.validate(data) is False
+    assert [e["index"] for e in dsv.errors] == [2]
+    assert dsv.summary.total == 3
+    assert dsv.summary.samples == [[2, 3]]
@@ -0,0 +1,125 @@
+"""Tests for bento_mdf.diff.iter_diff and bento_mdf.diff_writer."""
+
+import io
+import json
+from pathlib import Path
+
+import pytest
+import yaml
+from bento_mdf.diff import diff_models, iter_diff
+from bento_mdf.diff_writer import DiffWriter, diff_record_to_json, write_diff
+from bento_mdf.mdf import MDFReader
+
+TDIR = Path(__file__).resolve().parent
+TEST_HANDLE = "test"
+PAIRS = [
+    ("test-model-a.yml", "test-model-b.yml"),
+    ("test-model-c.yml", "test-model-d.yml"),
+    ("test-model-with-terms-a.yml", "test-model-with-terms-b.yml"),
+]
+
+
+def load(fname):
+    return MDFReader(TDIR / "samples" / fname, handle=TEST_HANDLE).model
+
+
+def records_to_result(records):
+    """Rebuild a diff_models result from change records."""
+    result = {}
+    for rec in records:
+        ent = result.setdefault(rec["entity_type"], {})
+        if rec["action"] == "changed":
+            changed = ent.setdefault("changed", {}).setdefault(rec["key"], {})
+            changed[rec["attribute"]] = {
+                "removed": rec["removed"],
+                "added": rec["added"],
+            }
+        else:
+            ent.setdefault(rec["action"], {})[rec["key"]] = rec[rec["action"]]
+    return result
+
+
+def normalize_result(result):
+    """Drop the None placeholders diff_models uses for empty sections."""
+    return {
+        ent_type: {k: v for k, v in diffs.items() if v is not None}
+        for ent_type, diffs in result.items()
+    }
+
+
+class TestIterDiff:
+    @pytest.mark.parametrize(("fname_a", "fname_b"), PAIRS)
+    def test_records_match_diff_models(self, fname_a, fname_b):
+        mdl_a = load(fname_a)
+        mdl_b = load(fname_b)
+        expected = diff_models(mdl_a, mdl_b, objects_as_dicts=True)
+        records = list(iter_diff(mdl_a, mdl_b, objects_as_dicts=True))
+        assert records
+        assert records_to_result(records) == normalize_result(expected)
+
+    def test_entity_type_filter(self):
+        mdl_a = load("test-model-a.yml")
+        mdl_b = load("test-model-b.yml")
+        records = list(iter_diff(mdl_a, mdl_b, ent_types=["props"]))
+        assert records
+        assert {rec["entity_type"] for rec in records} == {"props"}
+        with pytest.raises(ValueError, match="Unknown entity type"):
+            list(iter_diff(mdl_a, mdl_b, ent_types=["widgets"]))
+
+    def test_identical_models(self):
+        mdl_a = load("test-model-a.yml")
+        assert list(iter_diff(mdl_a, mdl_a)) == []
+
+
+class TestDiffWriters:
+    def records(self):
+        return iter_diff(
+            load("test-model-with-terms-a.yml"),
+            load("test-model-with-terms-b.yml"),
+            objects_as_dicts=True,
+        )
+
+    def test_record_to_json(self):
+        rec = {
+            "key": ("case", "case_id"),
+            "added": {("case_id", "CTDC", 123, None): {"value": "case_id"}},
+        }
+        assert diff_record_to_json(rec) == {
+            "key": ["case", "case_id"],
+            "added": [
+                {"key": ["case_id", "CTDC", 123, None], "value": {"value": "case_id"}},
+            ],
+        }
+
+    def test_jsonl(self):
+        expected = [diff_record_to_json(rec) for rec in self.records()]
+        fh = io.StringIO()
+        assert write_diff(self.records(), fh, "jsonl") == len(expected)
+        lines = fh.getvalue().splitlines()
+        assert [json.loads(line) for line in lines] == expected
+
+    def test_json(self):
+        expected = [diff_record_to_json(rec) for rec in self.records()]
+        fh = io.StringIO()
+        write_diff(self.records(), fh, "json")
+        assert json.loads(fh.getvalue()) == expected
+        fh = io.StringIO()
+        assert write_diff([], fh, "json") == 0
+        assert json.loads(fh.getvalue()) == []
+
+    def test_yaml(self):
+        expected = [diff_record_to_json(rec) for rec in self.records()]
+        fh = io.StringIO()
+        write_diff(self.records(), fh, "yaml")
+        assert yaml.safe_load(fh.getvalue()) == expected
+        fh = io.StringIO()
+        write_diff([], fh, "yaml")
+        assert yaml.safe_load(fh.getvalue()) == []
+
+    def test_unknown_format(self):
+        with pytest.raises(ValueError, match="Unknown diff output format"):
+            write_diff([], io.StringIO(), "xml")
+
+    def test_base_writer_is_abstract(self):
+        with pytest.raises(TypeError):
+            DiffWriter(io.StringIO())
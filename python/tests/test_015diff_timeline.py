@@ -0,0 +1,65 @@
+"""Tests for bento_mdf.diff_timeline."""
+
+from pathlib import Path
+
+import pytest
+from bento_mdf.diff_timeline import diff_timeline, format_timeline, load_model_versions
+
+TDIR = Path(__file__).resolve().parent
+TEST_HANDLE = "test"
+SOURCES = [
+    TDIR / "samples" / "test-model-a.yml",
+    TDIR / "samples" / "test-model-b.yml",
+    [TDIR / "samples" / "test-model-a.yml"],
+]
+LABELS = ["v1", "v2", "v3"]
+
+
+@pytest.fixture(scope="module")
+def models():
+    return load_model_versions(SOURCES, handle=TEST_HANDLE)
+
+
+class TestDiffTimeline:
+    def test_load_model_versions(self, models):
+        assert len(models) == len(SOURCES)
+        threaded = load_model_versions(SOURCES, handle=TEST_HANDLE, max_workers=3)
+        assert [set(m.props) for m in threaded] == [set(m.props) for m in models]
+
+    def test_timeline(self, models):
+        timeline = diff_timeline(models, labels=LABELS)
+        assert set(timeline) == {"nodes", "edges", "props", "terms"}
+        assert timeline["props"][("file", "encryption_type")] == [
+            {"version": "v2", "action": "added", "attributes": []},
+            {"version": "v3", "action": "removed", "attributes": []},
+        ]
+        assert timeline["props"][("sample", "sample_type")] == [
+            {"version": "v2", "action": "changed", "attributes": ["value_set"]},
+            {"version": "v3", "action": "changed", "attributes": ["value_set"]},
+        ]
+        # unchanged entities are omitted
+        assert ("case", "case_id") not in timeline["props"]
+        assert timeline["edges"] == {}
+
+    def test_timeline_entity_types(self, models):
+        timeline = diff_timeline(models, labels=LABELS, ent_types=["terms"])
+        assert set(timeline) == {"terms"}
+        assert timeline["terms"][("password", TEST_HANDLE, None, None)] == [
+            {"version": "v2", "action": "added", "attributes": []},
+            {"version": "v3", "action": "removed", "attributes": []},
+        ]
+
+    def test_timeline_labels(self, models):
+        with pytest.raises(ValueError, match="labels"):
+            diff_timeline(models, labels=["v1"])
+
+    def test_format_timeline(self, models):
+        text = format_timeline(diff_timeline(models, labels=LABELS))
+        assert (
+            "- prop: 'encryption_type' with parent: 'file': added in v2; "
+            "removed in v3"
+        ) in text.split("\n")
+        assert (
+            "- prop: 'sample_type' with parent: 'sample': value_set changed in v2; "
+            "value_set changed in v3"
+        ) in text.split("\n")
@@ -0,0 +1,122 @@
+"""Tests for bento_mdf.structural_diff."""
+
+from pathlib import Path
+
+import pytest
+from bento_mdf.diff import iter_diff
+from bento_mdf.mdf import MDFReader
+from bento_mdf.structural_diff import (
+    diff_mdf_dicts,
+    iter_structural_diff,
+    load_mdf_dict,
+    normalize_mdf,
+)
+
+TDIR = Path(__file__).resolve().parent
+TEST_HANDLE = "test"
+PAIRS = [
+    ("test-model-a.yml", "test-model-b.yml"),
+    ("test-model-c.yml", "test-model-d.yml"),
+    ("test-model-a.yml", "test-model-req-ends.yml"),
+    ("test-model-with-terms-a.yml", "test-model-with-terms-b.yml"),
+]
+
+
+def sample(fname):
+    return TDIR / "samples" / fname
+
+
+def categories(records):
+    return {
+        (rec["entity_type"], rec["action"], rec["key"], rec["attribute"])
+        for rec in records
+    }
+
+
+class TestStructuralDiff:
+    @pytest.mark.parametrize(("fname_a", "fname_b"), PAIRS)
+    def test_same_changes_as_diff_models(self, fname_a, fname_b):
+        mdl_a = MDFReader(sample(fname_a), handle=TEST_HANDLE).model
+        mdl_b = MDFReader(sample(fname_b), handle=TEST_HANDLE).model
+        expected = categories(iter_diff(mdl_a, mdl_b))
+        actual = categories(
+            iter_structural_diff(
+                load_mdf_dict(sample(fname_a)),
+                load_mdf_dict(sample(fname_b)),
+                handle=TEST_HANDLE,
+            ),
+        )
+        assert expected
+        assert actual == expected
+
+    def test_identical(self):
+        mdf = load_mdf_dict(sample("test-model-a.yml"))
+        assert diff_mdf_dicts(mdf, mdf) == {}
+
+    def test_diff_result(self):
+        result = diff_mdf_dicts(
+            load_mdf_dict(sample("test-model-a.yml")),
+            load_mdf_dict(sample("test-model-b.yml")),
+            handle=TEST_HANDLE,
+        )
+        assert set(result) == {"nodes", "props", "terms"}
+        assert result["nodes"]["changed"]["file"] == {
+            "props": {"removed": None, "added": ["encryption_type"]},
+        }
+        assert set(result["props"]["added"]) == {("file", "encryption_type")}
+        assert result["props"]["changed"][("sample", "sample_type")] == {
+            "value_set": {
+                "removed": None,
+                "added": [("not a tumor", TEST_HANDLE, None, None)],
+            },
+        }
+
+    def test_enum_reference_not_resolved(self):
+        ents = normalize_mdf(load_mdf_dict(sample("test-model-sep-enum-url.yml")))
+        race = next(pr for k, pr in ents["props"].items() if k[-1] == "race")
+        assert race["item_domain"] == "value_set"
+        assert race["url"].endswith("enum_lists/race.yml")
+        assert "value_set" not in race
+
+    def test_normalize(self):
+        mdf = {
+            "Handle": "m",
+            "Nodes": {"a": {"Props": ["x", "y"]}, "b": {"Props": None}},
+            "Relationships": {
+                "r": {
+                    "Mul": "many_to_one",
+                    "Props": ["x"],
+                    "Tags": {"t": "edge"},
+                    "Ends": [
+                        {"Src": "a", "Dst": "b", "Req": True},
+                        {"Src": "b", "Dst": "a", "Props": ["y"], "Tags": {"t": "end"}},
+                    ],
+                },
+            },
+            "UniversalNodeProperties": {"mustHave": ["id"]},
+            "PropDefinitions": {
+                "x": {"Type": "string", "Req": "Yes"},
+                "a.x": {"Type": "integer"},
+                "y": {"Enum": ["normal", "other"]},
+                "id": {"Type": "string", "Key": True},
+            },
+            "Terms": {"normal": {"Value": "Normal", "Origin": "NCIt", "Code": "C1"}},
+        }
+        ents = normalize_mdf(mdf)
+        assert ents["nodes"]["b"]["props"] == ["id"]
+        assert ents["nodes"]["a"]["props"] == ["id", "x", "y"]
+        assert ents["edges"][("r", "a", "b")]["is_required"] is True
+        assert ents["edges"][("r", "a", "b")]["props"] == ["x"]
+        assert ents["edges"][("r", "a", "b")]["tags"] == {"t": "edge"}
+        assert ents["edges"][("r", "b", "a")]["props"] == ["y"]
+        assert ents["edges"][("r", "b", "a")]["tags"] == {"t": "end"}
+        # qualified propdef wins for its parent
+        assert ents["props"][("a", "x")]["value_domain"] == "integer"
+        assert ents["props"][("r", "a", "b", "x")]["value_domain"] == "string"
+        assert ents["props"][("r", "a", "b", "x")]["is_required"] is True
+        # enum values resolved against the Terms section
+        assert ents["props"][("a", "y")]["value_set"] == [
+            ("normal", "NCIt", "C1", None),
+            ("other", "m", None, None),
+        ]
+        assert ents["terms"][("normal", "NCIt", "C1", None)]["value"] == "Normal"
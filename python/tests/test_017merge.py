@@ -0,0 +1,121 @@
+"""Tests for bento_mdf.merge."""
+
+from pathlib import Path
+
+import pytest
+import yaml
+from bento_mdf.diff import diff_models
+from bento_mdf.mdf import MDFReader, MDFWriter
+from bento_mdf.merge import ModelMerge, merge_models
+
+TDIR = Path(__file__).resolve().parent
+TEST_HANDLE = "test"
+BASE_MDF = TDIR / "samples" / "test-model-a.yml"
+
+
+def derive(tmp_path, name, edit):
+    """Write a copy of the base MDF changed by edit(mdf) and load it."""
+    with BASE_MDF.open() as f:
+        mdf = yaml.safe_load(f)
+    edit(mdf)
+    path = tmp_path / f"{name}.yml"
+    with path.open("w") as f:
+        yaml.safe_dump(mdf, f)
+    return MDFReader(path, handle=TEST_HANDLE).model
+
+
+def base_model():
+    return MDFReader(BASE_MDF, handle=TEST_HANDLE).model
+
+
+def edit_ours(mdf):
+    mdf["Nodes"]["file"]["Props"].append("encryption_type")
+    mdf["PropDefinitions"]["encryption_type"] = {"Type": "string"}
+    mdf["PropDefinitions"]["sample_type"]["Type"].append("not a tumor")
+    mdf["Nodes"]["case"]["Desc"] = "a case"
+
+
+def edit_theirs(mdf):
+    mdf["Nodes"]["sample"]["Props"].append("sample_date")
+    mdf["PropDefinitions"]["sample_date"] = {"Type": "datetime"}
+    mdf["PropDefinitions"]["sample_type"]["Type"].append("metastatic")
+    mdf["Nodes"]["case"]["Tags"] = {"Category": "clinical"}
+    del mdf["Relationships"]["of_sample"]
+
+
+class TestModelMerge:
+    def test_non_conflicting(self, tmp_path):
+        base = base_model()
+        ours = derive(tmp_path, "ours", edit_ours)
+        theirs = derive(tmp_path, "theirs", edit_theirs)
+        merged, conflicts = merge_models(base, ours, theirs)
+        assert conflicts == []
+        assert ("file", "encryption_type") in merged.props
+        assert ("sample", "sample_date") in merged.props
+        assert ("of_sample", "file", "sample") not in merged.edges
+        terms = set(merged.props[("sample", "sample_type")].value_set.terms)
+        assert terms == {"normal", "tumor", "not a tumor", "metastatic"}
+        case = merged.nodes["case"]
+        assert case.desc == "a case"
+        assert case.tags["Category"].value == "clinical"
+        # inputs are not modified
+        assert base.nodes["case"].desc is None
+        assert "Category" not in ours.nodes["case"].tags
+
+    def test_merge_equals_expected_model(self, tmp_path):
+        base = base_model()
+        ours = derive(tmp_path, "ours", edit_ours)
+        theirs = derive(tmp_path, "theirs", edit_theirs)
+
+        def edit_both(mdf):
+            edit_ours(mdf)
+            edit_theirs(mdf)
+
+        expected = derive(tmp_path, "both", edit_both)
+        merge = ModelMerge(base, ours, theirs)
+        assert diff_models(expected, merge.merge()) == {}
+        mdf = merge.write_mdf(str(tmp_path / "merged.yml"))
+        assert sorted(mdf["Nodes"]) == sorted(expected.nodes)
+        assert sorted(mdf["PropDefinitions"]) == sorted(
+            MDFWriter(expected).mdf["PropDefinitions"],
+        )
+        merged = MDFReader(tmp_path / "merged.yml", handle=TEST_HANDLE).model
+        assert set(merged.props) >= {("file", "encryption_type"), ("sample", "sample_date")}
+
+    def test_conflicts(self, tmp_path):
+        base = base_model()
+
+        def edit_a(mdf):
+            mdf["Nodes"]["case"]["Desc"] = "ours"
+            mdf["PropDefinitions"]["new_prop"] = {"Type": "string"}
+            mdf["Nodes"]["case"]["Props"].append("new_prop")
+            del mdf["Nodes"]["diagnosis"]
+            mdf["Relationships"]["of_case"]["Ends"].pop()
+
+        def edit_b(mdf):
+            mdf["Nodes"]["case"]["Desc"] = "theirs"
+            mdf["PropDefinitions"]["new_prop"] = {"Type": "integer"}
+            mdf["Nodes"]["case"]["Props"].append("new_prop")
+            mdf["Nodes"]["diagnosis"]["Desc"] = "changed"
+
+        ours = derive(tmp_path, "ours", edit_a)
+        theirs = derive(tmp_path, "theirs", edit_b)
+        merged, conflicts = merge_models(base, ours, theirs)
+        kinds = {(c["kind"], c["entity_type"], c["key"], c["attribute"]) for c in conflicts}
+        assert ("modify/modify", "nodes", "case", "desc") in kinds
+        assert ("add/add", "props", ("case", "new_prop"), None) in kinds
+        assert ("modify/remove", "nodes", "diagnosis", None) in kinds
+        assert all(c["resolution"] == "ours" for c in conflicts)
+        assert merged.nodes["case"].desc == "ours"
+        assert merged.props[("case", "new_prop")].value_domain == "string"
+        assert "diagnosis" not in merged.nodes
+
+        merged, _ = merge_models(base, ours, theirs, prefer="theirs")
+        assert merged.nodes["case"].desc == "theirs"
+        assert merged.props[("case", "new_prop")].value_domain == "integer"
+        assert merged.nodes["diagnosis"].desc == "changed"
+
+    def test_bad_prefer(self):
+        base = base_model()
+        with pytest.raises(ValueError, match="prefer"):
+            ModelMerge(base, base, base, prefer="mine")
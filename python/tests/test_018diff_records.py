@@ -0,0 +1,64 @@
+"""Tests for bento_mdf.diff_records."""
+
+import gc
+from pathlib import Path
+
+import pytest
+from bento_mdf.diff import iter_diff
+from bento_mdf.diff_records import DiffRecord, compact_diff
+from bento_mdf.mdf.reader import MDFReader
+
+TDIR = Path(__file__).resolve().parent
+TEST_HANDLE = "test"
+
+
+def load_models():
+    return (
+        MDFReader(TDIR / "samples" / "test-model-a.yml", handle=TEST_HANDLE).model,
+        MDFReader(TDIR / "samples" / "test-model-b.yml", handle=TEST_HANDLE).model,
+    )
+
+
+@pytest.fixture(scope="module")
+def models():
+    return load_models()
+
+
+class TestDiffRecords:
+    def test_records_match_iter_diff(self, models):
+        records = compact_diff(*models)
+        expected = [
+            (r["entity_type"], r["action"], r["key"], r["attribute"])
+            for r in iter_diff(*models)
+        ]
+        assert [r.as_tuple()[:4] for r in records] == expected
+        assert all(isinstance(r, DiffRecord) for r in records)
+        assert not hasattr(records[0], "__dict__")
+
+    def test_compact_values(self, models):
+        records = compact_diff(*models, ent_types=["props"])
+        (rec,) = [
+            r
+            for r in records
+            if r.key == ("sample", "sample_type") and r.attribute == "value_set"
+        ]
+        assert rec.action == "changed"
+        assert rec.old is None
+        assert rec.new == ("not a tumor",)
+        added = [r for r in records if r.action == "added"]
+        assert added
+        assert all(r.attribute is None and r.new is None for r in added)
+
+    def test_materialize(self, models):
+        expected = list(iter_diff(*models, objects_as_dicts=True))
+        records = compact_diff(*models)
+        assert [r.materialize() for r in records] == expected
+
+    def test_materialize_needs_models(self):
+        records = compact_diff(*load_models())
+        gc.collect()
+        assert records
+        with pytest.raises(LookupError, match="no longer available"):
+            records[0].materialize()
+        # compact values remain usable
+        assert records[0].as_tuple()[0] in ("nodes", "edges", "props", "terms")
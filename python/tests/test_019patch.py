@@ -0,0 +1,183 @@
+"""Tests for bento_mdf.patch."""
+
+import copy
+import json
+from pathlib import Path
+
+import pytest
+import yaml
+from bento_mdf.diff import iter_diff
+from bento_mdf.mdf import MDFReader
+from bento_mdf.patch import apply_patch, make_patch
+from bento_mdf.structural_diff import load_mdf_dict
+
+TDIR = Path(__file__).resolve().parent
+TEST_HANDLE = "test"
+PAIRS = [
+    ("test-model-a", "test-model-b"),
+    ("test-model-b", "test-model-a"),
+    ("test-model-with-terms-a", "test-model-with-terms-b"),
+    ("test-model-with-terms-a", "test-model-with-terms-c"),
+    ("test-model-e", "test-model-f"),
+    ("test-model-f", "test-model-e"),
+    ("test-model-g", "test-model-h"),
+]
+
+
+def sample(name):
+    return TDIR / "samples" / f"{name}.yml"
+
+
+def load(path):
+    return MDFReader(path, handle=TEST_HANDLE).model
+
+
+def json_patch(mdl_a, mdl_b):
+    """Make a patch and pass it through JSON, as when shipped."""
+    return json.loads(json.dumps(make_patch(mdl_a, mdl_b)))
+
+
+def dump(tmp_path, name, mdf):
+    path = tmp_path / f"{name}.yml"
+    with path.open("w") as f:
+        yaml.safe_dump(mdf, f)
+    return path
+
+
+def edit_edges(mdf):
+    rels = mdf["Relationships"]
+    rels["of_case"]["Mul"] = "many_to_many"
+    rels["of_case"]["Ends"][0]["Req"] = True
+    rels["derived_from"]["Ends"][0]["Tags"] = {"item1": "other"}
+    rels["derived_from"]["Ends"][1]["Props"] = ["workflow_id"]
+    rels["of_sample"]["Ends"].append({"Src": "sample", "Dst": "sample"})
+    mdf["Nodes"]["case"]["Desc"] = "a case"
+    mdf["Nodes"]["case"]["Tags"] = {"new": "tag"}
+
+
+def edit_additions(mdf):
+    mdf["Nodes"]["new_node"] = {"Props": ["case_id", "brand_new"], "Desc": "new"}
+    mdf["PropDefinitions"]["brand_new"] = {
+        "Type": {"value_type": "list", "Enum": ["a", "b"]},
+        "Desc": "brand new",
+    }
+    mdf["Relationships"]["of_new"] = {
+        "Mul": "one_to_one",
+        "Ends": [{"Src": "new_node", "Dst": "case"}],
+        "Props": ["brand_new"],
+    }
+    del mdf["Relationships"]["derived_from"]["Ends"][1]
+
+
+def edit_shared_prop(mdf):
+    # disease is shared by diagnosis and outcome; change it for one of them
+    mdf["PropDefinitions"]["diagnosis.disease"] = {
+        **mdf["PropDefinitions"]["disease"],
+        "Desc": "diagnosed disease",
+    }
+
+
+class TestPatch:
+    @pytest.mark.parametrize(("name_a", "name_b"), PAIRS)
+    def test_apply_to_model(self, name_a, name_b):
+        mdl_a, mdl_b = load(sample(name_a)), load(sample(name_b))
+        patch = json_patch(mdl_a, mdl_b)
+        assert patch["operations"]
+        assert apply_patch(mdl_a, patch, check_version=False) is mdl_a
+        assert list(iter_diff(mdl_a, mdl_b)) == []
+
+    @pytest.mark.parametrize(("name_a", "name_b"), PAIRS)
+    def test_apply_to_mdf_dict(self, tmp_path, name_a, name_b):
+        patch = json_patch(load(sample(name_a)), load(sample(name_b)))
+        mdf = load_mdf_dict(sample(name_a)).as_dict()
+        apply_patch(mdf, patch, check_version=False)
+        patched = load(dump(tmp_path, "patched", mdf))
+        assert list(iter_diff(patched, load(sample(name_b)))) == []
+
+    @pytest.mark.parametrize("edit", [edit_edges, edit_additions])
+    def test_edge_and_entity_changes(self, tmp_path, edit):
+        base = load_mdf_dict(sample("test-model")).as_dict()
+        changed = copy.deepcopy(base)
+        edit(changed)
+        path_a = dump(tmp_path, "a", base)
+        path_b = dump(tmp_path, "b", changed)
+        for src, dst in ((path_a, path_b), (path_b, path_a)):
+            mdl_a, mdl_b = load(src), load(dst)
+            patch = json_patch(mdl_a, mdl_b)
+            apply_patch(mdl_a, patch, check_version=False)
+            assert list(iter_diff(mdl_a, mdl_b)) == []
+            mdf = load_mdf_dict(src).as_dict()
+            apply_patch(mdf, patch, check_version=False)
+            patched = load(dump(tmp_path, "patched", mdf))
+            assert list(iter_diff(patched, mdl_b)) == []
+
+    def test_shared_prop_changed_for_one_parent(self, tmp_path):
+        base = load_mdf_dict(sample("test-model-g")).as_dict()
+        changed = copy.deepcopy(base)
+        edit_shared_prop(changed)
+        mdl_a = load(dump(tmp_path, "a", base))
+        mdl_b = load(dump(tmp_path, "b", changed))
+        assert mdl_a.props[("diagnosis", "disease")] is mdl_a.props[("outcome", "disease")]
+        patch = json_patch(mdl_a, mdl_b)
+        apply_patch(mdl_a, patch, check_version=False)
+        assert mdl_a.props[("diagnosis", "disease")].desc == "diagnosed disease"
+        assert mdl_a.props[("outcome", "disease")].desc != "diagnosed disease"
+        assert mdl_a.nodes["diagnosis"].props["disease"] is mdl_a.props[
+            ("diagnosis", "disease")
+        ]
+        assert list(iter_diff(mdl_a, mdl_b)) == []
+
+    def test_several_changed_tag_values(self, tmp_path):
+        base = load_mdf_dict(sample("test-model")).as_dict()
+        base["Nodes"]["case"]["Tags"] = {"a": "1", "b": "1"}
+        changed = copy.deepcopy(base)
+        changed["Nodes"]["case"]["Tags"] = {"a": "2", "b": "2"}
+        mdl_a = load(dump(tmp_path, "a", base))
+        mdl_b = load(dump(tmp_path, "b", changed))
+        patch = json_patch(mdl_a, mdl_b)
+        apply_patch(mdl_a, patch, check_version=False)
+        tags = mdl_a.nodes["case"].tags
+        assert {k: t.value for k, t in tags.items()} == {"a": "2", "b": "2"}
+        assert list(iter_diff(mdl_a, mdl_b)) == []
+
+    def test_patch_format(self):
+        mdl_a, mdl_b = load(sample("test-model-a")), load(sample("test-model-b"))
+        patch = make_patch(mdl_a, mdl_b)
+        assert patch["handle"] == TEST_HANDLE
+        assert patch["from_version"] == mdl_a.version
+        assert patch["to_version"] == mdl_b.version
+        ops = [(op["op"], op["entity_type"], op["key"]) for op in patch["operations"]]
+        # terms first, so value sets can refer to them
+        assert ops[0][1] == "terms"
+        assert ("add", "props", ["file", "encryption_type"]) in ops
+        (update,) = [op for op in patch["operations"] if op["op"] == "update"]
+        assert update["attribute"] == "value_set"
+        assert update["remove"] == []
+        assert [t["value"] for t in update["add"]] == ["not a tumor"]
+        assert make_patch(mdl_a, mdl_b, ent_types=["nodes"])["operations"] == []
+
+    def test_versions(self):
+        mdl_a, mdl_b = load(sample("test-model-a")), load(sample("test-model-b"))
+        mdl_a.version = "1.0.0"
+        patch = make_patch(mdl_a, mdl_b)
+        assert patch["from_version"] == "1.0.0"
+        patch["from_version"] = "no such version"
+        with pytest.raises(ValueError, match="from version"):
+            apply_patch(mdl_a, patch)
+        patch["from_version"] = "1.0.0"
+        patch["to_version"] = "2.0.0"
+        apply_patch(mdl_a, patch)
+        assert mdl_a.version == "2.0.0"
+
+    def test_errors(self):
+        mdl = load(sample("test-model-a"))
+        remove = {"op": "remove", "entity_type": "nodes", "key": "no_such_node"}
+        with pytest.raises(ValueError, match="not found"):
+            apply_patch(mdl, {"operations": [remove]})
+        add = {"op": "add", "entity_type": "nodes", "key": "case", "value": {}}
+        with pytest.raises(ValueError, match="already exists"):
+            apply_patch(mdl, {"operations": [add]})
+        with pytest.raises(ValueError, match="Unknown patch op"):
+            apply_patch(mdl, {"operations": [{**add, "op": "rename"}]})
+        with pytest.raises(TypeError):
+            apply_patch([], {"operations": []})
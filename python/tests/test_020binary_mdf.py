@@ -0,0 +1,98 @@
+"""Tests for bento_mdf.mdf.binary."""
+
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+from bento_mdf.diff import diff_models
+from bento_mdf.mdf import (
+    MDFReader,
+    MDFWriter,
+    dump_binary_mdf,
+    is_binary_mdf,
+    load_binary_mdf,
+)
+from bento_mdf.mdf.binary import HEADER, MAGIC
+
+TDIR = Path(__file__).resolve().parent
+TEST_HANDLE = "test"
+
+
+def sample(name):
+    return TDIR / "samples" / name
+
+
+@pytest.mark.parametrize(
+    "name",
+    ["test-model.yml", "crdc_datahub_mdf.yml", "test-model-null-cde.yml"],
+)
+def test_binary_roundtrip(tmp_path, name):
+    m = MDFReader(sample(name), handle=TEST_HANDLE, ignore_enum_by_reference=True)
+    wr_m = MDFWriter(model=m.model)
+    path = tmp_path / "model.mdfb"
+    data = wr_m.write_binary_mdf(path)
+    assert path.read_bytes() == data
+    assert data.startswith(HEADER)
+    yml = tmp_path / "model.yml"
+    wr_m.write_mdf(file=str(yml))
+    m_yml = MDFReader(yml, handle=TEST_HANDLE, ignore_enum_by_reference=True)
+    for src in (path, str(path), BytesIO(data), path.open("rb")):
+        m2 = MDFReader(src, handle=TEST_HANDLE, ignore_enum_by_reference=True)
+        assert m2.mdf == m_yml.mdf
+        assert diff_models(m_yml.model, m2.model) == {}
+
+
+def test_binary_values():
+    mdf = {
+        "Handle": "test",
+        "Version": "1.0",
+        "Nodes": {"case": {"Props": ["case_id", "case_id"], "Tags": {"n": "1"}}},
+        "PropDefinitions": {
+            "age": {
+                "Type": {"value_type": "number", "minimum": 0, "maximum": 150.5},
+                "Req": True,
+                "Nul": False,
+                "Tags": {"a": 1, "b": 1.0, "c": "1", "d": -2, "e": None},
+            },
+        },
+        "Terms": {"ü": {"Value": "naïve\nterm", "Code": 12345}},
+    }
+    loaded = load_binary_mdf(dump_binary_mdf(mdf))
+    assert loaded == mdf
+    tags = loaded["PropDefinitions"]["age"]["Tags"]
+    assert [type(tags[k]) for k in "abcd"] == [int, float, str, int]
+    assert tags["e"] is None
+    # values are interned
+    props = loaded["Nodes"]["case"]["Props"]
+    assert props[0] is props[1]
+
+
+def test_is_binary_mdf(tmp_path):
+    data = dump_binary_mdf({"Handle": "test"})
+    path = tmp_path / "model.mdfb"
+    path.write_bytes(data)
+    assert is_binary_mdf(path)
+    assert is_binary_mdf(str(path))
+    assert not is_binary_mdf(sample("test-model.yml"))
+    assert not is_binary_mdf(tmp_path / "no-such-file")
+    fh = BytesIO(b"junk" + data)
+    fh.seek(4)
+    assert is_binary_mdf(fh)
+    assert fh.tell() == 4
+    with sample("test-model.yml").open(encoding="utf-8") as f:
+        assert not is_binary_mdf(f)
+
+
+def test_binary_errors(tmp_path):
+    with pytest.raises(ValueError, match="not a binary MDF"):
+        load_binary_mdf(b"Handle: test\n")
+    with pytest.raises(ValueError, match="format version"):
+        load_binary_mdf(MAGIC + b"\x63" + dump_binary_mdf({})[len(HEADER) :])
+    with pytest.raises(TypeError, match="string mapping keys"):
+        dump_binary_mdf({"Terms": {1: "one"}})
+    with pytest.raises(TypeError, match="set"):
+        dump_binary_mdf({"Props": {"a", "b"}})
+    path = tmp_path / "model.mdfb"
+    MDFWriter(model=MDFReader(sample("test-model.yml")).model).write_binary_mdf(path)
+    with pytest.raises(ValueError, match="only MDF input"):
+        MDFReader(path, sample("test-model.yml"), handle=TEST_HANDLE)
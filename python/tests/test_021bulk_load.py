@@ -0,0 +1,191 @@
+"""Tests for bento_mdf.bulk_load."""
+
+import math
+import re
+from pathlib import Path
+
+import pytest
+from bento_mdf.bulk_load import (
+    KEY_PROP,
+    ModelGraph,
+    bulk_load_model,
+    bulk_load_statements,
+    graph_props,
+    is_schema_statement,
+)
+from bento_mdf.mdf import MDFReader
+from bento_meta.mdb.loaders import _c_entity, load_model_statements
+
+TDIR = Path(__file__).resolve().parent
+TEST_HANDLE = "test"
+COMMIT = "1234abcd"
+
+
+def load(name="test-model.yml"):
+    return MDFReader(TDIR / "samples" / name, handle=TEST_HANDLE).model
+
+
+def model_entities(model):
+    ents = [
+        *model.nodes.values(),
+        *model.edges.values(),
+        *model.props.values(),
+        *model.terms.values(),
+    ]
+    ents += [p.value_set for p in model.props.values() if p.value_set]
+    ents += [t for e in list(ents) for t in e.tags.values()]
+    return ents
+
+
+class FakeMDB:
+    """Stands in for a WriteableMDB, recording statements per transaction."""
+
+    def __init__(self):
+        self.driver = self
+        self.txns = []
+
+    def session(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def execute_write(self, fn, *args):
+        self.txns.append([])
+        return fn(self, *args)
+
+    def run(self, query, params):
+        self.txns[-1].append((query, params))
+        return self
+
+    def consume(self):
+        return None
+
+
+@pytest.mark.parametrize("_commit", [COMMIT, None])
+def test_graph_props_match_loader(_commit):
+    model = load()
+    for ent in model_entities(model):
+        c_ent = _c_entity(ent, model, _commit)
+        props = {k: p.value for k, p in c_ent.props.items() if p.value is not None}
+        assert graph_props(ent, model, _commit) == (c_ent.label, props)
+
+
+def test_model_graph():
+    model = load()
+    graph = ModelGraph(model, COMMIT)
+    labels = [label for label, _, _ in graph.nodes.values()]
+    assert labels.count("node") == len(model.nodes)
+    assert labels.count("relationship") == len(model.edges)
+    links = [typ for typ, _, _ in graph.links]
+    assert links.count("has_src") == links.count("has_dst") == len(model.edges)
+    assert links.count("has_value_set") == len(
+        [p for p in model.props.values() if p.value_domain == "value_set"],
+    )
+    for label, props, create in graph.nodes.values():
+        assert props["_commit"] == COMMIT
+        assert create == (label in ("relationship", "tag", "concept"))
+    # merged graph nodes appear once
+    merged = [
+        (label, tuple(props.items()))
+        for label, props, create in graph.nodes.values()
+        if not create
+    ]
+    assert len(merged) == len(set(merged))
+    assert not graph.nanoids
+
+
+def test_key_indexes():
+    graph = ModelGraph(load(), COMMIT)
+    stmts = graph.statements()
+    labels = {label for label, _, _ in graph.nodes.values()}
+    creates = [
+        f"CREATE INDEX {graph.index_name(label)} IF NOT EXISTS "
+        f"FOR (n:{label}) ON (n.{KEY_PROP})"
+        for label in labels
+    ]
+    drops = [f"DROP INDEX {graph.index_name(label)} IF EXISTS" for label in labels]
+    # indexes are online before any key is looked up, and dropped last
+    queries = [query for query, _ in stmts]
+    assert sorted(queries[: len(labels)]) == sorted(creates)
+    assert queries[len(labels)] == "CALL db.awaitIndexes()"
+    assert sorted(queries[-len(labels) :]) == sorted(drops)
+    schema = [query for query in queries if is_schema_statement(query)]
+    assert len(schema) == 2 * len(labels) + 1
+    assert all(params == {} for query, params in stmts if is_schema_statement(query))
+    assert graph.index_name("node") != ModelGraph(load(), COMMIT).index_name("node")
+
+
+def test_statement_batches():
+    model = load()
+    stmts = bulk_load_statements(model, COMMIT, batch_size=3)
+    stmts = [stmt for stmt in stmts if not is_schema_statement(stmt[0])]
+    set_keys, removed = [], []
+    phase = 0
+    for query, params in stmts:
+        rows = params["rows"]
+        assert 0 < len(rows) <= 3
+        assert query.startswith("UNWIND $rows AS ")
+        if re.search(r"^(MERGE|CREATE) \(n:", query, re.MULTILINE):
+            assert phase == 0
+            set_keys += [row[KEY_PROP] for row in rows]
+        elif "REMOVE" in query:
+            phase = 2
+            removed += rows
+        else:
+            assert phase < 2
+            phase = 1
+            assert re.search(r"^MERGE \(a\)-\[:\w+\]->\(b\)$", query, re.MULTILINE)
+            for row in rows:
+                assert row["src"] in set_keys
+                assert row["dst"] in set_keys
+    assert phase == 2
+    assert len(set_keys) == len(set(set_keys))
+    assert sorted(removed) == sorted(set_keys)
+    # fewer, larger statements than the per-statement loader
+    assert len(bulk_load_statements(model, COMMIT)) < len(
+        load_model_statements(model, COMMIT),
+    )
+    with pytest.raises(ValueError, match="batch_size"):
+        bulk_load_statements(model, COMMIT, batch_size=0)
+
+
+def test_make_nanoids():
+    model = load()
+    stmts = bulk_load_statements(model, COMMIT, make_nanoids=True)
+    nanoids = []
+    for query, params in stmts:
+        if "coalesce(n.nanoid, row.__nanoid)" in query:
+            nanoids += [row["__nanoid"] for row in params["rows"]]
+        elif "SET" in query:
+            assert all("nanoid" in row for row in params["rows"])
+    graph = ModelGraph(model)
+    unset = [props for _, props, _ in graph.nodes.values() if "nanoid" not in props]
+    assert len(nanoids) == len(set(nanoids)) == len(unset) > 0
+    assert all(re.fullmatch(r"[a-zA-Z0-9]{6}", n) for n in nanoids)
+
+
+def test_bulk_load_model():
+    model = load("crdc_datahub_mdf.yml")
+    mdb = FakeMDB()
+    stats = bulk_load_model(model, mdb, COMMIT, batch_size=10, txn_batches=4)
+    assert stats["statements"] == sum(len(txn) for txn in mdb.txns)
+    assert stats["transactions"] == len(mdb.txns)
+    # index statements run alone, data statements four to a transaction
+    schema = [txn for txn in mdb.txns if is_schema_statement(txn[0][0])]
+    assert all(len(txn) == 1 for txn in schema)
+    data = [txn for txn in mdb.txns if not is_schema_statement(txn[0][0])]
+    assert all(not is_schema_statement(q) for txn in data for q, _ in txn)
+    n_data = stats["statements"] - len(schema)
+    assert len(data) == math.ceil(n_data / 4)
+    assert is_schema_statement(mdb.txns[0][0][0])
+    assert mdb.txns[-1][0][0].startswith("DROP INDEX")
+    graph = ModelGraph(model, COMMIT)
+    assert stats["nodes"] == len(graph.nodes)
+    assert stats["relationships"] == len(graph.links)
+    assert stats["seconds"] >= 0
+    with pytest.raises(ValueError, match="txn_batches"):
+        bulk_load_model(model, mdb, COMMIT, txn_batches=0)
@@ -0,0 +1,95 @@
+"""Tests for bento_mdf.import_csv."""
+
+import csv
+from pathlib import Path
+
+from bento_mdf.bulk_load import ModelGraph
+from bento_mdf.import_csv import (
+    IMPORT_COLUMNS,
+    RELATIONSHIPS_FILE,
+    ImportCSVWriter,
+    write_import_csv,
+)
+from bento_mdf.mdf import MDFReader
+
+TDIR = Path(__file__).resolve().parent
+TEST_HANDLE = "test"
+COMMIT = "1234abcd"
+
+
+def load(name="test-model.yml"):
+    return MDFReader(TDIR / "samples" / name, handle=TEST_HANDLE).model
+
+
+def read_csv(path):
+    with path.open(newline="", encoding="utf-8") as fh:
+        return list(csv.DictReader(fh))
+
+
+def read_import(directory):
+    nodes = {}
+    for label in IMPORT_COLUMNS:
+        path = directory / ImportCSVWriter.node_file(label)
+        if path.is_file():
+            nodes[label] = read_csv(path)
+    return nodes, read_csv(directory / RELATIONSHIPS_FILE)
+
+
+def test_write_import_csv(tmp_path):
+    model = load()
+    args = write_import_csv(model, tmp_path, COMMIT)
+    nodes, rels = read_import(tmp_path)
+    graph = ModelGraph(model, COMMIT)
+    labels = [label for label, _, _ in graph.nodes.values()]
+    ids = set()
+    for label, rows in nodes.items():
+        assert len(rows) == labels.count(label)
+        for row in rows:
+            assert row[":LABEL"] == label
+            assert row["_commit"] == COMMIT
+            assert row["nanoid"]
+            ids.add(row[":ID"])
+    assert len(ids) == len(graph.nodes)
+    assert len({row["nanoid"] for rows in nodes.values() for row in rows}) == len(ids)
+    assert len(rels) == len(graph.links)
+    for row in rels:
+        assert row[":START_ID"] in ids
+        assert row[":END_ID"] in ids
+    assert {row["handle"] for row in nodes["node"]} == set(model.nodes)
+    assert f"--relationships={tmp_path / RELATIONSHIPS_FILE}" in args
+    assert len([a for a in args if a.startswith("--nodes=")]) == len(nodes)
+
+
+def test_versions_share_merged_nodes(tmp_path):
+    model_a, model_b = load("test-model-a.yml"), load("test-model-b.yml")
+    with ImportCSVWriter(tmp_path / "one") as wr:
+        wr.add_model(model_a, COMMIT)
+        counts = wr.add_model(model_b, COMMIT)
+    write_import_csv(model_a, tmp_path / "two", COMMIT)
+    assert write_import_csv(model_b, tmp_path / "two", COMMIT, append=True)
+    one_nodes, one_rels = read_import(tmp_path / "one")
+    two_nodes, two_rels = read_import(tmp_path / "two")
+    assert {k: len(v) for k, v in one_nodes.items()} == {
+        k: len(v) for k, v in two_nodes.items()
+    }
+    assert len(one_rels) == len(two_rels)
+    # model b's merged graph nodes that model a has were not written again
+    graph_b = ModelGraph(model_b, COMMIT)
+    assert counts["nodes"] < len(graph_b.nodes)
+    for nodes, rels in ((one_nodes, one_rels), (two_nodes, two_rels)):
+        ids = {row[":ID"] for rows in nodes.values() for row in rows}
+        assert all(r[":START_ID"] in ids and r[":END_ID"] in ids for r in rels)
+        links = [(r[":START_ID"], r[":END_ID"], r[":TYPE"]) for r in rels]
+        assert len(links) == len(set(links))
+        terms = [(r["value"], r["origin_name"]) for r in nodes["term"]]
+        assert len(terms) == len(set(terms))
+
+
+def test_multiline_values(tmp_path):
+    model = load()
+    node = next(iter(model.nodes.values()))
+    node.desc = 'a "quoted",\nmultiline description'
+    write_import_csv(model, tmp_path, COMMIT)
+    nodes, _ = read_import(tmp_path)
+    (row,) = [r for r in nodes["node"] if r["handle"] == node.handle]
+    assert row["desc"] == node.desc